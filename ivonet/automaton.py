@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+#  -*- coding: utf-8 -*-
+__author__ = "Ivo Woltring"
+__copyright__ = "Copyright (c) 2026 Ivo Woltring"
+__license__ = "Apache 2.0"
+__doc__ = """
+Cellular automata (game of life and friends) in any number of dimensions.
+
+The whole state is one numpy array. A generation is a weighted sum of the shifted
+array (counting the neighbors is a sum with a kernel of ones) followed by a rule
+table lookup, so there are no python loops over the cells at all.
+"""
+
+from typing import Any, Callable, Iterable, Union
+
+import numpy as np
+
+Rule = Union[np.ndarray, Callable[[np.ndarray, np.ndarray], np.ndarray]]
+
+
+def moore_kernel(dimensions: int = 2) -> np.ndarray:
+    """All the 3^n - 1 neighbors (diagonals included) as a kernel of ones with a 0 center"""
+    kernel = np.ones((3,) * dimensions, dtype=np.int64)
+    kernel[(1,) * dimensions] = 0
+    return kernel
+
+
+def von_neumann_kernel(dimensions: int = 2) -> np.ndarray:
+    """Only the 2n orthogonal neighbors"""
+    kernel = np.zeros((3,) * dimensions, dtype=np.int64)
+    for axis in range(dimensions):
+        for side in (0, 2):
+            index = [1] * dimensions
+            index[axis] = side
+            kernel[tuple(index)] = 1
+    return kernel
+
+
+def binary_kernel() -> np.ndarray:
+    """The 3x3 neighborhood read as a 9 bit number, top left is the highest bit (2021 day 20)"""
+    return (2 ** np.arange(8, -1, -1)).reshape(3, 3)
+
+
+def shift_sum(cells: np.ndarray, kernel: np.ndarray, background: Any = 0) -> np.ndarray:
+    """For every cell the sum of kernel weight * cell value around it (a correlation)
+
+    The kernel has an odd size in every dimension and is centered on the cell.
+    Everything outside the array counts as background.
+    """
+    radius = [size // 2 for size in kernel.shape]
+    padded = np.pad(cells.astype(np.int64), [(r, r) for r in radius], constant_values=background)
+    total = np.zeros(cells.shape, dtype=np.int64)
+    for offset in zip(*np.nonzero(kernel)):
+        window = tuple(slice(o, o + size) for o, size in zip(offset, cells.shape))
+        total += kernel[offset] * padded[window]
+    return total
+
+
+def life_rule(birth: Iterable[int], survive: Iterable[int], neighbors: int = 8) -> np.ndarray:
+    """Rule table of a life like automaton: table[state, live neighbors] -> next state
+
+    life_rule([3], [2, 3]) is Conway's game of life (B3/S23).
+    """
+    table = np.zeros((2, neighbors + 1), dtype=np.int64)
+    table[0, list(birth)] = 1
+    table[1, list(survive)] = 1
+    return table
+
+
+class Automaton:
+    """A cellular automaton on a numpy array of any dimension
+
+    - cells: the start state (ints, 0 is dead / empty)
+    - rule: a table where table[state, neighborhood sum] is the next state, or a
+      callable rule(cells, sums) -> next cells for anything more complex
+    - kernel: the weights of the neighborhood, defaults to all the neighbors (Moore)
+    - grow: the pattern can grow without bounds, the array gets a layer of background
+      around it every generation (2020 day 17)
+    - background: the state of the infinite space around the array. It follows the rule
+      as well, so a rule that lights up empty space flips it every generation (2021 day 20)
+
+    >>> blinker = Automaton(np.array([[0, 1, 0], [0, 1, 0], [0, 1, 0]]), life_rule([3], [2, 3]))
+    >>> blinker.step().cells.tolist()
+    [[0, 0, 0], [1, 1, 1], [0, 0, 0]]
+    >>> blinker.step().population
+    3
+    """
+
+    def __init__(self,
+                 cells: Any,
+                 rule: Rule,
+                 kernel: np.ndarray = None,
+                 grow: bool = False,
+                 background: int = 0) -> None:
+        self.cells: np.ndarray = np.asarray(cells, dtype=np.int64)
+        self.rule = rule
+        self.kernel: np.ndarray = moore_kernel(self.cells.ndim) if kernel is None else kernel
+        self.grow = grow
+        self.background = background
+        self.generation = 0
+
+    def _apply(self, cells: np.ndarray, sums: np.ndarray) -> np.ndarray:
+        if isinstance(self.rule, np.ndarray):
+            return self.rule[cells, sums]
+        return np.asarray(self.rule(cells, sums), dtype=np.int64)
+
+    def step(self, generations: int = 1) -> "Automaton":
+        for _ in range(generations):
+            cells = self.cells
+            if self.grow:
+                cells = np.pad(cells, [(r, r) for r in (s // 2 for s in self.kernel.shape)],
+                               constant_values=self.background)
+            sums = shift_sum(cells, self.kernel, self.background)
+            self.cells = self._apply(cells, sums)
+            # a cell far away only sees background
+            far_away = np.array([self.background]), np.array([self.background * int(self.kernel.sum())])
+            self.background = int(self._apply(*far_away)[0])
+            self.generation += 1
+        return self
+
+    @property
+    def population(self) -> Union[int, float]:
+        """The number of cells that are not 0 (inf when the background is alive)"""
+        if self.background and self.grow:
+            return float("inf")
+        return int(np.count_nonzero(self.cells))
+
+    def __str__(self) -> str:
+        if self.cells.ndim != 2:
+            return str(self.cells)
+        return "\n".join("".join("#" if cell else "." for cell in row) for row in self.cells)
+
+
+def parse_cells(rows: Iterable[str], on: str = "#", dimensions: int = 2) -> np.ndarray:
+    """The rows as a 0/1 array, extra dimensions of size 1 are added in front (3d and 4d cubes)"""
+    cells = np.array([[1 if ch == on else 0 for ch in row] for row in rows], dtype=np.int64)
+    return cells.reshape((1,) * (dimensions - 2) + cells.shape)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
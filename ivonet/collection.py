@@ -10,7 +10,7 @@ __doc__ = """
 
 from collections import deque
 from heapq import heappush, heappop
-from typing import Generic, TypeVar, Deque, Iterable
+from typing import Generic, TypeVar, Deque, Iterable, Optional
 
 T = TypeVar('T')
 
@@ -29,6 +29,9 @@ class Stack(Generic[T]):
     def pop(self) -> T:
         return self._container.pop()  # LIFO
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
@@ -47,6 +50,9 @@ class Queue(Generic[T]):
     def pop(self) -> T:
         return self._container.popleft()  # FIFO
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def extend(self, iterable: Iterable[T]):
         self._container.extend(iterable)
         return self
@@ -69,10 +75,58 @@ class PriorityQueue(Generic[T]):
     def pop(self) -> T:
         return heappop(self._container)  # out by priority
 
+    def __len__(self) -> int:
+        return len(self._container)
+
     def __repr__(self) -> str:
         return repr(self._container)
 
 
+class BucketQueue(Generic[T]):
+    """Monotone priority queue for small int priorities (Dial's algorithm)
+
+    Items are tuples that start with their int priority, just like the entries you would
+    heappush on a PriorityQueue, so it can be swapped in for one.
+    A popped priority never goes down and a pushed priority may be at most `max_step`
+    above the last popped one (the max edge weight for Dijkstra). So `max_step + 1`
+    circular buckets are enough and push and pop are O(1) amortised.
+    Within a bucket items come out first in, first out.
+    """
+
+    def __init__(self, max_step: int) -> None:
+        self._buckets: list[Deque[T]] = [deque() for _ in range(max_step + 1)]
+        self._max_step = max_step
+        self._current: Optional[int] = None  # priority of the bucket being emptied
+        self._size = 0
+
+    @property
+    def empty(self) -> bool:
+        return self._size == 0
+
+    def push(self, item: T) -> None:
+        priority = int(item[0])
+        if self._current is None:
+            self._current = priority  # the first push sets where the window starts
+        if priority < self._current or priority > self._current + self._max_step:
+            raise ValueError(f"priority {priority} outside of [{self._current}, {self._current + self._max_step}]")
+        self._buckets[priority % len(self._buckets)].append(item)
+        self._size += 1
+
+    def pop(self) -> T:
+        if not self._size:
+            raise IndexError("pop from an empty BucketQueue")
+        size = len(self._buckets)
+        while not self._buckets[self._current % size]:
+            self._current += 1
+        self._size -= 1
+        return self._buckets[self._current % size].popleft()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"BucketQueue(current={self._current}, size={self._size})"
+
 
 def max_k_subsequence(digits: str, k: int) -> str:
     """Return the lexicographically largest subsequence of length k from the string of digits.
@@ -10,12 +10,16 @@ __doc__ = """
 
 """
 
-from copy import deepcopy
+from collections import deque
 from dataclasses import dataclass
-from typing import TypeVar, Generic, Optional
+from heapq import heapify, heappop, heappush
+from math import ceil, inf, sqrt
+from random import Random
+from typing import TypeVar, Generic, Optional, Iterator, Sequence, Any, Iterable, Callable
 
 from ivonet.collection import Queue, PriorityQueue
-from ivonet.search import Node
+from ivonet.parallel import parallel_map
+from ivonet.search import Node, distance_field, DIRECTIONS
 
 V = TypeVar('V')  # type of the vertices in the graph
 
@@ -50,6 +54,31 @@ class WeightedEdge(Edge):
         return f"{self.u} {self.weight}> {self.v}"
 
 
+@dataclass
+class CompressedGraph:
+    """The adjacency of a `Graph` compiled to compressed sparse row (CSR) arrays.
+
+    The neighbours of vertex index i are targets[offsets[i]:offsets[i + 1]] with the
+    matching weights at the same positions. Everything is an int index so a traversal
+    is plain list slicing instead of Edge objects and vertex lookups.
+    Make it with `Graph.freeze()`.
+    """
+    offsets: list[int]  # vertex_count + 1 entries
+    targets: list[int]  # the "to" vertex index of every edge
+    weights: list[float]  # weight of every edge (1 for unweighted edges)
+
+    @property
+    def vertex_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def neighbors(self, index: int) -> list[int]:
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+    def neighbors_with_weights(self, index: int) -> Iterator[tuple[int, float]]:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+
 class Graph(Generic[V]):
     """
      A class representing an undirected graph.
@@ -67,12 +96,22 @@ class Graph(Generic[V]):
      Attributes:
          _vertices (list[V]): A list of vertices in the graph.
          _edges (list[list[Edge | WeightedEdge]]): A list of lists where each sublist contains the edges for a vertex.
+         _index (dict[V, int]): vertex -> index lookup so the vertices must be hashable.
+         _compressed (CompressedGraph): the adjacency compiled by `freeze`, None when edges changed since.
      """
 
     def __init__(self, vertices: Optional[list[V]] = None) -> None:
         self._vertices: list[V] = [] if vertices is None else vertices
         self._edges: list[list[Edge | WeightedEdge]] = [[] for _ in self._vertices]
-        self.search_results = set()
+        self._index: dict[V, int] = self._indexed(self._vertices)
+        self._compressed: Optional[CompressedGraph] = None
+
+    @staticmethod
+    def _indexed(vertices: list[V]) -> dict[V, int]:
+        index: dict[V, int] = {}
+        for i, vertex in enumerate(vertices):
+            index.setdefault(vertex, i)  # like list.index the first one wins
+        return index
 
     @property
     def vertices(self) -> list[V]:
@@ -90,6 +129,8 @@ class Graph(Generic[V]):
     def add_vertex(self, vertex: V) -> int:
         self._vertices.append(vertex)
         self._edges.append([])  # add empty list for containing edges
+        self._index.setdefault(vertex, self.vertex_count - 1)
+        self._compressed = None
         return self.vertex_count - 1  # return index of added vertex
 
     # This is an undirected graph,
@@ -97,6 +138,12 @@ class Graph(Generic[V]):
     def add_edge(self, edge: Edge | WeightedEdge) -> None:
         self._edges[edge.u].append(edge)
         self._edges[edge.v].append(edge.reversed())
+        self._compressed = None
+
+    # Add an edge in one direction only (for one-way streets)
+    def add_directed_edge(self, edge: Edge | WeightedEdge) -> None:
+        self._edges[edge.u].append(edge)
+        self._compressed = None
 
     # Add an edge using vertex indices (convenience method)
     def add_edge_by_indices(self, u: int, v: int) -> None:
@@ -105,8 +152,8 @@ class Graph(Generic[V]):
 
     # Add an edge by looking up vertex indices (convenience method)
     def add_edge_by_vertices(self, first: V, second: V) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v)
 
     def vertex_at(self, index: int) -> V:
@@ -118,17 +165,51 @@ class Graph(Generic[V]):
         return self.vertex_at(self.index_of(vertex))
 
     def index_of(self, vertex: V) -> int:
-        """Find the index of a vertex in the graph"""
-        return self._vertices.index(vertex)
+        """Find the index of a vertex in the graph (O(1))
+
+        Raises a ValueError for an unknown vertex just like list.index
+        """
+        try:
+            return self._index[vertex]
+        except KeyError:
+            raise ValueError(f"{vertex!r} is not a vertex in the graph") from None
 
     def neighbors_for_index(self, index: int) -> list[V]:
         """Find the vertices that a vertex at some index is connected to"""
-        return list(map(self.vertex_at, [e.v for e in self._edges[index]]))
+        return list(map(self.vertex_at, self.neighbor_indices(index)))
 
     def neighbors_for_vertex(self, vertex: V) -> list[V]:
         """Lookup a vertex's index and find its neighbors (convenience method)"""
         return self.neighbors_for_index(self.index_of(vertex))
 
+    def __contains__(self, vertex: V) -> bool:
+        return vertex in self._index
+
+    def neighbor_indices(self, index: int) -> list[int]:
+        """The indices of the neighbors of the vertex at index (from the CSR arrays when frozen)"""
+        if self._compressed is not None:
+            return self._compressed.neighbors(index)
+        return [e.v for e in self._edges[index]]
+
+    def freeze(self) -> CompressedGraph:
+        """Compile the adjacency into compressed sparse row arrays
+
+        Do this once the graph is built and traverse the result (or `neighbor_indices`)
+        with int indices. Adding a vertex or an edge afterwards drops the compiled version,
+        so freeze again when needed.
+        """
+        if self._compressed is None:
+            offsets: list[int] = [0]
+            targets: list[int] = []
+            weights: list[float] = []
+            for edges in self._edges:
+                for edge in edges:
+                    targets.append(edge.v)
+                    weights.append(getattr(edge, "weight", 1))
+                offsets.append(len(targets))
+            self._compressed = CompressedGraph(offsets, targets, weights)
+        return self._compressed
+
     def edges_for_index(self, index: int) -> list[Edge] | list[WeightedEdge]:
         """Return all the edges associated with a vertex at some index"""
         return self._edges[index]
@@ -159,52 +240,133 @@ class Graph(Generic[V]):
                 frontier.push(Node(child, current_node))
         return explored
 
-    def search(self, initial: V) -> list[V]:
-        """Perform a depth-first search to find all connected components starting from a
-        given node and keep track of the longest set found.
+    def longest_connected_component(self) -> list[V]:
+        """The largest set of vertices that are all connected to each other (sorted)
+
+        Was needed for 2024 day 23 and now just the sorted `maximum_clique`.
+        """
+        return sorted(self.maximum_clique())
 
-        Was needed for 2024 day 23.
+    def _bitsets(self) -> list[int]:
+        """Adjacency as one int per vertex index with bit j set when j is a neighbor"""
+        adjacency: list[int] = [0] * self.vertex_count
+        for i in range(self.vertex_count):
+            for j in self.neighbor_indices(i):
+                if i != j:
+                    adjacency[i] |= 1 << j
+        return adjacency
+
+    def _degeneracy_order(self, adjacency: list[int]) -> list[int]:
+        """Vertex indices by repeatedly taking the one with the fewest neighbors left"""
+        degree: list[int] = [a.bit_count() for a in adjacency]
+        heap: list[tuple[int, int]] = [(d, i) for i, d in enumerate(degree)]
+        heapify(heap)
+        removed = 0
+        order: list[int] = []
+        while heap:
+            d, i = heappop(heap)
+            if removed >> i & 1 or d != degree[i]:
+                continue  # outdated entry
+            order.append(i)
+            removed |= 1 << i
+            for j in _bits(adjacency[i] & ~removed):
+                degree[j] -= 1
+                heappush(heap, (degree[j], j))
+        return order
+
+    def cliques(self, min_size: int = 1) -> Iterator[list[V]]:
+        """Yield all the maximal cliques (vertices all connected to each other) of at least min_size
+
+        Bron–Kerbosch with pivoting on bitset adjacency. The outer level goes in degeneracy
+        order so every branch starts with at most 'degeneracy' candidates.
+        """
+        adjacency = self._bitsets()
+
+        def expand(clique: list[int], candidates: int, excluded: int) -> Iterator[list[int]]:
+            if not candidates and not excluded:
+                if len(clique) >= min_size:
+                    yield clique
+                return
+            if len(clique) + candidates.bit_count() < min_size:
+                return
+            # the pivot covers the most candidates, only its non-neighbors need a branch
+            pivot = max(_bits(candidates | excluded), key=lambda u: (candidates & adjacency[u]).bit_count())
+            for v in _bits(candidates & ~adjacency[pivot]):
+                yield from expand(clique + [v], candidates & adjacency[v], excluded & adjacency[v])
+                candidates &= ~(1 << v)
+                excluded |= 1 << v
+
+        done = 0
+        for v in self._degeneracy_order(adjacency):
+            later = adjacency[v] & ~done
+            for clique in expand([v], later, adjacency[v] & done):
+                yield [self._vertices[i] for i in clique]
+            done |= 1 << v
+
+    def maximum_clique(self) -> list[V]:
+        """The largest set of vertices that are all connected to each other
+
+        Bron–Kerbosch with pivoting like `cliques` that also prunes every branch
+        that can not grow beyond the best clique found so far.
+        - see 2024 day 23
         """
-        longest_set = set()
-        stack = [(initial, {initial})]
-        while stack:
-            current_node, current_req = stack.pop()
-            key = tuple(sorted(current_req))
-            if key in self.search_results:
+        adjacency = self._bitsets()
+        best: list[int] = []
+
+        def expand(clique: list[int], candidates: int) -> None:
+            nonlocal best
+            if not candidates:
+                if len(clique) > len(best):
+                    best = clique
+                return
+            if len(clique) + candidates.bit_count() <= len(best):
+                return
+            pivot = max(_bits(candidates), key=lambda u: (candidates & adjacency[u]).bit_count())
+            for v in _bits(candidates & ~adjacency[pivot]):
+                expand(clique + [v], candidates & adjacency[v])
+                candidates &= ~(1 << v)
+                if len(clique) + candidates.bit_count() <= len(best):
+                    return
+
+        done = 0
+        for v in reversed(self._degeneracy_order(adjacency)):
+            expand([v], adjacency[v] & ~done)
+            done |= 1 << v
+        return [self._vertices[i] for i in best]
+
+
+    def component_labels(self) -> list[int]:
+        """Label every vertex index with the number of its connected component
+
+        One bfs per component over the int adjacency and a label list as visited
+        marker, so all components together take O(V + E).
+        The labels are 0, 1, 2, ... in the order the components are found.
+        """
+        labels: list[int] = [-1] * self.vertex_count
+        label = 0
+        for start in range(self.vertex_count):
+            if labels[start] != -1:
                 continue
-            self.search_results.add(key)
-            if len(current_req) > len(longest_set):
-                longest_set = current_req
-            for neighbor in self.neighbors_for_vertex(current_node):
-                if neighbor in current_req:
-                    continue
-                if not set(current_req).issubset(self.neighbors_for_vertex(neighbor)):
-                    continue
-                stack.append((neighbor, {*current_req, neighbor}))
-
-        return sorted(longest_set)
-
-    def longest_connected_component(self) -> set[V]:
-        longest_set = set()
-        for vertice in self.vertices:
-            l = self.search(vertice)
-            if l and len(l) > len(longest_set):
-                longest_set = l
-        return longest_set
-
-
-    def connected_groups(self):
-        """Create groups of all separate connected_component groups"""
-        todo = deepcopy(self._vertices)
-        groups = []
-        while todo:
-            explored = self.connected_components(todo.pop())
-            todo = [vertex for vertex in todo if vertex not in explored]
-            groups.append(explored)
+            labels[start] = label
+            frontier: deque[int] = deque([start])
+            while frontier:
+                for neighbor in self.neighbor_indices(frontier.popleft()):
+                    if labels[neighbor] == -1:
+                        labels[neighbor] = label
+                        frontier.append(neighbor)
+            label += 1
+        return labels
+
+    def connected_groups(self) -> list[set[V]]:
+        """Create groups of all separate connected_component groups (largest first)"""
+        labels = self.component_labels()
+        groups: list[set[V]] = [set() for _ in range(max(labels, default=-1) + 1)]
+        for vertex, label in zip(self._vertices, labels):
+            groups[label].add(vertex)
         return sorted(groups, key=lambda x: len(x), reverse=True)
 
-    def number_connected_groups(self):
-        return len(self.connected_groups())
+    def number_connected_groups(self) -> int:
+        return max(self.component_labels(), default=-1) + 1
 
     # Make it easy to pretty-print a Graph
     def __str__(self) -> str:
@@ -220,16 +382,15 @@ class WeightedGraph(Generic[V], Graph[V]):
     """
 
     def __init__(self, vertices: Optional[list[V]] = None) -> None:
-        self._vertices: list[V] = [] if vertices is None else vertices
-        self._edges: list[list[WeightedEdge]] = [[] for _ in self._vertices]
+        super().__init__(vertices)
 
     def add_edge_by_indices(self, u: int, v: int, weight: float) -> None:
         edge: WeightedEdge = WeightedEdge(u, v, weight)
         self.add_edge(edge)  # call superclass version
 
     def add_edge_by_vertices(self, first: V, second: V, weight: float) -> None:
-        u: int = self._vertices.index(first)
-        v: int = self._vertices.index(second)
+        u: int = self.index_of(first)
+        v: int = self.index_of(second)
         self.add_edge_by_indices(u, v, weight)
 
     def neighbors_for_index_with_weights(self, index: int) -> list[tuple[V, float]]:
@@ -248,6 +409,14 @@ class WeightedGraph(Generic[V], Graph[V]):
         return desc
 
 
+def _bits(mask: int) -> Iterator[int]:
+    """The positions of the set bits of mask (lowest first)"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
 WeightedPath = list[WeightedEdge]
 
 
@@ -296,6 +465,580 @@ def mst(wg: WeightedGraph[V], start: int = 0) -> Optional[WeightedPath]:
     return result
 
 
+def _merged_adjacency(graph: Graph[V]) -> list[dict[int, float]]:
+    """index -> {neighbor index: total weight} with parallel edges added up and self loops dropped"""
+    csr = graph.freeze()
+    adjacency: list[dict[int, float]] = [{} for _ in range(csr.vertex_count)]
+    for u in range(csr.vertex_count):
+        for v, weight in csr.neighbors_with_weights(u):
+            if u != v:
+                adjacency[u][v] = adjacency[u].get(v, 0) + weight
+    return adjacency
+
+
+def _stoer_wagner(adjacency: list[dict[int, float]], members: list[list[int]]) -> tuple[float, list[int]]:
+    """Stoer–Wagner on the given adjacency (changed in place by merging vertices)
+
+    Every phase adds the vertices in maximum adjacency order (lazy heap). The weight with
+    which the last vertex was added is a cut candidate, then the last two are merged.
+    :returns: the cut weight and the original indices on one side of it
+    """
+    active: set[int] = {i for i in range(len(adjacency)) if members[i]}
+    best_weight, best_side = inf, []
+    while len(active) > 1:
+        start = next(iter(active))
+        attached: dict[int, float] = {start: 0}
+        heap: list[tuple[float, int]] = [(0, start)]
+        added: set[int] = set()
+        previous = last = start
+        last_weight = 0
+        while heap:
+            weight, u = heappop(heap)
+            if u in added or -weight != attached[u]:
+                continue
+            added.add(u)
+            previous, last, last_weight = last, u, -weight
+            for v, w in adjacency[u].items():
+                if v not in added:
+                    attached[v] = attached.get(v, 0) + w
+                    heappush(heap, (-attached[v], v))
+        if len(added) < len(active):
+            # not connected at all, so the cut between the parts weighs nothing
+            return 0, [i for u in added for i in members[u]]
+        if last_weight < best_weight:
+            best_weight, best_side = last_weight, list(members[last])
+        # merge last into previous
+        for v, w in adjacency[last].items():
+            del adjacency[v][last]
+            if v != previous:
+                adjacency[previous][v] = adjacency[previous].get(v, 0) + w
+                adjacency[v][previous] = adjacency[previous][v]
+        adjacency[last] = {}
+        members[previous].extend(members[last])
+        members[last] = []
+        active.discard(last)
+    return best_weight, best_side
+
+
+def _contract(edges: list[tuple[int, int, float]],
+              members: list[list[int]],
+              size: int,
+              rng: Random) -> tuple[list[tuple[int, int, float]], list[list[int]]]:
+    """Karger contraction of random edges (chance by weight) until size vertices are left
+
+    Sorting the edges by an exponential clock with the weight as rate gives the order in which
+    weighted random edge picks would happen. A union-find keeps track of the merged vertices.
+    The weights must be > 0 (a 0 weight edge is never picked, leave it out).
+    """
+    parents = list(range(len(members)))
+
+    def find(i: int) -> int:
+        while parents[i] != i:
+            parents[i] = parents[parents[i]]
+            i = parents[i]
+        return i
+
+    left = len(members)
+    for u, v, _ in sorted(edges, key=lambda e: rng.expovariate(e[2])):
+        if left <= size:
+            break
+        u, v = find(u), find(v)
+        if u != v:
+            parents[v] = u
+            left -= 1
+    labels: dict[int, int] = {}
+    contracted: list[list[int]] = []
+    for i, group in enumerate(members):
+        root = find(i)
+        if root not in labels:
+            labels[root] = len(contracted)
+            contracted.append([])
+        contracted[labels[root]].extend(group)
+    weights: dict[tuple[int, int], float] = {}
+    for u, v, w in edges:
+        u, v = labels[find(u)], labels[find(v)]
+        if u != v:
+            key = (u, v) if u < v else (v, u)
+            weights[key] = weights.get(key, 0) + w
+    return [(u, v, w) for (u, v), w in weights.items()], contracted
+
+
+def _karger_stein(edges: list[tuple[int, int, float]], members: list[list[int]], rng: Random) -> tuple[float, list[int]]:
+    """One Karger–Stein run: contract to n/√2 + 1 vertices twice and recurse on both.
+
+    Graphs of 64 vertices or less are finished exactly with Stoer–Wagner. Recursing all
+    the way down to 6 like the paper makes the number of branches explode in python.
+    """
+    if len(members) <= 64:
+        adjacency: list[dict[int, float]] = [{} for _ in members]
+        for u, v, w in edges:
+            adjacency[u][v] = adjacency[v][u] = w
+        return _stoer_wagner(adjacency, [list(group) for group in members])
+    size = ceil(1 + len(members) / sqrt(2))
+    cuts = []
+    for _ in range(2):
+        contracted_edges, contracted = _contract(edges, members, size, rng)
+        if len(contracted) > size:
+            # every edge was contracted, so the groups are the connected components: nothing to cut
+            return 0, contracted[0]
+        cuts.append(_karger_stein(contracted_edges, contracted, rng))
+    return min(cuts, key=lambda c: c[0])
+
+
+def _karger_stein_trial(shared: tuple[list[tuple[int, int, float]], int], seed: int) -> tuple[float, list[int]]:
+    edges, vertex_count = shared
+    return _karger_stein(edges, [[i] for i in range(vertex_count)], Random(seed))
+
+
+def min_cut(graph: Graph[V],
+            method: str = "stoer_wagner",
+            trials: int = 4,
+            processes: Optional[int] = None,
+            seed: Optional[int] = None) -> tuple[float, list[V], list[V]]:
+    """Global minimum cut: the lightest set of edges that splits the graph in two
+
+    Unweighted edges of a plain `Graph` count as 1, weights must be 0 or more (ValueError).
+    - method "stoer_wagner": exact, O(V·E·log V) with a heap
+    - method "karger_stein": randomised, the best of `trials` independent runs which are spread
+      over `processes` (see `ivonet.parallel.parallel_map`). Every run finds the minimum cut with
+      a chance of about 1 / log V, so more trials make a wrong answer less likely.
+    - seed: makes the karger_stein trials repeatable
+
+    :returns: the cut weight and the vertices on both sides of the cut
+    - see 2023 day 25 (cut 3 wires and multiply the group sizes)
+    """
+    if graph.vertex_count < 2:
+        raise ValueError("A cut needs at least 2 vertices")
+    adjacency = _merged_adjacency(graph)
+    if any(w < 0 for neighbors in adjacency for w in neighbors.values()):
+        raise ValueError("A minimum cut needs edge weights of 0 or more")
+    if method == "stoer_wagner":
+        weight, side = _stoer_wagner(adjacency, [[i] for i in range(graph.vertex_count)])
+    elif method == "karger_stein":
+        # a 0 weight edge can never be the one picked for contraction
+        edges = [(u, v, w) for u, neighbors in enumerate(adjacency) for v, w in neighbors.items() if u < v and w > 0]
+        seeds = Random(seed).sample(range(1 << 30), trials)
+        weight, side = min(parallel_map(_karger_stein_trial, seeds, (edges, graph.vertex_count), processes, min_items=2),
+                           key=lambda cut: cut[0])
+    else:
+        raise ValueError(f"Unknown min_cut method: {method}")
+    one = set(side)
+    return (weight,
+            [graph.vertex_at(i) for i in sorted(one)],
+            [graph.vertex_at(i) for i in range(graph.vertex_count) if i not in one])
+
+
+def _single_source(csr: CompressedGraph, source: int, unit: bool) -> list[float]:
+    """Distances from source to every vertex index (inf when unreachable), bfs when all weights are 1"""
+    dist: list[float] = [inf] * csr.vertex_count
+    dist[source] = 0
+    if unit:
+        frontier: deque[int] = deque([source])
+        while frontier:
+            u = frontier.popleft()
+            for v in csr.neighbors(u):
+                if dist[v] == inf:
+                    dist[v] = dist[u] + 1
+                    frontier.append(v)
+        return dist
+    heap: list[tuple[float, int]] = [(0, source)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, weight in csr.neighbors_with_weights(u):
+            if d + weight < dist[v]:
+                dist[v] = d + weight
+                heappush(heap, (dist[v], v))
+    return dist
+
+
+def all_pairs_shortest_paths(graph: Graph[V] | Sequence[Sequence[Any]],
+                             mode: str = "auto",
+                             points: Optional[list] = None,
+                             wall: Any = "#"):
+    """Shortest distance between all pairs of vertices as a numpy matrix
+
+    matrix[i, j] is the distance from vertex index i to j, inf when j can not be reached.
+    - mode "floyd_warshall": vectorised on the whole matrix, one numpy pass per vertex, O(V³)
+      but fast for dense or small graphs
+    - mode "bfs": a bfs (or a Dijkstra for weighted edges) from every vertex, O(V·E) so better
+      for large sparse graphs
+    - mode "auto": bfs for sparse graphs and floyd_warshall for dense ones
+    - mode "points" (or just give `points`): only the distances between the points of interest,
+      matrix[i, j] is from points[i] to points[j]. The graph can then also be a grid (rows of
+      cells) with points as (row, col) and `wall` cells blocked; one grid bfs per point
+      (`ivonet.search.distance_field`) instead of all of them.
+
+    - see 2022 day 16 (valves), 2015 day 9 and 2016 day 24 for the points of interest kind
+    """
+    import numpy as np
+
+    if points is not None:
+        mode = "points"
+    if mode == "points":
+        if points is None:
+            raise ValueError("mode 'points' needs the points of interest")
+        matrix = np.full((len(points), len(points)), inf)
+        if isinstance(graph, Graph):
+            csr = graph.freeze()
+            unit = all(weight == 1 for weight in csr.weights)
+            indices = [graph.index_of(point) for point in points]
+            for i, index in enumerate(indices):
+                dist = _single_source(csr, index, unit)
+                matrix[i] = [dist[j] for j in indices]
+        else:
+            for i, point in enumerate(points):
+                field = distance_field([point], graph, wall)
+                matrix[i] = [inf if field[r][c] == -1 else field[r][c] for r, c in points]
+        return matrix
+    if not isinstance(graph, Graph):
+        raise ValueError(f"mode {mode!r} needs a Graph, use points for a grid")
+
+    csr = graph.freeze()
+    n = csr.vertex_count
+    if mode == "auto":
+        mode = "bfs" if len(csr.targets) < n * n // 8 else "floyd_warshall"
+    if mode == "floyd_warshall":
+        matrix = np.full((n, n), inf)
+        for u in range(n):
+            for v, weight in csr.neighbors_with_weights(u):
+                matrix[u, v] = min(matrix[u, v], weight)
+        np.fill_diagonal(matrix, 0)
+        for k in range(n):
+            # every path through k at once: column k + row k broadcast to a matrix
+            np.minimum(matrix, matrix[:, k, None] + matrix[None, k, :], out=matrix)
+        return matrix
+    if mode == "bfs":
+        unit = all(weight == 1 for weight in csr.weights)
+        return np.array([_single_source(csr, u, unit) for u in range(n)], dtype=float).reshape(n, n)
+    raise ValueError(f"Unknown all_pairs_shortest_paths mode: {mode}")
+
+
+def tsp(distances,
+        maximize: bool = False,
+        cycle: bool = False,
+        start: Optional[int] = None) -> Optional[tuple[float, list[int]]]:
+    """Travelling salesman: the best order to visit every node exactly once (Held–Karp)
+
+    - distances: square matrix (lists or numpy) with distances[i][j] the cost from i to j,
+      inf when there is no way from i to j. It does not need to be symmetric.
+    - maximize: find the longest route instead of the shortest
+    - cycle: return to the first node at the end (closed tour), it starts at `start` or 0
+    - start: fixed first node, otherwise the route may start anywhere
+
+    dp[mask, i] is the best cost of visiting the nodes in mask ending in i. It is a numpy
+    table filled one popcount layer at a time, vectorised over all masks and previous nodes
+    for every node i, so O(n²·2ⁿ) runs at numpy speed. 15 nodes take milliseconds,
+    20 nodes about 160MB for the table.
+    :returns: the cost and the order of the node indices (the start is not repeated for a cycle)
+              or None when there is no route at all
+    - see 2015 day 9 (open route), 2015 day 13 (seating, closed and maximized), 2016 day 24
+    """
+    import numpy as np
+
+    weights = np.array(distances, dtype=float)
+    n = len(weights)
+    if n == 0:
+        return None
+    if maximize:
+        weights = np.where(np.isinf(weights), inf, -weights)
+    if cycle and start is None:
+        start = 0
+    masks = np.arange(1 << n)
+    popcount = np.zeros(1 << n, dtype=np.int64)
+    for i in range(n):
+        popcount += (masks >> i) & 1
+    dp = np.full((1 << n, n), inf)
+    firsts = range(n) if start is None else [start]
+    for i in firsts:
+        dp[1 << i, i] = 0
+    for size in range(2, n + 1):
+        layer = masks[popcount == size]
+        for i in range(n):
+            target = layer[(layer >> i) & 1 == 1]
+            if start is not None and i == start:
+                continue  # the start is never the last one of 2 or more
+            # best previous j for every mask at once, j not in the previous mask is inf
+            dp[target, i] = (dp[target ^ (1 << i)] + weights[:, i]).min(axis=1)
+    full = (1 << n) - 1
+    totals = dp[full] + (weights[:, start] if cycle and n > 1 else 0)
+    last = int(totals.argmin())
+    if totals[last] == inf:
+        return None
+    cost = float(totals[last])
+    order = [last]
+    mask = full
+    while mask != 1 << last:
+        previous = mask ^ (1 << last)
+        last = int((dp[previous] + weights[:, last]).argmin())
+        mask = previous
+        order.append(last)
+    order.reverse()
+    return (-cost if maximize else cost), order
+
+
+def contract_grid(grid: Sequence[Sequence[Any]],
+                  walls: Any = "#",
+                  keep: Iterable[tuple[int, int]] = (),
+                  slopes: Optional[dict[Any, tuple[int, int]]] = None) -> WeightedGraph[tuple[int, int]]:
+    """Contract a grid maze into a weighted graph of its junctions
+
+    Most cells of a maze are corridor where there is no choice anyway. Only the junctions
+    (3 or more open neighbours) and the `keep` points (e.g. start and goal) become
+    vertices, every corridor between two of them becomes an edge weighted by its length.
+    Dead ends and corridors that loop back to where they started are dropped.
+
+    - walls: the cell values that can not be entered (a string of characters works)
+    - keep: cells that must be vertices, they come first so their index is their position in keep
+    - slopes: optional cell value -> (dr, dc) for cells that can only be left in that direction
+      (2023 day 23 part 1). The edges are directed, a corridor gets an edge for every
+      direction it can be walked.
+
+    The vertices are the (row, col) cells and the edges work with int indices so
+    `WeightedGraph.freeze` makes it ready for fast searches.
+    - see 2023 day 23 (longest walk over the crossroads)
+    """
+    height, width = len(grid), len(grid[0])
+    slopes = slopes or {}
+
+    def is_open(r: int, c: int) -> bool:
+        return 0 <= r < height and 0 <= c < width and grid[r][c] not in walls
+
+    def moves(r: int, c: int) -> list[tuple[int, int]]:
+        if grid[r][c] in slopes:
+            dr, dc = slopes[grid[r][c]]
+            return [(r + dr, c + dc)] if is_open(r + dr, c + dc) else []
+        return [(r + dr, c + dc) for dr, dc in DIRECTIONS if is_open(r + dr, c + dc)]
+
+    nodes: list[tuple[int, int]] = list(dict.fromkeys(keep))
+    for r in range(height):
+        for c in range(width):
+            if is_open(r, c) and sum(is_open(r + dr, c + dc) for dr, dc in DIRECTIONS) >= 3:
+                nodes.append((r, c))
+    graph: WeightedGraph[tuple[int, int]] = WeightedGraph(list(dict.fromkeys(nodes)))
+
+    for u, start in enumerate(graph.vertices):
+        for cell in moves(*start):
+            previous, steps = start, 1
+            while cell not in graph:
+                ahead = [nb for nb in moves(*cell) if nb != previous]
+                if not ahead:
+                    break  # dead end or a slope the wrong way
+                previous, cell, steps = cell, ahead[0], steps + 1
+            else:
+                if cell != start:
+                    graph.add_directed_edge(WeightedEdge(u, graph.index_of(cell), steps))
+    return graph
+
+
+def _longest_from(shared: tuple[list[list[tuple[int, float]]], list[float], int, int],
+                  prefix: tuple[tuple[int, ...], float]) -> tuple[float, Optional[list[int]]]:
+    """Longest simple path to target that starts with the given prefix path (see `longest_simple_path`)"""
+    neighbors, best_in, target, visited = shared
+    path, length = prefix
+    for v in path:
+        visited |= 1 << v
+    best, best_path = -inf, None
+    current = list(path)
+
+    def dfs(u: int, visited: int, length: float, remaining: float) -> None:
+        nonlocal best, best_path
+        if u == target:
+            if length > best:
+                best, best_path = length, list(current)
+            return
+        if length + remaining <= best:
+            return  # even entering every vertex left by its heaviest edge can not beat it
+        for v, weight in neighbors[u]:
+            if not visited >> v & 1:
+                current.append(v)
+                dfs(v, visited | 1 << v, length + weight, remaining - best_in[v])
+                current.pop()
+
+    dfs(path[-1], visited, length, sum(w for v, w in enumerate(best_in) if not visited >> v & 1))
+    return best, best_path
+
+
+def longest_simple_path(graph: Graph[V],
+                        start: V,
+                        end: V,
+                        processes: int = 1,
+                        split_depth: int = 3) -> Optional[tuple[float, list[V]]]:
+    """The longest path from start to end that visits every vertex at most once
+
+    This is NP-hard so it is a depth first search over all simple paths, made fast for
+    small graphs (like the output of `contract_grid`):
+    - the visited vertices are an int bitmask and the neighbours (heaviest of parallel edges) are int lists
+    - a branch stops when its length plus the heaviest edge into every unvisited vertex can not
+      beat the best found so far
+    - when the end has only one neighbour the path has to go there last, so the search stops there
+    - processes: with more than 1 the paths of split_depth edges from the start are searched
+      in parallel (see `ivonet.parallel.parallel_map`)
+
+    Edges are used in the direction they were added, so directed graphs work too.
+    Unweighted edges count as 1.
+    :returns: the length and the vertices of the path or None when end can not be reached
+    - see 2023 day 23
+    """
+    csr = graph.freeze()
+    n = csr.vertex_count
+    heaviest: list[dict[int, float]] = [{} for _ in range(n)]
+    for u in range(n):
+        for v, weight in csr.neighbors_with_weights(u):
+            if u != v:
+                heaviest[u][v] = max(weight, heaviest[u].get(v, -inf))
+    neighbors = [sorted(h.items(), key=lambda x: -x[1]) for h in heaviest]
+    best_in: list[float] = [0] * n
+    for u in range(n):
+        for v, weight in neighbors[u]:
+            best_in[v] = max(best_in[v], weight)
+
+    source, goal = graph.index_of(start), graph.index_of(end)
+    if source == goal:
+        return 0, [start]
+    target, tail, visited = goal, 0, 0
+    into_goal = [u for u in range(n) if goal in heaviest[u]]
+    if len(into_goal) == 1 and into_goal[0] != source:
+        # the only way in, so never visit the end early and finish from there
+        target, tail, visited = into_goal[0], heaviest[into_goal[0]][goal], 1 << goal
+
+    shared = (neighbors, best_in, target, visited)
+    prefixes: list[tuple[tuple[int, ...], float]] = [((source,), 0)]
+    if processes > 1:
+        for _ in range(split_depth):
+            extended: list[tuple[tuple[int, ...], float]] = []
+            for path, length in prefixes:
+                if path[-1] == target:
+                    extended.append((path, length))
+                    continue
+                extended.extend((path + (v,), length + weight) for v, weight in neighbors[path[-1]]
+                                if v not in path and not visited >> v & 1)
+            prefixes = extended
+    results = parallel_map(_longest_from, prefixes, shared, processes, min_items=2)
+    length, path = max(results, key=lambda r: r[0], default=(-inf, None))
+    if path is None:
+        return None
+    if target != goal:
+        length, path = length + tail, path + [goal]
+    return length, [graph.vertex_at(i) for i in path]
+
+
+class Scheduler(Generic[V]):
+    """Topological order of a DAG with Kahn's algorithm
+
+    Every node keeps its in-degree (number of unfinished prerequisites) and the nodes
+    without any wait in a heap, so the smallest ready node comes first (lexicographic
+    order for letters). It can be driven by hand: `take` a ready node and report it
+    `done`, which lowers the in-degree of what comes after it. Or let `order` and
+    `simulate` do that.
+
+    Adding an edge only counts the in-degree. Entries in the heap that got an
+    in-degree after they were pushed (or were taken already) are skipped when popped.
+    - see 2018 day 7 (steps and workers) and 2024 day 5 (ordering pages)
+    """
+
+    def __init__(self, edges: Iterable[tuple[V, V]] = (), nodes: Iterable[V] = ()) -> None:
+        self._after: dict[V, list[V]] = {}
+        self._in_degree: dict[V, int] = {}
+        self._ready: list[V] = []
+        self._taken: set[V] = set()
+        self._done: int = 0
+        for node in nodes:
+            self.add_node(node)
+        for before, after in edges:
+            self.add_edge(before, after)
+
+    def add_node(self, node: V) -> None:
+        if node not in self._in_degree:
+            self._after[node] = []
+            self._in_degree[node] = 0
+            heappush(self._ready, node)
+
+    def add_edge(self, before: V, after: V) -> None:
+        """after can only start when before is done"""
+        self.add_node(before)
+        self.add_node(after)
+        self._after[before].append(after)
+        self._in_degree[after] += 1
+
+    def in_degree(self, node: V) -> int:
+        """The number of prerequisites of node that are not done yet"""
+        return self._in_degree[node]
+
+    def _is_ready(self, node: V) -> bool:
+        return self._in_degree[node] == 0 and node not in self._taken
+
+    def _has_ready(self) -> bool:
+        """Drop the stale entries from the top of the heap, True if a ready node is left"""
+        while self._ready and not self._is_ready(self._ready[0]):
+            heappop(self._ready)
+        return bool(self._ready)
+
+    def ready(self) -> list[V]:
+        """The nodes that can be taken now (smallest first)"""
+        return sorted(set(node for node in self._ready if self._is_ready(node)))
+
+    @property
+    def empty(self) -> bool:
+        """True when all the nodes are done"""
+        return self._done == len(self._in_degree)
+
+    def take(self) -> V:
+        """Remove and return the smallest ready node (IndexError when nothing is ready)"""
+        if not self._has_ready():
+            raise IndexError("No node is ready")
+        node = heappop(self._ready)
+        self._taken.add(node)
+        return node
+
+    def done(self, node: V) -> list[V]:
+        """Mark a taken node as done and return the nodes that became ready by it"""
+        self._done += 1
+        released: list[V] = []
+        for after in self._after[node]:
+            self._in_degree[after] -= 1
+            if self._is_ready(after):
+                heappush(self._ready, after)
+                released.append(after)
+        return released
+
+    def _check_finished(self) -> None:
+        if not self.empty:
+            raise ValueError("The graph has a cycle, not every node could be scheduled")
+
+    def order(self) -> Iterator[V]:
+        """Yield all the nodes in topological order, the smallest ready one first"""
+        while self._has_ready():
+            node = self.take()
+            self.done(node)
+            yield node
+        self._check_finished()
+
+    def simulate(self, workers: int, duration: Callable[[V], float]) -> dict[V, tuple[float, float]]:
+        """Work through the nodes with a number of workers, each node takes duration(node)
+
+        Free workers always take the smallest ready nodes. Event driven: the clock jumps
+        to the next moment a worker finishes instead of ticking.
+        :returns: node -> (start, end) time, the max end is the total time
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        times: dict[V, tuple[float, float]] = {}
+        running: list[tuple[float, V]] = []  # heap of (end time, node)
+        now: float = 0
+        while self._has_ready() or running:
+            while len(running) < workers and self._has_ready():
+                node = self.take()
+                times[node] = (now, now + duration(node))
+                heappush(running, (times[node][1], node))
+            now = running[0][0]
+            while running and running[0][0] == now:
+                self.done(heappop(running)[1])
+        self._check_finished()
+        return times
+
+
 def print_weighted_path(wg: WeightedGraph, wp: WeightedPath) -> None:
     for edge in wp:
         print(f"{wg.vertex_at(edge.u)} {edge.weight}> {wg.vertex_at(edge.v)}")
@@ -7,7 +7,9 @@ __license__ = "Apache 2.0"
 from collections import defaultdict
 from enum import Enum
 from itertools import product
-from typing import NamedTuple, Callable, Any
+from typing import NamedTuple, Callable, Any, Optional, Sequence, Union
+
+import numpy as np
 
 from ivonet.iter import flatten, max_idx
 
@@ -577,6 +579,333 @@ def transpose(grid: list[list[Any]] | tuple[list[Any]]) -> list[list[any]]:
     return list(zip(*grid))
 
 
+ORTHOGONAL = ((-1, 0), (0, 1), (1, 0), (0, -1))  # N, E, S, W as (row, col) offsets
+ALL_AROUND = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+
+class Grid:
+    """A 2d grid on a numpy array for whole grid operations
+
+    Instead of asking the neighbors of every cell one by one (a python call and a list of
+    Locations per cell), shift the whole array one step per direction and compare or add
+    the shifted arrays. Everything below works on all cells at once.
+
+    >>> grid = Grid.from_rows(["..@", "@@@", "..."])
+    >>> grid.count_neighbors("@").tolist()
+    [[2, 4, 2], [1, 3, 2], [2, 3, 2]]
+    >>> grid.argwhere(grid.mask("@") & (grid.count_neighbors("@") < 3))
+    [(0, 2), (1, 0), (1, 2)]
+    """
+
+    def __init__(self, cells: Any) -> None:
+        self.cells: np.ndarray = np.asarray(cells)
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[str], dtype: Any = None) -> "Grid":
+        """Parse the rows (e.g. from read_rows) into a grid of characters,
+        or with dtype=int for a grid of digits"""
+        cells = np.array([list(row) for row in rows])
+        return cls(cells if dtype is None else cells.astype(dtype))
+
+    @property
+    def height(self) -> int:
+        return self.cells.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self.cells.shape[1]
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.cells[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self.cells[key] = value
+
+    def __str__(self) -> str:
+        return "\n".join("".join(str(cell) for cell in row) for row in self.cells)
+
+    def shift(self, dr: int, dc: int, fill: Any = 0, cells: Optional[np.ndarray] = None) -> np.ndarray:
+        """For every cell the value of its neighbor at (row + dr, col + dc), fill outside the grid
+
+        cells: shift this array (e.g. a mask) of the same shape instead of the grid itself
+        """
+        cells = self.cells if cells is None else cells
+        shifted = np.full_like(cells, fill)
+        height, width = cells.shape
+        shifted[max(0, -dr):height - max(0, dr), max(0, -dc):width - max(0, dc)] = \
+            cells[max(0, dr):height + min(0, dr), max(0, dc):width + min(0, dc)]
+        return shifted
+
+    def neighbors(self, diagonal: bool = False, fill: Any = 0, cells: Optional[np.ndarray] = None) -> np.ndarray:
+        """The neighbor values of every cell as one array of shape (4 or 8, height, width)"""
+        offsets = ALL_AROUND if diagonal else ORTHOGONAL
+        return np.stack([self.shift(dr, dc, fill, cells) for dr, dc in offsets])
+
+    def mask(self, *values: Any) -> np.ndarray:
+        """True for every cell that has one of the values"""
+        return np.isin(self.cells, values)
+
+    def count(self, *values: Any) -> int:
+        return int(self.mask(*values).sum())
+
+    def count_neighbors(self, what: Any, diagonal: bool = True) -> np.ndarray:
+        """For every cell the number of neighbors that are `what` (a value or a boolean mask)"""
+        mask = what if isinstance(what, np.ndarray) and what.dtype == bool else self.mask(what)
+        return self.neighbors(diagonal, False, mask).sum(axis=0)
+
+    def argwhere(self, what: Any) -> list[tuple[int, int]]:
+        """All (row, col) positions where the mask is True or the value is found (row by row)"""
+        mask = what if isinstance(what, np.ndarray) and what.dtype == bool else self.mask(what)
+        return [(int(r), int(c)) for r, c in np.argwhere(mask)]
+
+    def find(self, value: Any) -> Optional[tuple[int, int]]:
+        """The first (row, col) of value or None"""
+        found = self.argwhere(value)
+        return found[0] if found else None
+
+
+class FlatGrid:
+    """A character grid in one flat bytearray surrounded by a one cell border
+
+    For walkers (bfs, guards, pipes) a cell is just an int index. The neighbors are
+    i - stride, i + 1, i + stride and i - 1 and no bounds checks are needed because a
+    walker runs into the `border` value before it can fall off the grid. Only convert
+    to and from (row, col) at the edges with `index` and `position`.
+
+    >>> grid = FlatGrid(["#..", ".S."], border="~")
+    >>> start = grid.find("S")
+    >>> grid.position(start)
+    (1, 1)
+    >>> [grid[i] for i in grid.neighbors(start)]
+    ['.', '.', '~', '.']
+    """
+
+    def __init__(self, rows: Sequence[str], border: str = " ") -> None:
+        self.height: int = len(rows)
+        self.width: int = len(rows[0]) if rows else 0
+        self.stride: int = self.width + 2
+        self.border: int = ord(border)
+        self.cells: bytearray = bytearray(border * self.stride, "latin-1")
+        for row in rows:
+            self.cells += f"{border}{row}{border}".encode("latin-1")
+        self.cells += bytearray(border * self.stride, "latin-1")
+        # N, E, S, W clockwise so (d + 1) % 4 turns right and (d + 2) % 4 turns around
+        self.offsets: tuple[int, ...] = (-self.stride, 1, self.stride, -1)
+        self.diagonal_offsets: tuple[int, ...] = (-self.stride + 1, self.stride + 1, self.stride - 1, -self.stride - 1)
+
+    def index(self, row: int, col: int) -> int:
+        return (row + 1) * self.stride + col + 1
+
+    def position(self, index: int) -> tuple[int, int]:
+        row, col = divmod(index, self.stride)
+        return row - 1, col - 1
+
+    def __getitem__(self, index: int) -> str:
+        return chr(self.cells[index])
+
+    def __setitem__(self, index: int, value: str) -> None:
+        self.cells[index] = ord(value)
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def is_border(self, index: int) -> bool:
+        row, col = self.position(index)
+        return not (0 <= row < self.height and 0 <= col < self.width)
+
+    def neighbors(self, index: int, diagonal: bool = False) -> list[int]:
+        """The N, E, S, W (and with diagonal NE, SE, SW, NW) neighbor indices, border cells included"""
+        offsets = self.offsets + self.diagonal_offsets if diagonal else self.offsets
+        return [index + offset for offset in offsets]
+
+    def find(self, value: str, start: int = 0) -> int:
+        """Index of the first cell with value (-1 if not found), a C speed search"""
+        return self.cells.find(ord(value), start)
+
+    def count(self, value: str) -> int:
+        return self.cells.count(ord(value))
+
+    def copy(self) -> "FlatGrid":
+        clone = object.__new__(FlatGrid)
+        clone.__dict__.update(self.__dict__)
+        clone.cells = bytearray(self.cells)
+        return clone
+
+    def rows(self) -> list[str]:
+        """The rows without the border"""
+        return [self.cells[self.index(r, 0):self.index(r, 0) + self.width].decode("latin-1")
+                for r in range(self.height)]
+
+    def __str__(self) -> str:
+        return "\n".join(self.rows())
+
+
+class LineOfSight:
+    """For every cell and direction the first cell it can see, precomputed for the whole grid
+
+    Walking a ray from every cell in every direction (every generation again) is
+    O(cells * ray length). Here every row, column and diagonal is swept once from the
+    end the direction points to, remembering what a cell looking that way would see:
+    - first: the last stopping cell passed (a seat in a floor full of seats)
+    - blocking: a monotonic stack of the cells higher than everything behind them
+      (the nearest tree at least as tall)
+
+    The results are flat indices (row * width + col) in an array of shape
+    (directions, height, width) and -1 if nothing is seen. Append one extra value to a
+    flattened array and indexing with -1 picks up that value for free:
+
+    >>> sight = LineOfSight((1, 5), directions=((0, -1), (0, 1)))
+    >>> sight.blocking(np.array([[3, 1, 2, 5, 0]])).tolist()
+    [[[-1, 0, 0, -1, 3]], [[3, 2, 3, -1, -1]]]
+    >>> sight.distances(sight.blocking(np.array([[3, 1, 2, 5, 0]]))).tolist()
+    [[[0, 1, 2, 3, 1]], [[3, 1, 1, 1, 0]]]
+    """
+
+    def __init__(self, shape: tuple[int, int], directions: Sequence[tuple[int, int]] = ALL_AROUND) -> None:
+        self.height, self.width = shape
+        self.directions = tuple(directions)
+        # per direction the lines through the grid, every line ordered in the direction of sight
+        self.lines: list[list[list[int]]] = [self._lines(dr, dc) for dr, dc in self.directions]
+
+    def _lines(self, dr: int, dc: int) -> list[list[int]]:
+        lines = []
+        for r, c in product(range(self.height), range(self.width)):
+            if 0 <= r - dr < self.height and 0 <= c - dc < self.width:
+                continue  # not the start of a line
+            line = []
+            while 0 <= r < self.height and 0 <= c < self.width:
+                line.append(r * self.width + c)
+                r, c = r + dr, c + dc
+            lines.append(line)
+        return lines
+
+    def first(self, stop: np.ndarray) -> np.ndarray:
+        """Per direction and cell the first cell where stop is True (e.g. not floor) or -1"""
+        stop = np.asarray(stop, dtype=bool).ravel().tolist()
+        seen = np.full((len(self.directions), self.height * self.width), -1, dtype=np.int64)
+        for d, lines in enumerate(self.lines):
+            found = seen[d]
+            for line in lines:
+                last = -1
+                for cell in reversed(line):
+                    found[cell] = last
+                    if stop[cell]:
+                        last = cell
+        return seen.reshape(len(self.directions), self.height, self.width)
+
+    def blocking(self, heights: np.ndarray) -> np.ndarray:
+        """Per direction and cell the nearest cell at least as high or -1 (seen from outside the grid)"""
+        heights = np.asarray(heights).ravel().tolist()
+        seen = np.full((len(self.directions), self.height * self.width), -1, dtype=np.int64)
+        for d, lines in enumerate(self.lines):
+            found = seen[d]
+            for line in lines:
+                stack: list[int] = []
+                for cell in reversed(line):
+                    while stack and heights[stack[-1]] < heights[cell]:
+                        stack.pop()
+                    if stack:
+                        found[cell] = stack[-1]
+                    stack.append(cell)
+        return seen.reshape(len(self.directions), self.height, self.width)
+
+    def distances(self, seen: np.ndarray) -> np.ndarray:
+        """The number of steps to the seen cell, or to the edge of the grid where nothing is seen"""
+        rows, cols = np.indices((self.height, self.width))
+        distances = np.empty_like(seen)
+        for d, (dr, dc) in enumerate(self.directions):
+            to_edge = np.full(rows.shape, self.height + self.width)
+            if dr:
+                to_edge = np.minimum(to_edge, rows if dr < 0 else self.height - 1 - rows)
+            if dc:
+                to_edge = np.minimum(to_edge, cols if dc < 0 else self.width - 1 - cols)
+            target_rows, target_cols = np.divmod(seen[d], self.width)
+            to_seen = np.maximum(np.abs(target_rows - rows), np.abs(target_cols - cols))
+            distances[d] = np.where(seen[d] >= 0, to_seen, to_edge)
+        return distances
+
+
+class SummedArea:
+    """Integral image: the sum of any rectangle in O(1) after one cumsum over the grid
+
+    table[r, c] is the sum of all the values above and left of (r, c), so a rectangle is
+    4 lookups. The rectangles are half open like slices: sum(top, left, bottom, right)
+    is values[top:bottom, left:right].sum(). The table has the dtype of the cumsum of the
+    values, so floats stay floats (and booleans are counted as ints).
+
+    >>> area = SummedArea(np.arange(12).reshape(3, 4))
+    >>> area.sum(1, 1, 3, 3)
+    30
+    >>> area.squares(2).tolist()
+    [[10, 14, 18], [26, 30, 34]]
+    >>> area.max_square()
+    (54, 0, 1, 3)
+    """
+
+    def __init__(self, values: Any) -> None:
+        values = np.asarray(values)
+        self.height, self.width = values.shape
+        summed = values.cumsum(axis=0).cumsum(axis=1)
+        self.table: np.ndarray = np.zeros((self.height + 1, self.width + 1), dtype=summed.dtype)
+        self.table[1:, 1:] = summed
+
+    def sum(self, top: int, left: int, bottom: int, right: int) -> Union[int, float]:
+        t = self.table
+        return (t[bottom, right] - t[top, right] - t[bottom, left] + t[top, left]).item()
+
+    def squares(self, size: int) -> np.ndarray:
+        """The sum of every size x size square at once, indexed by its top left corner"""
+        t = self.table
+        return t[size:, size:] - t[:-size, size:] - t[size:, :-size] + t[:-size, :-size]
+
+    def max_square(self, sizes: Optional[Sequence[int]] = None) -> tuple[Union[int, float], int, int, int]:
+        """(sum, top, left, size) of the square with the highest sum of all the sizes (default all)
+
+        ValueError when there are no sizes to try or a size does not fit in the grid.
+        """
+        largest = min(self.height, self.width)
+        sizes = range(1, largest + 1) if sizes is None else sizes
+        if not sizes:
+            raise ValueError("max_square needs at least one size")
+        if any(not 1 <= size <= largest for size in sizes):
+            raise ValueError(f"max_square sizes must be between 1 and {largest}")
+        best = None
+        for size in sizes:
+            totals = self.squares(size)
+            top, left = np.unravel_index(np.argmax(totals), totals.shape)
+            if best is None or totals[top, left] > best[0]:
+                best = totals[top, left].item(), int(top), int(left), size
+        return best
+
+
+class DifferenceArray:
+    """Add a value to many rectangles and only then look at the cells
+
+    Every add only touches the 4 corners; one cumsum over the grid turns the corners
+    into the values of all the cells. The rectangles are half open like slices.
+    Use a float dtype for fractional values, they would be truncated in the default int64.
+
+    >>> claims = DifferenceArray((3, 4))
+    >>> claims.add(0, 0, 2, 2)
+    >>> claims.add(1, 1, 3, 4, 2)
+    >>> claims.values().tolist()
+    [[1, 1, 0, 0], [1, 3, 2, 2], [0, 2, 2, 2]]
+    """
+
+    def __init__(self, shape: tuple[int, int], dtype: Any = np.int64) -> None:
+        self.shape = shape
+        self.diff: np.ndarray = np.zeros((shape[0] + 1, shape[1] + 1), dtype=dtype)
+
+    def add(self, top: int, left: int, bottom: int, right: int, value: Union[int, float] = 1) -> None:
+        self.diff[top, left] += value
+        self.diff[top, right] -= value
+        self.diff[bottom, left] -= value
+        self.diff[bottom, right] += value
+
+    def values(self) -> np.ndarray:
+        return self.diff.cumsum(axis=0).cumsum(axis=1)[:self.shape[0], :self.shape[1]]
+
+
 class Cell(str, Enum):
     EMPTY = "."
     BLOCKED = "#"
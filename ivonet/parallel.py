@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#  -*- coding: utf-8 -*-
+__author__ = "Ivo Woltring"
+__revised__ = "$revised: 18/10/2026 12:00$"
+__copyright__ = "Copyright (c) 2026 Ivo Woltring"
+__license__ = "Apache 2.0"
+__doc__ = """
+Run the same function for many independent starts on all the cores.
+
+The read-only data every call needs (the grid, the parsed puzzle) is shipped to every
+worker process once when the pool starts, instead of once per item.
+"""
+
+import os
+from multiprocessing import get_context, get_all_start_methods
+from typing import Any, Callable, Iterable, Optional, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# set in every worker process by _initialize
+_worker_fn: Optional[Callable[[Any, Any], Any]] = None
+_worker_shared: Any = None
+
+
+def _initialize(fn: Callable[[Any, T], R], shared: Any) -> None:
+    global _worker_fn, _worker_shared
+    _worker_fn = fn
+    _worker_shared = shared
+
+
+def _call(item: T) -> R:
+    return _worker_fn(_worker_shared, item)
+
+
+def parallel_map(fn: Callable[[Any, T], R],
+                 items: Iterable[T],
+                 shared: Any = None,
+                 processes: Optional[int] = None,
+                 min_items: int = 16,
+                 chunksize: Optional[int] = None) -> list[R]:
+    """Return [fn(shared, item) for item in items] computed on a process pool.
+
+    - fn: must be a module level function (it gets pickled) called as fn(shared, item)
+    - shared: read-only data for every call, sent to each worker only once
+    - processes: number of workers, defaults to the number of cores
+    - min_items: below this number of items (or with one process) it just runs serially,
+      starting a pool costs more than it saves for tiny inputs
+    - chunksize: items per task, defaults to spreading the items in about 4 chunks per worker
+
+    The results are in the same order as the items.
+    - see 2023 day 16 (every entry on the edge of the grid)
+    """
+    items = list(items)
+    processes = processes or os.cpu_count() or 1
+    processes = min(processes, len(items))
+    if processes <= 1 or len(items) < min_items:
+        return [fn(shared, item) for item in items]
+    if chunksize is None:
+        chunksize = max(1, len(items) // (processes * 4))
+    # fork shares the memory of the parent, so the shared data is not even pickled on linux
+    method = "fork" if "fork" in get_all_start_methods() else "spawn"
+    with get_context(method).Pool(processes, initializer=_initialize, initargs=(fn, shared)) as pool:
+        return pool.map(_call, items, chunksize=chunksize)
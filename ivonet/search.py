@@ -15,14 +15,23 @@
 # limitations under the License.
 from __future__ import annotations
 
+import inspect
 from collections import deque
-from typing import TypeVar, Iterable, Sequence, Generic, List, Callable, Any, Optional, Protocol
+from dataclasses import dataclass
+from functools import wraps
+from itertools import count
+from math import inf
+from time import perf_counter
+from typing import TypeVar, Iterable, Iterator, Sequence, Generic, List, Callable, Any, Optional, Protocol
 
-from ivonet.collection import PriorityQueue, Stack, Queue
+from ivonet.collection import PriorityQueue, Stack, Queue, BucketQueue
 
 T = TypeVar('T')
+R = TypeVar('R')
 C = TypeVar("C", bound="Comparable")
 
+_EXHAUSTED = object()  # sentinel for next() on a successors iterator
+
 DIRECTIONS = [
     (0, 1),  # right
     (0, -1),  # left
@@ -85,6 +94,119 @@ class Node(Generic[T]):
         return f"state[{self.state}] - cost_calculator[{self.cost}] - parent[None]"
 
 
+class SearchStats:
+    """Counters and timings of a search run.
+
+    Pass an instance as `stats` to a search engine and print it afterwards.
+    Without it (the default) the engines do no bookkeeping at all.
+
+    - expanded: states whose successors were asked for
+    - generated: children returned by successors
+    - duplicates: children skipped because they were seen before (or not cheaper)
+    - peak_frontier / peak_explored: the largest size the frontier / explored set reached
+    - times: seconds spent in the successors, heuristic and cost callbacks
+    - elapsed: seconds spent inside the searches it was given to (they add up when the
+      same instance is passed to more searches, like the counts)
+    """
+
+    def __init__(self) -> None:
+        self.expanded: int = 0
+        self.generated: int = 0
+        self.duplicates: int = 0
+        self.peak_frontier: int = 0
+        self.peak_explored: int = 0
+        self.times: dict[str, float] = {"successors": 0.0, "heuristic": 0.0, "cost": 0.0}
+        self._elapsed: float = 0.0
+        self._started: float = 0.0
+        self._running: int = 0  # nesting depth, engines built on other engines only count once
+
+    def start(self) -> "SearchStats":
+        if not self._running:
+            self._started = perf_counter()
+        self._running += 1
+        return self
+
+    def stop(self) -> None:
+        self._running -= 1
+        if not self._running:
+            self._elapsed += perf_counter() - self._started
+
+    def __enter__(self) -> "SearchStats":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds in searches so far, including the one running now"""
+        return self._elapsed + (perf_counter() - self._started if self._running else 0.0)
+
+    def successors(self, successors: Callable[[T], Iterable[T]]) -> Callable[[T], list[T]]:
+        """Wrap a successors callback so it counts expansions and generated children"""
+
+        def counted(state: T) -> list[T]:
+            start = perf_counter()
+            children = list(successors(state))
+            self.times["successors"] += perf_counter() - start
+            self.expanded += 1
+            self.generated += len(children)
+            return children
+
+        return counted
+
+    def timed(self, name: str, fn: Callable[[T], Any]) -> Callable[[T], Any]:
+        """Wrap a callback so the time spent in it adds up under name"""
+
+        def timing(state: T) -> Any:
+            start = perf_counter()
+            result = fn(state)
+            self.times[name] = self.times.get(name, 0.0) + perf_counter() - start
+            return result
+
+        return timing
+
+    def observe(self, frontier_size: int, explored_size: int) -> None:
+        self.peak_frontier = max(self.peak_frontier, frontier_size)
+        self.peak_explored = max(self.peak_explored, explored_size)
+
+    def __str__(self) -> str:
+        times = ", ".join(f"{name} {seconds:.4f}s" for name, seconds in self.times.items())
+        return (f"expanded {self.expanded}, generated {self.generated}, duplicates {self.duplicates}, "
+                f"peak frontier {self.peak_frontier}, peak explored {self.peak_explored}, "
+                f"elapsed {self.elapsed:.4f}s ({times})")
+
+    def print(self, title: str = "search") -> None:
+        print(f"{title}: {self}")
+
+
+def _timed_search(engine: Callable[..., R]) -> Callable[..., R]:
+    """Decorator for a search engine: when it gets a `stats` the time of the call is added to it"""
+    signature = inspect.signature(engine)
+
+    @wraps(engine)
+    def timed(*args: Any, **kwargs: Any) -> R:
+        stats = signature.bind(*args, **kwargs).arguments.get("stats")
+        if stats is None:
+            return engine(*args, **kwargs)
+        with stats:
+            return engine(*args, **kwargs)
+
+    return timed
+
+
+def _instrumented(stats: Optional[SearchStats],
+                  successors: Callable[[T], Iterable[T]],
+                  heuristic: Optional[Callable[[T], float]] = None,
+                  cost: Optional[Callable[[T], float]] = None) -> tuple:
+    """The callbacks as they are, or wrapped by stats when given"""
+    if stats is None:
+        return successors, heuristic, cost
+    return (stats.successors(successors),
+            heuristic and stats.timed("heuristic", heuristic),
+            cost and stats.timed("cost", cost))
+
+
 def _state_key(state: Any) -> Any:
     """Return a hashable key for a state, converting common unhashable types.
 
@@ -112,29 +234,95 @@ def _state_key(state: Any) -> Any:
         return repr(state)
 
 
-def dfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], list[T]]) -> Optional[Node[T]]:
+def bit_packer(*widths: int) -> tuple[Callable[[Sequence[int]], int], Callable[[int], tuple[int, ...]]]:
+    """Create an encode / decode pair that packs a fixed length tuple of small
+    non-negative ints into one int. Every position gets its own bit width.
+
+    >>> encode, decode = bit_packer(2, 4, 1)
+    >>> encode((3, 9, 1))
+    115
+    >>> decode(115)
+    (3, 9, 1)
+
+    Use it as the `encode` / `decode` of the search engines so the explored set holds
+    small ints instead of (nested) tuples.
+    """
+    shifts: list[int] = []
+    shift = 0
+    for width in reversed(widths):
+        shifts.append(shift)
+        shift += width
+    shifts.reverse()
+    masks = [(1 << width) - 1 for width in widths]
+    pairs = list(zip(shifts, masks))
+
+    def encode(values: Sequence[int]) -> int:
+        key = 0
+        for value, (sh, mask) in zip(values, pairs):
+            if value & ~mask:
+                raise ValueError(f"{value} does not fit in {mask.bit_length()} bits")
+            key |= value << sh
+        return key
+
+    def decode(key: int) -> tuple[int, ...]:
+        return tuple((key >> sh) & mask for sh, mask in pairs)
+
+    return encode, decode
+
+
+def _decoded(node: Optional[Node], decode: Optional[Callable[[Any], T]]) -> Optional[Node[T]]:
+    """Rebuild a Node chain that holds encoded states with the decoded states"""
+    if node is None or decode is None:
+        return node
+    chain: list[Node] = []
+    while node is not None:
+        chain.append(node)
+        node = node.parent
+    result: Optional[Node[T]] = None
+    for n in reversed(chain):
+        result = Node(decode(n.state), result, n.cost, n.heuristic)
+    return result
+
+
+@_timed_search
+def dfs(initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], list[T]],
+        encode: Optional[Callable[[T], Any]] = None,
+        decode: Optional[Callable[[Any], T]] = None,
+        stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
     """Depth first search
+
+    For the `encode` / `decode` state keys see `bfs`.
+    Give a `SearchStats` as stats to count expansions, duplicates and peak sizes.
     """
+    key = encode or _state_key
+    successors, _, _ = _instrumented(stats, successors)
     # frontier is where we've yet to go
     frontier: Stack[Node[T]] = Stack()
-    frontier.push(Node(initial, None))
+    initial_key = key(initial)
+    frontier.push(Node(initial_key if decode else initial, None))
     # explored is where we've been (store keys)
-    explored: set[Any] = {_state_key(initial)}
+    explored: set[Any] = {initial_key}
 
     # keep going while there is more to explore
     while not frontier.empty:
         current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
+        current_state: T = decode(current_node.state) if decode else current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _decoded(current_node, decode)
         # check where we can go next and haven't explored
         for child in successors(current_state):
-            k = _state_key(child)
+            k = key(child)
             if k in explored:  # skip children we already explored
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(k)
-            frontier.push(Node(child, current_node))
+            frontier.push(Node(k if decode else child, current_node))
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
     return None  # went through everything and never found goal
 
 
@@ -148,7 +336,13 @@ def node_to_path(node: Node[T]) -> List[T]:
     return path
 
 
-def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], list[T]]) -> Optional[Node[T]]:
+@_timed_search
+def bfs(initial: T,
+        goal_test: Callable[[T], bool],
+        successors: Callable[[T], list[T]],
+        encode: Optional[Callable[[T], Any]] = None,
+        decode: Optional[Callable[[Any], T]] = None,
+        stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
     """Breath first search
 
     See for a nice implementation with extra's see:
@@ -157,71 +351,297 @@ def bfs(initial: T, goal_test: Callable[[T], bool], successors: Callable[[T], li
     - Year 2023 day 10
     - year 2024 day 18 - Twist with a new blockage every step
     - year 2025 day 10 - part 1 twist with not being a grid
+
+    State keys:
+    - encode: optional callback mapping a state to a compact hashable key (e.g. an int,
+      see `bit_packer`). Without it `_state_key` is used.
+    - decode: optional inverse of encode. When given the frontier only holds the encoded
+      keys and states are decoded when popped. The returned chain holds decoded states.
+
+    Give a `SearchStats` as stats to count expansions, duplicates and peak sizes.
     """
+    key = encode or _state_key
+    successors, _, _ = _instrumented(stats, successors)
     # frontier is where we've yet to go
     frontier: Queue[Node[T]] = Queue()
-    frontier.push(Node(initial, None))
+    initial_key = key(initial)
+    frontier.push(Node(initial_key if decode else initial, None))
     # explored is where we've been (store keys)
-    explored: set[Any] = {_state_key(initial)}
+    explored: set[Any] = {initial_key}
 
     # keep going while there is more to explore
     while not frontier.empty:
         current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
+        current_state: T = decode(current_node.state) if decode else current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _decoded(current_node, decode)
         # check where we can go next and haven't explored
         for child in successors(current_state):
-            k = _state_key(child)
+            k = key(child)
             if k in explored:  # skip children we already explored
+                if stats is not None:
+                    stats.duplicates += 1
                 continue
             explored.add(k)
-            frontier.push(Node(child, current_node))
+            frontier.push(Node(k if decode else child, current_node))
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
     return None  # went through everything and never found goal
 
 
-def bfs_shortest(start, end, grid):
-    """fastest path from start to end
-    :returns: distance, path
+def _expand_level(frontier: list[T],
+                  own: dict[Any, tuple[T, Any, int]],
+                  other: dict[Any, tuple[T, Any, int]],
+                  successors: Callable[[T], list[T]],
+                  stats: Optional[SearchStats] = None) -> tuple[list[T], Any]:
+    """Expand one full bfs level for `bidirectional_bfs`.
+
+    :returns: the next level and the key of the cheapest meeting state (None if not met)
+    """
+    next_level: list[T] = []
+    meet, meet_length = None, None
+    for state in frontier:
+        parent_key = _state_key(state)
+        depth = own[parent_key][2] + 1
+        for child in successors(state):
+            k = _state_key(child)
+            if k in own:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            own[k] = (child, parent_key, depth)
+            next_level.append(child)
+            if k in other and (meet is None or depth + other[k][2] < meet_length):
+                meet, meet_length = k, depth + other[k][2]
+    return next_level, meet
+
+
+@_timed_search
+def bidirectional_bfs(initial: T,
+                      goal: T,
+                      successors: Callable[[T], list[T]],
+                      predecessors: Optional[Callable[[T], list[T]]] = None,
+                      stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """Breath first search from both ends meeting in the middle
+
+    Use it instead of `bfs` when the goal is one known state. Expanding the smallest
+    frontier a full level at a time explores about 2·b^(d/2) states instead of b^d.
+    If the moves can not be undone by a move (directed graph) you need to provide the
+    `predecessors` callback, otherwise the successors are used both ways.
+
+    The result is a Node chain from initial to goal just like `bfs` so `node_to_path` works.
+    The `stats` frontier and explored sizes are those of both sides together.
+    - see 2025 day 10 part 1
     """
-    q = deque([(start, 0, [start])])
-    seen = {start}
+    if predecessors is None:
+        predecessors = successors
+    if stats is not None:
+        successors, predecessors = stats.successors(successors), stats.successors(predecessors)
+    start_key, goal_key = _state_key(initial), _state_key(goal)
+    if start_key == goal_key:
+        return Node(initial, None)
+    # key -> (state, parent key, depth)
+    forward: dict[Any, tuple[T, Any, int]] = {start_key: (initial, None, 0)}
+    backward: dict[Any, tuple[T, Any, int]] = {goal_key: (goal, None, 0)}
+    forward_frontier: list[T] = [initial]
+    backward_frontier: list[T] = [goal]
+
+    while forward_frontier and backward_frontier:
+        if len(forward_frontier) <= len(backward_frontier):
+            forward_frontier, meet = _expand_level(forward_frontier, forward, backward, successors, stats)
+        else:
+            backward_frontier, meet = _expand_level(backward_frontier, backward, forward, predecessors, stats)
+        if stats is not None:
+            stats.observe(len(forward_frontier) + len(backward_frontier), len(forward) + len(backward))
+        if meet is None:
+            continue
+        # walk back to the start and forward to the goal from where we met
+        path: list[T] = []
+        k = meet
+        while k is not None:
+            state, k, _ = forward[k]
+            path.append(state)
+        path.reverse()
+        k = backward[meet][1]
+        while k is not None:
+            state, k, _ = backward[k]
+            path.append(state)
+        node: Optional[Node[T]] = None
+        for state in path:
+            node = Node(state, node)
+        return node
+    return None  # one side ran out of states so they can never meet
+
+
+@_timed_search
+def bfs_grid(start: tuple[int, int],
+             end: tuple[int, int],
+             grid: Sequence[Sequence[Any]],
+             wall: Any = "#",
+             stats: Optional[SearchStats] = None) -> tuple[Optional[int], list[tuple[int, int]]]:
+    """Grid bfs from start to end keeping one predecessor per cell.
+
+    Cells are numbered r * width + c and the predecessors live in one flat list, so no
+    path is copied while searching. The path is only rebuilt for the goal.
+    For `stats` see `bfs`, the moves are counted inline as there is no successors callback.
+    :returns: distance, path (None, [] if end can not be reached)
+    """
+    height, width = len(grid), len(grid[0])
+    parent: list[int] = [-1] * (height * width)  # -1 = not seen yet
+    first = start[0] * width + start[1]
+    goal = end[0] * width + end[1]
+    parent[first] = first
+    q = deque([first])
+    seen = 1
     while q:
-        (r, c), dist, path = q.popleft()
-        if (r, c) == end:
-            return dist, path
+        i = q.popleft()
+        if i == goal:
+            break
+        r, c = divmod(i, width)
+        if stats is not None:
+            stats.expanded += 1
         for dr, dc in DIRECTIONS:
             rr, cc = r + dr, c + dc
-            if 0 <= rr < len(grid) and 0 <= cc < len(grid[0]) and grid[rr][cc] != "#" and (rr, cc) not in seen:
-                seen.add((rr, cc))
-                q.append(((rr, cc), dist + 1, path + [(rr, cc)]))
-    return None, []
+            if 0 <= rr < height and 0 <= cc < width and grid[rr][cc] != wall:
+                j = rr * width + cc
+                if stats is not None:
+                    stats.generated += 1
+                if parent[j] == -1:
+                    parent[j] = i
+                    q.append(j)
+                    seen += 1
+                elif stats is not None:
+                    stats.duplicates += 1
+        if stats is not None:
+            stats.observe(len(q), seen)
+    else:
+        return None, []
+    path = [goal]
+    while path[-1] != first:
+        path.append(parent[path[-1]])
+    path.reverse()
+    return len(path) - 1, [divmod(i, width) for i in path]
+
+
+def bfs_shortest(start, end, grid):
+    """fastest path from start to end
+    :returns: distance, path
+    """
+    return bfs_grid(start, end, grid)
 
 
 def bfs_shortest_with_distance(start, end, grid):
     """fastest path from start to end
     :returns: distance, [(path, dist)]
     """
-    q = deque([(start, 0, [(start, 0)])])
-    seen = {start}
-    while q:
-        (r, c), dist, path = q.popleft()
-        if (r, c) == end:
-            return dist, path
-        for dr, dc in DIRECTIONS:
-            rr, cc = r + dr, c + dc
-            if 0 <= rr < len(grid) and 0 <= cc < len(grid[0]) and grid[rr][cc] != "#" and (rr, cc) not in seen:
-                seen.add((rr, cc))
-                q.append(((rr, cc), dist + 1, path + [((rr, cc), dist + 1)]))
-    return None, []
+    dist, path = bfs_grid(start, end, grid)
+    return dist, [(loc, d) for d, loc in enumerate(path)]
+
+
+@_timed_search
+def distance_field(sources: Iterable[tuple[int, int]],
+                   grid: Sequence[Sequence[Any]],
+                   wall: Any = "#",
+                   successors: Optional[Callable[[tuple[int, int]], Iterable[tuple[int, int]]]] = None,
+                   cost: Optional[Callable[[tuple[int, int]], float]] = None,
+                   max_distance: Optional[float] = None,
+                   parity: bool = False,
+                   as_numpy: bool = False,
+                   stats: Optional[SearchStats] = None):
+    """Distance from the nearest of the sources to every cell of the grid in one pass.
+
+    - multi source: all sources start at distance 0 (e.g. every 'a' of 2022 day 12)
+    - successors: optional callback (r, c) -> neighbours to replace the default
+      4-neighbour move that skips `wall` cells
+    - cost: optional callback with the cost of entering a cell, makes it a Dijkstra
+      instead of a bfs
+    - max_distance: stop expanding cells beyond this distance
+    - parity: also return the (even, odd) counts of the reached cells (2023 day 21)
+    - as_numpy: return a numpy array instead of a list of lists
+    - stats: optional `SearchStats`, explored is the number of cells reached
+
+    Unreachable cells get -1.
+    :returns: distances or (distances, (even, odd)) when parity is set
+    """
+    height, width = len(grid), len(grid[0])
+    dist: list[float] = [-1] * (height * width)
+
+    if successors is None:
+        def successors(loc: tuple[int, int]) -> list[tuple[int, int]]:
+            r, c = loc
+            return [(r + dr, c + dc) for dr, dc in DIRECTIONS
+                    if 0 <= r + dr < height and 0 <= c + dc < width and grid[r + dr][c + dc] != wall]
+
+    successors, _, cost = _instrumented(stats, successors, None, cost)
+    reached = 0
+    if cost is None:
+        q = deque()
+        for loc in sources:
+            if dist[loc[0] * width + loc[1]] == -1:
+                dist[loc[0] * width + loc[1]] = 0
+                q.append(loc)
+                reached += 1
+        while q:
+            loc = q.popleft()
+            d = dist[loc[0] * width + loc[1]] + 1
+            if max_distance is not None and d > max_distance:
+                continue
+            for nb in successors(loc):
+                i = nb[0] * width + nb[1]
+                if dist[i] == -1:
+                    dist[i] = d
+                    q.append(nb)
+                    reached += 1
+                elif stats is not None:
+                    stats.duplicates += 1
+            if stats is not None:
+                stats.observe(len(q), reached)
+    else:
+        tie_breaker = count()
+        frontier: PriorityQueue[tuple[float, int, tuple[int, int]]] = PriorityQueue()
+        for loc in sources:
+            if dist[loc[0] * width + loc[1]] == -1:
+                reached += 1
+            dist[loc[0] * width + loc[1]] = 0
+            frontier.push((0, next(tie_breaker), loc))
+        while not frontier.empty:
+            d, _, loc = frontier.pop()
+            if d > dist[loc[0] * width + loc[1]]:
+                continue  # stale entry
+            for nb in successors(loc):
+                i = nb[0] * width + nb[1]
+                nd = d + cost(nb)
+                if max_distance is not None and nd > max_distance:
+                    continue
+                if dist[i] == -1 or nd < dist[i]:
+                    reached += dist[i] == -1
+                    dist[i] = nd
+                    frontier.push((nd, next(tie_breaker), nb))
+                elif stats is not None:
+                    stats.duplicates += 1
+            if stats is not None:
+                stats.observe(len(frontier), reached)
 
+    result = [dist[r * width:(r + 1) * width] for r in range(height)]
+    if as_numpy:
+        import numpy as np
+        result = np.array(result)
+    if parity:
+        even = sum(1 for d in dist if d >= 0 and d % 2 == 0)
+        return result, (even, sum(1 for d in dist if d >= 0) - even)
+    return result
 
+
+@_timed_search
 def astar(initial: T,
           goal_test: Callable[[T], bool],
           successors: Callable[[T], list[T]],
           heuristic: Callable[[T], float],
-          cost: Callable[[T], int]) -> Optional[Node[T]]:
+          cost: Callable[[T], int],
+          encode: Optional[Callable[[T], Any]] = None,
+          decode: Optional[Callable[[Any], T]] = None,
+          stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
     """The A* (astar)
 
     The A* (A-star) algorithm is a popular pathfinding and graph traversal algorithm used to find the
@@ -232,49 +652,502 @@ def astar(initial: T,
     is a dfs but you can provide a cost callback function that can direct your search
     - see 2021/Day15 of the Advent of Code for an implementation example
     - see 2022/Day17 for an implementation with a twist (max steps in a direction and how many steps before turning)
+
+    For the `encode` / `decode` state keys and `stats` see `bfs`.
     """
+    key = encode or _state_key
+    successors, heuristic, cost = _instrumented(stats, successors, heuristic, cost)
     # frontier is where we've yet to go
     frontier: PriorityQueue[Node[T]] = PriorityQueue()
-    frontier.push(Node(initial, None, 0.0, heuristic(initial)))
+    initial_key = key(initial)
+    frontier.push(Node(initial_key if decode else initial, None, 0.0, heuristic(initial)))
     # explored is where we've been (store keys -> cost)
-    explored: dict[Any, float] = {_state_key(initial): 0.0}
+    explored: dict[Any, float] = {initial_key: 0.0}
 
     # keep going while there is more to explore
     while not frontier.empty:
         current_node: Node[T] = frontier.pop()
-        current_state: T = current_node.state
+        current_state: T = decode(current_node.state) if decode else current_node.state
         # if we found the goal, we're done
         if goal_test(current_state):
-            return current_node
+            return _decoded(current_node, decode)
         # check where we can go next and haven't explored
         for nb in successors(current_state):
             new_cost: float = current_node.cost + cost(nb)
-            k = _state_key(nb)
+            k = key(nb)
 
             if k not in explored or explored[k] > new_cost:
                 explored[k] = new_cost
-                frontier.push(Node(nb, current_node, new_cost, heuristic(nb)))
+                frontier.push(Node(k if decode else nb, current_node, new_cost, heuristic(nb)))
+            elif stats is not None:
+                stats.duplicates += 1
+        if stats is not None:
+            stats.observe(len(frontier), len(explored))
     return None  # went through everything and never found goal
 
 
+class ShortestPaths(Generic[T]):
+    """All the shortest paths found by `dijkstra_all` as a predecessor DAG.
+
+    Attributes:
+        cost: the cost of the shortest path(s)
+        start: key of the initial state
+        goals: keys of the goal states reached at that cost
+        states: key -> state
+        distances: key -> cheapest cost from the start
+        predecessors: key -> keys of all the states it is reached from at its cheapest cost
+    """
+
+    def __init__(self) -> None:
+        self.cost: float = inf
+        self.start: Any = None
+        self.goals: list[Any] = []
+        self.states: dict[Any, T] = {}
+        self.distances: dict[Any, float] = {}
+        self.predecessors: dict[Any, list[Any]] = {}
+
+    def _on_paths(self) -> list[Any]:
+        """Keys of every state on a shortest path, walking the DAG back from the goals"""
+        seen: set[Any] = set(self.goals)
+        todo: list[Any] = list(self.goals)
+        while todo:
+            key = todo.pop()
+            for parent in self.predecessors.get(key, []):
+                if parent not in seen:
+                    seen.add(parent)
+                    todo.append(parent)
+        return sorted(seen, key=self.distances.__getitem__)
+
+
+def count_shortest_paths(paths: ShortestPaths) -> int:
+    """Number of distinct shortest paths from the start to any of the goals.
+    Linear in the size of the DAG: counts are summed in order of distance."""
+    counts: dict[Any, int] = {}
+    for key in paths._on_paths():
+        counts[key] = 1 if key == paths.start else sum(counts[p] for p in paths.predecessors[key])
+    return sum(counts[goal] for goal in paths.goals)
+
+
+def states_on_shortest_paths(paths: ShortestPaths[T]) -> list[T]:
+    """Every state that is part of at least one shortest path (ordered by distance)
+    - see 2024 day 16 part 2 (tiles on any best path)
+    """
+    return [paths.states[key] for key in paths._on_paths()]
+
+
+def iter_shortest_paths(paths: ShortestPaths[T]) -> Iterator[list[T]]:
+    """Generate every shortest path as a list of states from start to goal.
+    There can be exponentially many, so prefer `count_shortest_paths` or
+    `states_on_shortest_paths` when that is all you need."""
+    for goal in paths.goals:
+        stack: list[tuple[Any, list[Any]]] = [(goal, [goal])]
+        while stack:
+            key, path = stack.pop()
+            if key == paths.start:
+                yield [paths.states[k] for k in reversed(path)]
+                continue
+            for parent in paths.predecessors[key]:
+                stack.append((parent, path + [parent]))
+
+
+def _best_first(initial: T,
+                goal_test: Callable[[T], bool],
+                successors: Callable[[T], list[T]],
+                cost: Callable[[T], float],
+                heuristic: Callable[[T], float],
+                consistent: bool,
+                encode: Optional[Callable[[T], Any]],
+                decode: Optional[Callable[[Any], T]],
+                dag: Optional[ShortestPaths[T]] = None,
+                max_step: Optional[int] = None,
+                stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """Shared best-first core for `astar_closed`, `dijkstra` and `dijkstra_all`.
+
+    - every state keeps its best known cost in `best`
+    - heap entries are (priority, counter, key, node) so ties are broken by insertion
+      order and `Node.__lt__` is never called
+    - stale entries (a cheaper one was pushed later) are skipped on pop (lazy deletion)
+    - popped states go into `closed`. With a consistent heuristic a closed state is final,
+      so its children are skipped before `cost` and `heuristic` are even called.
+      Otherwise a closed state is reopened when a cheaper route is found.
+    - with `decode` the nodes hold the encoded keys (see `bfs`)
+    - with a `dag` all equal-cost predecessors are recorded and the search goes on until
+      every goal state of the cheapest cost has been popped
+    - with `max_step` the frontier is a BucketQueue instead of a heap (int costs only)
+    """
+    state_key = encode or _state_key
+    successors, heuristic, cost = _instrumented(stats, successors, heuristic, cost)
+    tie_breaker = count()
+    start_key = state_key(initial)
+    h = heuristic(initial)
+    frontier = PriorityQueue() if max_step is None else BucketQueue(max_step)
+    frontier.push((h, next(tie_breaker), start_key, Node(start_key if decode else initial, None, 0.0, h)))
+    best: dict[Any, float] = {start_key: 0.0}
+    closed: set[Any] = set()
+    if dag is not None:
+        dag.start, dag.distances = start_key, best
+        dag.states[start_key] = initial
+
+    while not frontier.empty:
+        priority, _, key, current_node = frontier.pop()
+        if key in closed or current_node.cost > best[key]:
+            if stats is not None:
+                stats.duplicates += 1
+            continue  # stale entry
+        if dag is not None and dag.goals and priority > dag.cost:
+            break  # all the cheapest goals are in
+        current_state: T = decode(current_node.state) if decode else current_node.state
+        if goal_test(current_state):
+            if dag is None:
+                return _decoded(current_node, decode)
+            dag.cost = current_node.cost
+            dag.goals.append(key)
+            closed.add(key)
+            continue
+        closed.add(key)
+        for child in successors(current_state):
+            k = state_key(child)
+            if consistent and k in closed:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            new_cost: float = current_node.cost + cost(child)
+            if k in best and best[k] <= new_cost:
+                if dag is not None and best[k] == new_cost:
+                    dag.predecessors[k].append(key)
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            best[k] = new_cost
+            if dag is not None:
+                dag.predecessors[k] = [key]
+                dag.states[k] = child
+            closed.discard(k)  # reopen (only happens with an inconsistent heuristic)
+            h = heuristic(child)
+            frontier.push((new_cost + h, next(tie_breaker), k, Node(k if decode else child, current_node, new_cost, h)))
+        if stats is not None:
+            stats.observe(len(frontier), len(best))
+    return None  # went through everything and never found goal (or filled the dag)
+
+
+@_timed_search
+def astar_closed(initial: T,
+                 goal_test: Callable[[T], bool],
+                 successors: Callable[[T], list[T]],
+                 heuristic: Callable[[T], float],
+                 cost: Callable[[T], float],
+                 consistent: bool = True,
+                 encode: Optional[Callable[[T], Any]] = None,
+                 decode: Optional[Callable[[Any], T]] = None,
+                 max_step: Optional[int] = None,
+                 stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """A* with a closed set and stale-entry skipping.
+
+    Same contract as `astar` but every state is expanded at most once (when `consistent`)
+    instead of once per cheaper cost found. Set `consistent=False` if the heuristic can
+    overestimate a single step (h(a) > cost(b) + h(b)); closed states are then reopened
+    when a cheaper route turns up. `encode` / `decode` work as with `astar`.
+
+    With int costs and heuristic you can give `max_step`: the most cost + heuristic can go
+    up in one step (max edge weight + max heuristic change). The frontier then is a
+    `BucketQueue` with O(1) push and pop instead of a heap. Needs a consistent heuristic.
+    For `stats` see `bfs`.
+
+    - see 2021/Day15 part 2 (5x tiled map) and 2023/Day17 for the kind of search this is for
+    """
+    return _best_first(initial, goal_test, successors, cost, heuristic, consistent, encode, decode, None, max_step,
+                       stats)
+
+
+@_timed_search
+def dijkstra(initial: T,
+             goal_test: Callable[[T], bool],
+             successors: Callable[[T], list[T]],
+             cost: Callable[[T], float],
+             encode: Optional[Callable[[T], Any]] = None,
+             decode: Optional[Callable[[Any], T]] = None,
+             max_weight: Optional[int] = None,
+             stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """Dijkstra shortest path
+
+    `astar_closed` with a zero heuristic. The `cost` callback gets the state being
+    entered, just like with `astar`.
+    Give the `max_weight` of an edge when the costs are small ints (e.g. 1-9 risk levels)
+    to use a `BucketQueue` (Dial's algorithm) instead of a heap. For `stats` see `bfs`.
+    """
+    return _best_first(initial, goal_test, successors, cost, lambda _: 0, True, encode, decode, None, max_weight,
+                       stats)
+
+
+@_timed_search
+def dijkstra_all(initial: T,
+                 goal_test: Callable[[T], bool],
+                 successors: Callable[[T], list[T]],
+                 cost: Callable[[T], float],
+                 encode: Optional[Callable[[T], Any]] = None,
+                 max_weight: Optional[int] = None,
+                 stats: Optional[SearchStats] = None) -> Optional[ShortestPaths[T]]:
+    """Dijkstra that records all equal-cost predecessors of every state.
+
+    Use it with `count_shortest_paths`, `states_on_shortest_paths` and `iter_shortest_paths`
+    when you need more than one best path. Edge costs must be positive.
+    For `max_weight` see `dijkstra`, for `stats` see `bfs`.
+    :returns: the predecessor DAG or None if no goal can be reached
+    """
+    dag: ShortestPaths[T] = ShortestPaths()
+    _best_first(initial, goal_test, successors, cost, lambda _: 0, True, encode, None, dag, max_weight, stats)
+    return dag if dag.goals else None
+
+
+def _bounded_dfs(initial: T,
+                 goal_test: Callable[[T], bool],
+                 successors: Callable[[T], list[T]],
+                 heuristic: Callable[[T], float],
+                 cost: Callable[[T], float],
+                 bound: float,
+                 key: Callable[[T], Any],
+                 table_size: int,
+                 stats: Optional[SearchStats] = None) -> tuple[Optional[Node[T]], float]:
+    """One iteration of `ida_star` / `iddfs`: a depth first search that does not go
+    beyond `bound` (cost + heuristic).
+
+    Only the current path is kept (iterators per level and an on-path set for cycles) so
+    memory is O(depth). The optional transposition table remembers the cheapest cost a
+    state was reached with. It holds at most `table_size` entries, the oldest is dropped.
+    For `stats` the frontier is the current path and explored the transposition table.
+    :returns: goal node (or None), the smallest f that went over the bound
+    """
+    next_bound = inf
+    root: Node[T] = Node(initial, None, 0.0, heuristic(initial))
+    if goal_test(initial):
+        return root, next_bound
+    on_path: set[Any] = {key(initial)}
+    table: dict[Any, float] = {}
+    stack: list[tuple[Node[T], Any, Iterator[T]]] = [(root, key(initial), iter(successors(initial)))]
+    while stack:
+        node, node_key, children = stack[-1]
+        child = next(children, _EXHAUSTED)
+        if child is _EXHAUSTED:
+            stack.pop()
+            on_path.discard(node_key)
+            continue
+        g = node.cost + cost(child)
+        h = heuristic(child)
+        if g + h > bound:
+            next_bound = min(next_bound, g + h)
+            continue
+        k = key(child)
+        if k in on_path:
+            if stats is not None:
+                stats.duplicates += 1
+            continue
+        if table_size:
+            if k in table and table[k] <= g:
+                if stats is not None:
+                    stats.duplicates += 1
+                continue
+            if k not in table and len(table) >= table_size:
+                del table[next(iter(table))]
+            table[k] = g
+        child_node = Node(child, node, g, h)
+        if goal_test(child):
+            return child_node, next_bound
+        on_path.add(k)
+        stack.append((child_node, k, iter(successors(child))))
+        if stats is not None:
+            stats.observe(len(stack), len(table))
+    return None, next_bound
+
+
+@_timed_search
+def ida_star(initial: T,
+             goal_test: Callable[[T], bool],
+             successors: Callable[[T], list[T]],
+             heuristic: Callable[[T], float],
+             cost: Callable[[T], float],
+             table_size: int = 0,
+             encode: Optional[Callable[[T], Any]] = None,
+             stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """Iterative deepening A*
+
+    Same callbacks as `astar` but memory stays O(depth) instead of holding a frontier
+    full of Nodes with their parent chains. Every iteration is a depth first search up
+    to a cost + heuristic bound, the next bound is the smallest value that went over it.
+    States are re-expanded per iteration, so that is the price for the memory.
+    With an admissible heuristic the first goal found is the cheapest.
+
+    - table_size: size of an optional transposition table (0 = none) that prunes states
+      already reached cheaper in the current iteration
+    - encode: optional state key callback (see `bfs`)
+    - stats: optional `SearchStats`, the counts add up over all the iterations
+    - see 2021 day 23 (amphipods) and 2015 day 22 (wizard fight) for deep searches
+    """
+    key = encode or _state_key
+    successors, heuristic, cost = _instrumented(stats, successors, heuristic, cost)
+    bound = heuristic(initial)
+    while bound < inf:
+        node, bound = _bounded_dfs(initial, goal_test, successors, heuristic, cost, bound, key, table_size, stats)
+        if node is not None:
+            return node
+    return None  # nothing went over the bound so everything has been seen
+
+
+@_timed_search
+def iddfs(initial: T,
+          goal_test: Callable[[T], bool],
+          successors: Callable[[T], list[T]],
+          max_depth: Optional[int] = None,
+          table_size: int = 0,
+          encode: Optional[Callable[[T], Any]] = None,
+          stats: Optional[SearchStats] = None) -> Optional[Node[T]]:
+    """Iterative deepening depth first search
+
+    Finds the shallowest goal like `bfs` but with O(depth) memory. The cost of the
+    returned node is its depth. Stops after `max_depth` when given.
+    For `table_size`, `encode` and `stats` see `ida_star`.
+    """
+    key = encode or _state_key
+    successors = _instrumented(stats, successors)[0]
+    depth = 0
+    while max_depth is None or depth <= max_depth:
+        node, depth = _bounded_dfs(initial, goal_test, successors, lambda _: 0, lambda _: 1, depth, key, table_size,
+                                   stats)
+        if node is not None:
+            return node
+        if depth == inf:
+            break  # the whole space fits within the depth
+    return None
+
+
+@dataclass
+class BranchAndBoundResult(Generic[T]):
+    """Best state found by `branch_and_bound` plus what it took to find it"""
+    value: float
+    state: T
+    expanded: int = 0
+    generated: int = 0
+    pruned_by_bound: int = 0
+    pruned_by_memo: int = 0
+    pruned_by_dominance: int = 0
+    pruned_by_beam: int = 0
+
+
+def _dominated(vectors: list[tuple], vector: tuple) -> bool:
+    """True if one of the vectors is at least as good as vector in every position"""
+    return any(all(a >= b for a, b in zip(v, vector)) for v in vectors)
+
+
+@_timed_search
+def branch_and_bound(initial: T,
+                     successors: Callable[[T], list[T]],
+                     value: Callable[[T], float],
+                     upper_bound: Callable[[T], float],
+                     key: Optional[Callable[[T], Any]] = None,
+                     dominance: Optional[Callable[[T], tuple[Any, tuple]]] = None,
+                     beam_width: Optional[int] = None,
+                     stats: Optional[SearchStats] = None) -> BranchAndBoundResult[T]:
+    """Maximise value(state) over all the states reachable from initial.
+
+    - value: the objective of a state as it is (every state is a possible answer)
+    - upper_bound: optimistic estimate of the best value reachable from a state. Branches
+      that can not beat the best value so far are pruned, so it must never underestimate.
+    - key: optional callback for a state key. States with a key already seen are pruned.
+    - dominance: optional callback returning (group, vector). A state is pruned when an
+      earlier state of the same group has a vector that is >= in every position
+      (e.g. group = (time, robots) and vector = resources for 2022 day 19).
+    - beam_width: when given the search goes level by level and only keeps the best
+      beam_width states (by upper bound) per level. Fast, but no longer exact.
+    - stats: optional `SearchStats`, the upper_bound is timed as the heuristic and the
+      value as the cost. Duplicates are the states pruned by key or dominance.
+
+    Without a beam it is a depth first search that tries the most promising child first,
+    so a good answer is found early and the bound prunes hard.
+
+    - see 2022 day 19 (geodes) and 2022 day 16 (valves)
+    :returns: BranchAndBoundResult with the best value and state and the search statistics
+    """
+    successors, upper_bound, value = _instrumented(stats, successors, upper_bound, value)
+    result: BranchAndBoundResult[T] = BranchAndBoundResult(value(initial), initial)
+    seen: set[Any] = set()
+    frontiers: dict[Any, list[tuple]] = {}
+
+    def admit(state: T) -> Optional[float]:
+        """Generate a state: update the best answer and return its upper bound
+        if it is worth expanding (None if not)"""
+        result.generated += 1
+        v = value(state)
+        if v > result.value:
+            result.value, result.state = v, state
+        bound = upper_bound(state)
+        if bound <= result.value:
+            result.pruned_by_bound += 1
+            return None
+        if key is not None:
+            k = key(state)
+            if k in seen:
+                result.pruned_by_memo += 1
+                if stats is not None:
+                    stats.duplicates += 1
+                return None
+            seen.add(k)
+        if dominance is not None:
+            group, vector = dominance(state)
+            vectors = frontiers.setdefault(group, [])
+            if _dominated(vectors, vector):
+                result.pruned_by_dominance += 1
+                if stats is not None:
+                    stats.duplicates += 1
+                return None
+            vectors.append(vector)
+        return bound
+
+    def expand(state: T) -> list[tuple[float, T]]:
+        result.expanded += 1
+        children = []
+        for child in successors(state):
+            bound = admit(child)
+            if bound is not None:
+                children.append((bound, child))
+        return children
+
+    if key is not None:
+        seen.add(key(initial))
+    first: list[tuple[float, T]] = [(upper_bound(initial), initial)]
+    if beam_width is None:
+        stack = first
+        while stack:
+            bound, state = stack.pop()
+            if bound <= result.value:
+                result.pruned_by_bound += 1  # the best value went up since it was pushed
+                continue
+            children = expand(state)
+            children.sort(key=lambda x: x[0])  # most promising on top of the stack
+            stack.extend(children)
+            if stats is not None:
+                stats.observe(len(stack), len(seen))
+    else:
+        level = first
+        while level:
+            children = []
+            for _, state in level:
+                children.extend(expand(state))
+            if len(children) > beam_width:
+                children.sort(key=lambda x: x[0], reverse=True)
+                result.pruned_by_beam += len(children) - beam_width
+                children = children[:beam_width]
+            level = children
+            if stats is not None:
+                stats.observe(len(level), len(seen))
+    return result
+
+
 def all_the_paths_from_start_end(start, end, grid) -> list[list[tuple[int, int]]]:
     """all paths from start to end
+    Every cell is only visited once so there is at most one (the shortest) path.
     :returns: list of paths
     """
-    paths = []
-    q = deque([(start, [start])])
-    seen = {start}
-    while q:
-        (r, c), path = q.popleft()
-        if (r, c) == end:
-            paths.append(path)
-            continue
-        for dr, dc in DIRECTIONS:
-            rr, cc = r + dr, c + dc
-            if 0 <= rr < len(grid) and 0 <= cc < len(grid[0]) and grid[rr][cc] != "#" and (rr, cc) not in seen:
-                seen.add((rr, cc))
-                q.append(((rr, cc), path + [(rr, cc)]))
-    return paths
+    _, path = bfs_grid(start, end, grid)
+    return [path] if path else []
 
 
 def count_paths_with_mandatory_dag(initial: T,
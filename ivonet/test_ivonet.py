@@ -1,15 +1,29 @@
 #!/usr/bin/env python
 #  -*- coding: utf-8 -*-
+from itertools import combinations, permutations
+from time import sleep
 from unittest import TestCase, main
 
+import numpy as np
+
 from ivonet.alphabet import base_26_encode_string, sum_letter_values_of_word, alphabet, product_letter_values_of_word, \
     base_26_decode_string
+from ivonet.automaton import Automaton, life_rule, parse_cells, shift_sum, von_neumann_kernel, \
+    binary_kernel
 from ivonet.calc import base_10_to_base_x, base_3
 from ivonet.cdll import CircularDoublyLinkedList
+from ivonet.collection import BucketQueue
+from ivonet.graph import Graph, WeightedGraph, min_cut, all_pairs_shortest_paths, tsp, contract_grid, \
+    longest_simple_path, Scheduler
+from ivonet.grid import Grid, FlatGrid, LineOfSight, ORTHOGONAL, SummedArea, DifferenceArray
 from ivonet.hexa import number_as_word
 from ivonet.iter import consecutive_element_pairing
+from ivonet.parallel import parallel_map
 from ivonet.roman_numerals import roman
-from ivonet.search import count_paths_with_mandatory_dag, astar, node_to_path, bfs, dfs
+from ivonet.search import count_paths_with_mandatory_dag, astar, node_to_path, bfs, dfs, astar_closed, dijkstra, \
+    bfs_grid, bfs_shortest, bfs_shortest_with_distance, all_the_paths_from_start_end, distance_field, \
+    bidirectional_bfs, bit_packer, ida_star, iddfs, branch_and_bound, \
+    dijkstra_all, count_shortest_paths, states_on_shortest_paths, iter_shortest_paths, SearchStats
 from ivonet.str import sort_str, is_sorted, letters, OpenCloseTags, TagError
 
 TAG_ERROR = "Should have raised a TagError"
@@ -224,6 +238,495 @@ class CircularDoublyLinkedListTests(TestCase):
         self.assertEqual(3, self.cdll.get())
 
 
+def scaled_row_sum(grid, row):
+    return sum(grid[row]) * row
+
+
+class TestParallel(TestCase):
+    GRID = [[r * c for c in range(50)] for r in range(40)]
+
+    def test_parallel_map_in_order(self):
+        expected = [scaled_row_sum(self.GRID, row) for row in range(40)]
+        self.assertEqual(expected, parallel_map(scaled_row_sum, range(40), shared=self.GRID, processes=2))
+
+    def test_parallel_map_serial_fallback(self):
+        self.assertEqual([0, 1225], parallel_map(scaled_row_sum, [0, 1], shared=self.GRID, processes=4))
+        self.assertEqual([], parallel_map(scaled_row_sum, [], shared=self.GRID))
+
+
+class TestBucketQueue(TestCase):
+    def test_pops_in_priority_order(self):
+        queue = BucketQueue(9)
+        for item in [(0, 'a'), (3, 'c'), (9, 'e'), (3, 'd'), (1, 'b')]:
+            queue.push(item)
+        self.assertEqual(5, len(queue))
+        popped = [queue.pop()]
+        queue.push((9, 'f'))  # within max_step of the popped priority
+        while not queue.empty:
+            popped.append(queue.pop())
+        self.assertEqual(['a', 'b', 'c', 'd', 'e', 'f'], [x for _, x in popped])
+
+    def test_window(self):
+        queue = BucketQueue(5)
+        queue.push((100, 'start'))  # a new queue starts anywhere
+        self.assertRaises(ValueError, queue.push, (106, 'too far'))
+        self.assertRaises(ValueError, queue.push, (99, 'too low'))
+        self.assertEqual((100, 'start'), queue.pop())
+        self.assertRaises(IndexError, queue.pop)
+
+
+class TestGraph(TestCase):
+    def test_index_of(self):
+        graph = Graph(["a", "b", "c"])
+        graph.add_vertex("d")
+        self.assertEqual(3, graph.index_of("d"))
+        self.assertEqual(1, graph.index_of("b"))
+        with self.assertRaises(ValueError):
+            graph.index_of("x")
+
+    def test_freeze(self):
+        graph = Graph(["a", "b", "c", "d"])
+        graph.add_edge_by_vertices("a", "b")
+        graph.add_edge_by_vertices("a", "c")
+        csr = graph.freeze()
+        self.assertEqual([0, 2, 3, 4, 4], csr.offsets)
+        self.assertEqual([1, 2], csr.neighbors(0))
+        self.assertEqual([0], graph.neighbor_indices(2))
+        self.assertEqual([], csr.neighbors(3))
+        graph.add_edge_by_vertices("c", "d")  # drops the compiled adjacency
+        self.assertEqual([0, 3], graph.neighbor_indices(2))
+        self.assertEqual(["a", "d"], graph.neighbors_for_vertex("c"))
+
+    def test_freeze_weighted(self):
+        graph = WeightedGraph([(0, 0), (0, 5), (3, 5)])
+        graph.add_edge_by_vertices((0, 0), (0, 5), 5)
+        graph.add_edge_by_vertices((0, 5), (3, 5), 3)
+        csr = graph.freeze()
+        self.assertEqual([(0, 5), (2, 3)], list(csr.neighbors_with_weights(1)))
+        self.assertEqual(3, csr.vertex_count)
+
+    def test_connected_groups(self):
+        graph = Graph(list(range(7)))
+        for u, v in ((0, 2), (2, 3), (3, 4), (2, 4), (5, 6)):
+            graph.add_edge_by_vertices(u, v)
+        self.assertEqual([0, 1, 0, 0, 0, 2, 2], graph.component_labels())
+        self.assertEqual([{0, 2, 3, 4}, {5, 6}, {1}], graph.connected_groups())
+        self.assertEqual(3, graph.number_connected_groups())
+        self.assertEqual(0, Graph().number_connected_groups())
+
+    def test_cliques(self):
+        graph = Graph(list("abcdef"))
+        for u, v in ("ab", "ac", "bc", "bd", "cd", "de", "ef", "df", "ad"):
+            graph.add_edge_by_vertices(u, v)
+        self.assertEqual([["a", "b", "c", "d"], ["d", "e", "f"]],
+                         sorted(sorted(clique) for clique in graph.cliques()))
+        self.assertEqual([["a", "b", "c", "d"]], [sorted(c) for c in graph.cliques(min_size=4)])
+        self.assertEqual(["a", "b", "c", "d"], sorted(graph.maximum_clique()))
+        self.assertEqual(["a", "b", "c", "d"], graph.longest_connected_component())
+
+    def test_maximum_clique_matches_brute_force(self):
+        vertices = list(range(9))
+        edges = [(u, v) for u, v in combinations(vertices, 2) if (u * 7 + v * 3) % 5 != 0]
+        graph = Graph(vertices)
+        for u, v in edges:
+            graph.add_edge_by_vertices(u, v)
+        linked = set(edges)
+        largest = max(len(group) for size in range(1, 10) for group in combinations(vertices, size)
+                      if all(pair in linked for pair in combinations(group, 2)))
+        self.assertEqual(largest, len(graph.maximum_clique()))
+        self.assertEqual(largest, max(map(len, graph.cliques())))
+        self.assertEqual([], Graph().maximum_clique())
+
+    @staticmethod
+    def two_cliques_graph():
+        graph = Graph(list(range(8)))
+        for group in ((0, 1, 2, 3), (4, 5, 6, 7)):
+            for u, v in combinations(group, 2):
+                graph.add_edge_by_vertices(u, v)
+        graph.add_edge_by_vertices(0, 4)
+        graph.add_edge_by_vertices(3, 7)
+        return graph
+
+    def test_min_cut_stoer_wagner(self):
+        weight, one, other = min_cut(self.two_cliques_graph())
+        self.assertEqual(2, weight)
+        self.assertEqual([[0, 1, 2, 3], [4, 5, 6, 7]], sorted([sorted(one), sorted(other)]))
+        self.assertIn(5, Graph([5]))
+
+    def test_min_cut_weighted(self):
+        graph = WeightedGraph(list("abcd"))
+        for u, v, weight in (("a", "b", 5), ("b", "c", 1), ("c", "d", 4), ("d", "a", 3), ("a", "c", 3)):
+            graph.add_edge_by_vertices(u, v, weight)
+        weight, one, other = min_cut(graph)
+        self.assertEqual(6, weight)  # b alone, 5 + 1
+        self.assertEqual(["b"], min(one, other, key=len))
+
+    def test_min_cut_disconnected(self):
+        graph = Graph(list(range(4)))
+        graph.add_edge_by_vertices(0, 1)
+        graph.add_edge_by_vertices(2, 3)
+        self.assertEqual(0, min_cut(graph)[0])
+        with self.assertRaises(ValueError):
+            min_cut(Graph([1]))
+        # mostly loose vertices, the contraction runs out of edges before it is small enough
+        loose = Graph(list(range(100)))
+        for i in range(10):
+            loose.add_edge_by_vertices(2 * i, 2 * i + 1)
+        self.assertEqual(0, min_cut(loose, method="karger_stein", seed=3, processes=1)[0])
+
+    def test_min_cut_karger_stein(self):
+        weight, one, other = min_cut(self.two_cliques_graph(), method="karger_stein", seed=42)
+        self.assertEqual(2, weight)
+        self.assertEqual(8, len(one) + len(other))
+        with self.assertRaises(ValueError):
+            min_cut(self.two_cliques_graph(), method="magic")
+
+    def test_min_cut_zero_and_negative_weights(self):
+        # two rings of 40 only joined by 0 weight edges, big enough to really contract
+        graph = WeightedGraph(list(range(80)))
+        for i in range(40):
+            graph.add_edge_by_vertices(i, (i + 1) % 40, 2)
+            graph.add_edge_by_vertices(40 + i, 40 + (i + 1) % 40, 2)
+        graph.add_edge_by_vertices(0, 40, 0)
+        graph.add_edge_by_vertices(20, 60, 0)
+        for method in ("stoer_wagner", "karger_stein"):
+            weight, one, other = min_cut(graph, method=method, seed=1, processes=1)
+            self.assertEqual(0, weight)
+            self.assertEqual([list(range(40)), list(range(40, 80))], sorted([sorted(one), sorted(other)]))
+        graph.add_edge_by_vertices(5, 45, -1)
+        with self.assertRaises(ValueError):
+            min_cut(graph, method="karger_stein")
+
+    def test_all_pairs_shortest_paths_modes_agree(self):
+        graph = WeightedGraph(list("abcde"))
+        for u, v, weight in (("a", "b", 4), ("b", "c", 1), ("a", "c", 7), ("c", "d", 2)):
+            graph.add_edge_by_vertices(u, v, weight)
+        floyd = all_pairs_shortest_paths(graph, mode="floyd_warshall")
+        self.assertEqual(5, floyd[0, 2])
+        self.assertEqual(7, floyd[3, 0])
+        self.assertEqual(float("inf"), floyd[0, 4])
+        self.assertEqual(floyd.tolist(), all_pairs_shortest_paths(graph, mode="bfs").tolist())
+        self.assertEqual([[0, 7], [7, 0]], all_pairs_shortest_paths(graph, points=["a", "d"]).tolist())
+
+    def test_all_pairs_shortest_paths_unweighted(self):
+        graph = self.two_cliques_graph()
+        matrix = all_pairs_shortest_paths(graph)
+        self.assertEqual(3, matrix[1, 6])
+        self.assertEqual(matrix.tolist(), all_pairs_shortest_paths(graph, mode="floyd_warshall").tolist())
+        with self.assertRaises(ValueError):
+            all_pairs_shortest_paths(graph, mode="magic")
+
+    def test_all_pairs_shortest_paths_grid_points(self):
+        grid = ["#######",
+                "#0.1#.#",
+                "#.#...#",
+                "#...2.#",
+                "#######"]
+        matrix = all_pairs_shortest_paths(grid, points=[(1, 1), (1, 3), (3, 4), (1, 5)])
+        self.assertEqual([[0, 2, 5, 6], [2, 0, 3, 4], [5, 3, 0, 3], [6, 4, 3, 0]], matrix.tolist())
+
+    def test_tsp(self):
+        # London, Dublin, Belfast of 2015 day 9
+        distances = [[0, 464, 518], [464, 0, 141], [518, 141, 0]]
+        self.assertEqual(605, tsp(distances)[0])
+        self.assertEqual((605, [0, 1, 2]), tsp(distances, start=0))
+        self.assertEqual((659, [1, 2, 0]), tsp(distances, start=1))
+        self.assertEqual(982, tsp(distances, maximize=True)[0])
+        self.assertEqual(1123, tsp(distances, cycle=True)[0])
+
+    def test_tsp_matches_brute_force(self):
+        distances = [[0 if i == j else (i * 7 + j * 13) % 17 + 1 for j in range(7)] for i in range(7)]
+
+        def length(route, cycle):
+            legs = list(zip(route, route[1:])) + ([(route[-1], route[0])] if cycle else [])
+            return sum(distances[a][b] for a, b in legs)
+
+        for cycle in (False, True):
+            routes = [route for route in permutations(range(7)) if route[0] == 0 or not cycle]
+            cost, route = tsp(distances, cycle=cycle)
+            self.assertEqual(min(length(r, cycle) for r in routes), cost)
+            self.assertEqual(cost, length(route, cycle))
+            self.assertEqual(max(length(r, cycle) for r in routes), tsp(distances, maximize=True, cycle=cycle)[0])
+
+    def test_tsp_no_route(self):
+        inf = float("inf")
+        self.assertIsNone(tsp([[0, 1, inf], [1, 0, inf], [inf, inf, 0]]))
+        self.assertEqual((0, [0]), tsp([[0]], cycle=True))
+
+    def test_contract_grid(self):
+        grid = ["#.#####",
+                "#.....#",
+                "#.###.#",
+                "#.....#",
+                "###.###",
+                "###..##",
+                "####.##"]
+        graph = contract_grid(grid, "#", keep=[(0, 1), (6, 4)])
+        self.assertEqual([(0, 1), (6, 4), (1, 1), (3, 3)], graph.vertices)
+        self.assertEqual([((1, 1), 1)], graph.neighbors_for_vertex_with_weights((0, 1)))
+        self.assertEqual([((3, 3), 4)], graph.neighbors_for_vertex_with_weights((6, 4)))
+        # the two ways around the block from (1, 1) to (3, 3)
+        self.assertEqual([((0, 1), 1), ((3, 3), 4), ((3, 3), 8)],
+                         sorted(graph.neighbors_for_vertex_with_weights((1, 1))))
+
+    def test_contract_grid_slopes(self):
+        grid = ["#.###",
+                "#.>.#",
+                "#.#.#",
+                "#...#",
+                "###.#"]
+        slopes = {">": (0, 1), "<": (0, -1), "v": (1, 0), "^": (-1, 0)}
+        graph = contract_grid(grid, "#", keep=[(0, 1), (4, 3)], slopes=slopes)
+        self.assertEqual([(0, 1), (4, 3), (1, 1), (3, 3)], graph.vertices)
+        self.assertEqual([((3, 3), 4)], sorted(graph.neighbors_for_vertex_with_weights((1, 1)))[1:])
+        # the slope can only be walked from left to right
+        self.assertEqual([((1, 1), 4), ((4, 3), 1)], sorted(graph.neighbors_for_vertex_with_weights((3, 3))))
+
+    def test_longest_simple_path(self):
+        graph = WeightedGraph(list("SABCDE"))
+        for u, v, weight in (("S", "A", 1), ("A", "B", 5), ("B", "C", 2), ("A", "C", 3), ("C", "D", 4),
+                             ("B", "D", 1), ("D", "E", 2)):
+            graph.add_edge_by_vertices(u, v, weight)
+        self.assertEqual((14, ["S", "A", "B", "C", "D", "E"]), longest_simple_path(graph, "S", "E"))
+        self.assertEqual((14, ["S", "A", "B", "C", "D", "E"]), longest_simple_path(graph, "S", "E", processes=2))
+        self.assertEqual((0, ["S"]), longest_simple_path(graph, "S", "S"))
+        graph.add_vertex("X")
+        self.assertIsNone(longest_simple_path(graph, "S", "X"))
+
+    def test_longest_simple_path_on_contracted_grid(self):
+        grid = ["#.#####",
+                "#.....#",
+                "#.###.#",
+                "#.....#",
+                "###.###",
+                "###..##",
+                "####.##"]
+        graph = contract_grid(grid, "#", keep=[(0, 1), (6, 4)])
+        length, path = longest_simple_path(graph, (0, 1), (6, 4))
+        self.assertEqual(1 + 8 + 4, length)  # the long way around the block
+        self.assertEqual([(0, 1), (1, 1), (3, 3), (6, 4)], path)
+
+    STEPS = [("C", "A"), ("C", "F"), ("A", "B"), ("A", "D"), ("B", "E"), ("D", "E"), ("F", "E")]
+
+    def test_scheduler_order(self):
+        self.assertEqual("CABDFE", "".join(Scheduler(self.STEPS).order()))
+        self.assertEqual([1, 2, 3], list(Scheduler(nodes=[3, 1, 2]).order()))
+        with self.assertRaises(ValueError):
+            list(Scheduler([(1, 2), (2, 3), (3, 2)]).order())
+
+    def test_scheduler_by_hand(self):
+        scheduler = Scheduler(self.STEPS)
+        self.assertEqual(["C"], scheduler.ready())
+        self.assertEqual(3, scheduler.in_degree("E"))
+        self.assertEqual("C", scheduler.take())
+        self.assertEqual(["A", "F"], scheduler.done("C"))
+        self.assertEqual("A", scheduler.take())
+        self.assertEqual(["B", "D"], scheduler.done("A"))
+        self.assertEqual(["B", "D", "F"], scheduler.ready())
+        self.assertFalse(scheduler.empty)
+
+    def test_scheduler_edges_after_take(self):
+        scheduler = Scheduler(nodes=["A", "B"])
+        self.assertEqual("A", scheduler.take())
+        scheduler.add_edge("A", "C")  # after a taken node
+        scheduler.add_edge("A", "B")  # B was ready, now it waits for A
+        self.assertEqual([], scheduler.ready())
+        with self.assertRaises(IndexError):
+            scheduler.take()
+        self.assertEqual(["C", "B"], scheduler.done("A"))
+        self.assertEqual(["B", "C"], scheduler.ready())
+        self.assertEqual(["B", "C"], list(scheduler.order()))
+        self.assertTrue(scheduler.empty)
+
+    def test_scheduler_simulate(self):
+        times = Scheduler(self.STEPS).simulate(2, lambda step: ord(step) - ord("A") + 1)
+        self.assertEqual({"C": (0, 3), "A": (3, 4), "F": (3, 9), "B": (4, 6), "D": (6, 10), "E": (10, 15)}, times)
+        times = Scheduler(self.STEPS).simulate(1, lambda step: 1)
+        self.assertEqual(6, max(end for start, end in times.values()))
+        with self.assertRaises(ValueError):
+            Scheduler(self.STEPS).simulate(0, lambda step: 1)
+
+
+class TestGrid(TestCase):
+    ROWS = ["2199943210",
+            "3987894921",
+            "9856789892",
+            "8767896789",
+            "9899965678"]
+
+    def test_from_rows(self):
+        grid = Grid.from_rows(self.ROWS, int)
+        self.assertEqual((5, 10), (grid.height, grid.width))
+        self.assertEqual(8, grid[2, 3] + 2)
+        self.assertEqual(self.ROWS, str(grid).split("\n"))
+
+    def test_shift(self):
+        grid = Grid([[1, 2], [3, 4]])
+        self.assertEqual([[2, 0], [4, 0]], grid.shift(0, 1).tolist())
+        self.assertEqual([[-1, -1], [1, 2]], grid.shift(-1, 0, fill=-1).tolist())
+        self.assertEqual([[4, 0], [0, 0]], grid.shift(1, 1).tolist())
+        self.assertEqual((8, 2, 2), grid.neighbors(diagonal=True).shape)
+
+    def test_low_points(self):
+        grid = Grid.from_rows(self.ROWS, int)
+        low = (grid.cells < grid.neighbors(fill=10)).all(axis=0)
+        self.assertEqual([(0, 1), (0, 9), (2, 2), (4, 6)], grid.argwhere(low))
+        self.assertEqual(15, int((grid.cells[low] + 1).sum()))
+
+    def test_masks_and_counts(self):
+        grid = Grid.from_rows(["#.#", "...", "#.#"])
+        self.assertEqual(4, grid.count("#"))
+        self.assertEqual(5, grid.count(".", "x"))
+        self.assertEqual([[0, 2, 0], [2, 4, 2], [0, 2, 0]], grid.count_neighbors("#").tolist())
+        self.assertEqual([[2, 1, 2], [1, 4, 1], [2, 1, 2]], grid.count_neighbors(grid.mask("."), diagonal=False).tolist())
+        self.assertEqual((0, 1), grid.find("."))
+        self.assertIsNone(grid.find("x"))
+
+
+class TestFlatGrid(TestCase):
+    def test_index_and_position(self):
+        grid = FlatGrid(["abc", "def"])
+        self.assertEqual(5, grid.stride)
+        self.assertEqual("f", grid[grid.index(1, 2)])
+        self.assertEqual((1, 2), grid.position(grid.index(1, 2)))
+        self.assertEqual(["abc", "def"], grid.rows())
+        self.assertEqual(4 * 5, len(grid))
+
+    def test_border_stops_a_walker(self):
+        grid = FlatGrid(["...", ".S.", "..."], border="#")
+        loc = grid.find("S")
+        steps = 0
+        while grid[loc + grid.offsets[1]] != "#":  # walk east until the border
+            loc += grid.offsets[1]
+            steps += 1
+        self.assertEqual(1, steps)
+        self.assertTrue(grid.is_border(loc + 1))
+        self.assertFalse(grid.is_border(loc))
+        self.assertEqual(8, len(grid.neighbors(loc, diagonal=True)))
+
+    def test_copy_and_set(self):
+        grid = FlatGrid(["..", ".."])
+        clone = grid.copy()
+        clone[clone.index(0, 0)] = "#"
+        self.assertEqual(1, clone.count("#"))
+        self.assertEqual(0, grid.count("#"))
+        self.assertEqual("#.\n..", str(clone))
+        self.assertEqual(-1, grid.find("#"))
+
+
+class TestAutomaton(TestCase):
+
+    def test_glider_moves_diagonally(self):
+        glider = parse_cells([".#....", "..#...", "###...", "......", "......", "......"])
+        life = Automaton(glider, life_rule([3], [2, 3]))
+        life.step(4)
+        self.assertEqual(glider[:-1, :-1].tolist(), life.cells[1:, 1:].tolist())
+        self.assertEqual(5, life.population)
+        self.assertEqual(4, life.generation)
+
+    def test_shift_sum(self):
+        cells = np.array([[1, 0, 0], [0, 1, 0], [0, 0, 0]])
+        self.assertEqual([[1, 2, 1], [2, 1, 1], [1, 1, 1]],
+                         shift_sum(cells, np.array([[1, 1, 1], [1, 0, 1], [1, 1, 1]])).tolist())
+        self.assertEqual([[0, 2, 0], [2, 0, 1], [0, 1, 0]], shift_sum(cells, von_neumann_kernel()).tolist())
+        self.assertEqual(12, shift_sum(np.zeros((1, 1, 1)), von_neumann_kernel(3), background=2)[0, 0, 0])
+
+    def test_grow_in_more_dimensions(self):
+        cubes = Automaton(parse_cells([".#.", "..#", "###"], dimensions=3), life_rule([3], [2, 3], neighbors=26),
+                          grow=True)
+        self.assertEqual(112, cubes.step(6).population)
+        self.assertEqual((13, 15, 15), cubes.cells.shape)
+
+    def test_background_flips(self):
+        # everything dark becomes lit and everything lit becomes dark
+        key = np.array([1] + [0] * 511)
+        flipper = Automaton(np.zeros((1, 1)), np.vstack([key, key]), kernel=binary_kernel(), grow=True)
+        flipper.step()
+        self.assertEqual(1, flipper.background)
+        self.assertEqual(float("inf"), flipper.population)
+        flipper.step()
+        self.assertEqual(0, flipper.background)
+        self.assertEqual(0, flipper.population)
+
+    def test_callable_rule(self):
+        # parity rule, every cell becomes the xor of its 4 neighbors
+        parity = Automaton(np.array([[0, 0, 0], [0, 1, 0], [0, 0, 0]]), lambda cells, sums: sums % 2,
+                           kernel=von_neumann_kernel())
+        self.assertEqual([[0, 1, 0], [1, 0, 1], [0, 1, 0]], parity.step().cells.tolist())
+
+
+class TestLineOfSight(TestCase):
+
+    def test_first_seat_skips_the_floor(self):
+        rows = ["L.L..", ".....", "L...L"]
+        seats = Grid.from_rows(rows).mask("L")
+        seen = LineOfSight((3, 5)).first(seats)
+        # from (0, 0): N nothing, NE nothing, E (0, 2), SE (2, 2) is floor, S (2, 0), ...
+        self.assertEqual([-1, -1, 2, -1, 10, -1, -1, -1], seen[:, 0, 0].tolist())
+        self.assertEqual([-1, -1, -1, -1, 14, -1, 2, -1], seen[:, 0, 4].tolist())
+        self.assertEqual(14, seen[3, 0, 2])  # SE over the floor at (1, 3) to the seat at (2, 4)
+        self.assertEqual(-1, seen[3, 1, 1])
+
+    def test_blocking_matches_walking_the_rays(self):
+        heights = np.array([[3, 0, 3, 7, 3], [2, 5, 5, 1, 2], [6, 5, 3, 3, 2], [3, 3, 5, 4, 9], [3, 5, 3, 9, 0]])
+        sight = LineOfSight(heights.shape, directions=ORTHOGONAL)
+        blockers = sight.blocking(heights)
+        distances = sight.distances(blockers)
+        for r, c in np.ndindex(heights.shape):
+            for d, (dr, dc) in enumerate(ORTHOGONAL):
+                steps, rr, cc, expected = 0, r + dr, c + dc, -1
+                while 0 <= rr < 5 and 0 <= cc < 5:
+                    steps += 1
+                    if heights[rr, cc] >= heights[r, c]:
+                        expected = rr * 5 + cc
+                        break
+                    rr, cc = rr + dr, cc + dc
+                self.assertEqual(expected, blockers[d, r, c])
+                self.assertEqual(steps, distances[d, r, c])
+        self.assertEqual(21, int((blockers == -1).any(axis=0).sum()))
+        self.assertEqual(8, int(distances.prod(axis=0).max()))
+
+
+class TestSummedArea(TestCase):
+
+    def test_rectangle_sums(self):
+        values = np.arange(30).reshape(5, 6) % 7 - 3
+        area = SummedArea(values)
+        for top, left, bottom, right in [(0, 0, 5, 6), (1, 2, 3, 5), (4, 5, 5, 6), (2, 2, 2, 4)]:
+            self.assertEqual(int(values[top:bottom, left:right].sum()), area.sum(top, left, bottom, right))
+
+    def test_squares_of_every_size(self):
+        values = np.arange(30).reshape(5, 6) % 7 - 3
+        area = SummedArea(values)
+        self.assertEqual(values.tolist(), area.squares(1).tolist())
+        self.assertEqual((3, 4), area.squares(3).shape)
+        best = max((int(values[r:r + size, c:c + size].sum()), r, c, size)
+                   for size in range(1, 6) for r in range(6 - size) for c in range(7 - size))
+        self.assertEqual(best[0], area.max_square()[0])
+        self.assertEqual(area.max_square([2])[0], int(area.squares(2).max()))
+        with self.assertRaises(ValueError):
+            area.max_square([])
+        with self.assertRaises(ValueError):
+            area.max_square([6])  # does not fit in 5 rows
+        self.assertEqual(max(int(values[:, :5].sum()), int(values[:, 1:].sum())), area.max_square([5])[0])
+
+    def test_difference_array(self):
+        expected = np.zeros((4, 5), dtype=int)
+        ranges = DifferenceArray((4, 5))
+        for top, left, bottom, right, value in [(0, 0, 4, 5, 1), (1, 1, 3, 4, 2), (2, 0, 4, 2, -5)]:
+            ranges.add(top, left, bottom, right, value)
+            expected[top:bottom, left:right] += value
+        self.assertEqual(expected.tolist(), ranges.values().tolist())
+
+    def test_float_values_are_not_truncated(self):
+        area = SummedArea(np.full((2, 2), 0.5))
+        self.assertEqual(2.0, area.sum(0, 0, 2, 2))
+        self.assertEqual((2.0, 0, 0, 2), area.max_square([2]))
+        ranges = DifferenceArray((2, 2), dtype=float)
+        ranges.add(0, 0, 2, 1, 0.25)
+        self.assertEqual([[0.25, 0.0], [0.25, 0.0]], ranges.values().tolist())
+
+
 class TestSearch(TestCase):
     def test_count_paths_no_mandatory(self):
         graph = {'A': ['B'], 'B': ['C'], 'C': []}
@@ -523,6 +1026,388 @@ class TestSearch(TestCase):
         self.assertEqual(path, [0, 1, 2])
         self.assertEqual(0, node.cost)
 
+    def test_astar_closed_expands_each_state_once(self):
+        graph = {'A': ['B', 'C'], 'B': ['D'], 'C': ['D'], 'D': ['E'], 'E': []}
+        weights = {'B': 5, 'C': 1, 'D': 1, 'E': 1}
+        expanded = []
+
+        def successors(x):
+            expanded.append(x)
+            return graph[x]
+
+        node = astar_closed('A', lambda x: x == 'E', successors, lambda x: 0, lambda x: weights[x])
+        self.assertEqual(['A', 'C', 'D', 'E'], node_to_path(node))
+        self.assertEqual(3, node.cost)
+        self.assertEqual(len(expanded), len(set(expanded)))
+
+    def test_astar_closed_inconsistent_heuristic(self):
+        # h(A) is far too high, so B is closed through X first and must be reopened via A
+        graph = {'S': ['X', 'A'], 'X': ['B'], 'A': ['B'], 'B': ['G'], 'G': []}
+        weights = {'X': 5, 'A': 1, 'B': 1, 'G': 10}
+        heuristic = {'S': 0, 'X': 0, 'A': 10, 'B': 0, 'G': 0}
+        args = ('S', lambda x: x == 'G', lambda x: graph[x], lambda x: heuristic[x], lambda x: weights[x])
+        self.assertEqual(16, astar_closed(*args).cost)
+        node = astar_closed(*args, consistent=False)
+        self.assertEqual(12, node.cost)
+        self.assertEqual(['S', 'A', 'B', 'G'], node_to_path(node))
+
+    def test_astar_closed_no_path(self):
+        graph = {'A': ['B'], 'B': ['A'], 'C': []}
+        self.assertIsNone(astar_closed('A', lambda x: x == 'C', lambda x: graph[x], lambda x: 0, lambda x: 1))
+
+    def test_dijkstra_grid(self):
+        grid = ["1163751742",
+                "1381373672",
+                "2136511328",
+                "3694931569",
+                "7463417111",
+                "1319128137",
+                "1359912421",
+                "3125421639",
+                "1293138521",
+                "2311944581"]
+        end = (len(grid) - 1, len(grid[0]) - 1)
+
+        def successors(loc):
+            r, c = loc
+            return [(r + dr, c + dc) for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                    if 0 <= r + dr < len(grid) and 0 <= c + dc < len(grid[0])]
+
+        node = dijkstra((0, 0), lambda x: x == end, successors, lambda x: int(grid[x[0]][x[1]]))
+        self.assertEqual(40, node.cost)
+        self.assertEqual((0, 0), node_to_path(node)[0])
+
+    def test_dijkstra_start_is_goal(self):
+        node = dijkstra('A', lambda x: x == 'A', lambda x: ['B'], lambda x: 1)
+        self.assertEqual(['A'], node_to_path(node))
+        self.assertEqual(0, node.cost)
+
+    MAZE = ["..#....",
+            ".##.##.",
+            "....#..",
+            "#.#...#",
+            "..#.#.."]
+
+    def test_bfs_grid(self):
+        dist, path = bfs_grid((0, 0), (4, 6), self.MAZE)
+        self.assertEqual(10, dist)
+        self.assertEqual(11, len(path))
+        self.assertEqual((0, 0), path[0])
+        self.assertEqual((4, 6), path[-1])
+        for (r1, c1), (r2, c2) in zip(path, path[1:]):
+            self.assertEqual(1, abs(r1 - r2) + abs(c1 - c2))
+            self.assertNotEqual("#", self.MAZE[r2][c2])
+
+    def test_bfs_grid_unreachable(self):
+        self.assertEqual((None, []), bfs_grid((0, 0), (0, 3), ["..#.", "..#."]))
+        self.assertEqual((None, []), bfs_shortest((0, 0), (0, 3), ["..#.", "..#."]))
+
+    def test_bfs_grid_start_is_end(self):
+        self.assertEqual((0, [(1, 1)]), bfs_grid((1, 1), (1, 1), self.MAZE))
+
+    def test_bfs_shortest_helpers(self):
+        dist, path = bfs_shortest((0, 0), (2, 3), self.MAZE)
+        self.assertEqual(5, dist)
+        dist, path_with_distance = bfs_shortest_with_distance((0, 0), (2, 3), self.MAZE)
+        self.assertEqual(5, dist)
+        self.assertEqual(list(zip(path, range(6))), path_with_distance)
+        self.assertEqual([path], all_the_paths_from_start_end((0, 0), (2, 3), self.MAZE))
+        self.assertEqual([], all_the_paths_from_start_end((0, 0), (0, 3), ["..#.", "..#."]))
+
+    def test_distance_field(self):
+        field = distance_field([(0, 0)], self.MAZE)
+        self.assertEqual(10, field[4][6])
+        self.assertEqual(5, field[2][3])
+        self.assertEqual(-1, field[0][2])
+        self.assertEqual(bfs_grid((0, 0), (0, 6), self.MAZE)[0], field[0][6])
+
+    def test_distance_field_multi_source_and_cut_off(self):
+        field = distance_field([(0, 0), (0, 6)], ["." * 7], max_distance=2)
+        self.assertEqual([[0, 1, 2, -1, 2, 1, 0]], field)
+
+    def test_distance_field_parity(self):
+        field, (even, odd) = distance_field([(1, 1)], ["...", "...", "..."], parity=True)
+        self.assertEqual(5, even)
+        self.assertEqual(4, odd)
+        self.assertEqual([[2, 1, 2], [1, 0, 1], [2, 1, 2]], field)
+
+    def test_distance_field_weighted_successors_numpy(self):
+        grid = [[1, 9, 1], [1, 9, 1], [1, 1, 1]]
+        field = distance_field([(0, 0)], grid, cost=lambda loc: grid[loc[0]][loc[1]], as_numpy=True)
+        self.assertEqual((3, 3), field.shape)
+        self.assertEqual(6, field[0, 2])
+        self.assertEqual(9, field[0, 1])
+        only_right = distance_field([(0, 0)], grid, successors=lambda loc: [(loc[0], loc[1] + 1)] if loc[1] < 2 else [])
+        self.assertEqual([[0, 1, 2], [-1, -1, -1], [-1, -1, -1]], only_right)
+
+    def test_bidirectional_bfs_matches_bfs(self):
+        def successors(n):
+            return [m for m in (n + 1, n - 1, n * 2) if 0 <= m <= 200]
+
+        node = bidirectional_bfs(3, 77, successors, lambda n: [m for m in (n - 1, n + 1) if 0 <= m <= 200] + (
+            [n // 2] if n % 2 == 0 else []))
+        path = node_to_path(node)
+        self.assertEqual(3, path[0])
+        self.assertEqual(77, path[-1])
+        self.assertEqual(len(node_to_path(bfs(3, lambda n: n == 77, successors))), len(path))
+        for a, b in zip(path, path[1:]):
+            self.assertIn(b, successors(a))
+
+    def test_bidirectional_bfs_undirected(self):
+        graph = {'A': ['B', 'D'], 'B': ['A', 'C'], 'C': ['B', 'E'], 'D': ['A', 'E'], 'E': ['C', 'D', 'F'],
+                 'F': ['E']}
+        node = bidirectional_bfs('A', 'F', lambda x: graph[x])
+        self.assertEqual(['A', 'D', 'E', 'F'], node_to_path(node))
+
+    def test_bidirectional_bfs_list_states(self):
+        def flip(state):
+            return [[not v if i in button else v for i, v in enumerate(state)] for button in ({0, 1}, {1, 2}, {2})]
+
+        node = bidirectional_bfs([False] * 3, [True, False, False], flip)
+        self.assertEqual(4, len(node_to_path(node)))
+
+    def test_bidirectional_bfs_edge_cases(self):
+        self.assertEqual(['A'], node_to_path(bidirectional_bfs('A', 'A', lambda x: [])))
+        graph = {'A': ['B'], 'B': ['A'], 'C': []}
+        self.assertIsNone(bidirectional_bfs('A', 'C', lambda x: graph[x]))
+
+    def test_bit_packer(self):
+        encode, decode = bit_packer(3, 3, 3, 3)
+        self.assertEqual(0, encode((0, 0, 0, 0)))
+        self.assertEqual((7, 0, 5, 1), decode(encode((7, 0, 5, 1))))
+        self.assertRaises(ValueError, encode, (8, 0, 0, 0))
+
+    def test_searches_with_encoder(self):
+        encode, decode = bit_packer(3, 3)
+        keys = []
+
+        def counting_encode(state):
+            keys.append(encode(state))
+            return keys[-1]
+
+        def successors(state):
+            x, y = state
+            return [(x + dx, y + dy) for dx, dy in ((1, 0), (0, 1), (-1, 0), (0, -1))
+                    if 0 <= x + dx < 5 and 0 <= y + dy < 5]
+
+        goal = lambda s: s == (4, 3)
+        for search in (bfs, dfs):
+            keys.clear()
+            path = node_to_path(search((0, 0), goal, successors, counting_encode))
+            self.assertEqual((4, 3), path[-1])
+            self.assertTrue(all(isinstance(k, int) for k in keys))
+            path = node_to_path(search((0, 0), goal, successors, encode, decode))
+            self.assertEqual(((0, 0), (4, 3)), (path[0], path[-1]))
+        self.assertEqual(8, len(node_to_path(bfs((0, 0), goal, successors, encode, decode))))
+        for node in (astar((0, 0), goal, successors, lambda s: 0, lambda s: 1, encode, decode),
+                     astar_closed((0, 0), goal, successors, lambda s: 0, lambda s: 1, encode=encode, decode=decode),
+                     dijkstra((0, 0), goal, successors, lambda s: 1, encode, decode)):
+            self.assertEqual(7, node.cost)
+            self.assertEqual((0, 0), node_to_path(node)[0])
+            self.assertEqual((4, 3), node.state)
+
+    def test_ida_star_matches_astar(self):
+        grid = ["1163751742",
+                "1381373672",
+                "2136511328",
+                "3694931569",
+                "7463417111"]
+        end = (len(grid) - 1, len(grid[0]) - 1)
+
+        def successors(loc):
+            r, c = loc
+            return [(r + dr, c + dc) for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                    if 0 <= r + dr < len(grid) and 0 <= c + dc < len(grid[0])]
+
+        args = ((0, 0), lambda x: x == end, successors, lambda x: end[0] - x[0] + end[1] - x[1],
+                lambda x: int(grid[x[0]][x[1]]))
+        expected = astar(*args).cost
+        self.assertEqual(expected, ida_star(*args).cost)
+        node = ida_star(*args, table_size=16)
+        self.assertEqual(expected, node.cost)
+        self.assertEqual((0, 0), node_to_path(node)[0])
+
+    def test_ida_star_no_path(self):
+        graph = {'A': ['B'], 'B': ['A'], 'C': []}
+        self.assertIsNone(ida_star('A', lambda x: x == 'C', lambda x: graph[x], lambda x: 0, lambda x: 1))
+
+    def test_iddfs(self):
+        graph = {'A': ['B', 'C'], 'B': ['D', 'A'], 'C': ['E'], 'D': ['F'], 'E': ['F'], 'F': []}
+        node = iddfs('A', lambda x: x == 'F', lambda x: graph[x])
+        self.assertEqual(3, node.cost)
+        self.assertEqual(4, len(node_to_path(node)))
+        self.assertIsNone(iddfs('A', lambda x: x == 'F', lambda x: graph[x], max_depth=2))
+        self.assertIsNone(iddfs('A', lambda x: x == 'G', lambda x: graph[x]))
+        self.assertEqual(['A'], node_to_path(iddfs('A', lambda x: x == 'A', lambda x: graph[x])))
+        node = iddfs('A', lambda x: x == 'F', lambda x: graph[x], table_size=2)
+        self.assertEqual(3, node.cost)
+
+    KNAPSACK = [(60, 10), (100, 20), (120, 30), (30, 5), (70, 25), (45, 15), (10, 1), (80, 18)]
+
+    def knapsack(self, capacity=50, **kwargs):
+        """state = (next item index, weight used, value so far)"""
+        items = self.KNAPSACK
+
+        def successors(state):
+            i, weight, val = state
+            if i == len(items):
+                return []
+            v, w = items[i]
+            children = [(i + 1, weight, val)]
+            if weight + w <= capacity:
+                children.append((i + 1, weight + w, val + v))
+            return children
+
+        def upper_bound(state):
+            i, weight, val = state
+            return val + sum(v for v, w in items[i:] if weight + w <= capacity)
+
+        return branch_and_bound((0, 0, 0), successors, lambda s: s[2], upper_bound, **kwargs)
+
+    def test_branch_and_bound_knapsack(self):
+        best = max(sum(v for v, _ in combo) for n in range(len(self.KNAPSACK) + 1)
+                   for combo in combinations(self.KNAPSACK, n) if sum(w for _, w in combo) <= 50)
+        result = self.knapsack()
+        self.assertEqual(best, result.value)
+        self.assertEqual(best, result.state[2])
+        self.assertGreater(result.pruned_by_bound, 0)
+        self.assertLess(result.generated, 2 ** (len(self.KNAPSACK) + 1))
+
+    def test_branch_and_bound_memo_and_dominance(self):
+        best = self.knapsack().value
+        self.assertEqual(best, self.knapsack(key=lambda s: s).value)
+        # same item index and weight with less value is never better
+        result = self.knapsack(dominance=lambda s: ((s[0], s[1]), (s[2],)))
+        self.assertEqual(best, result.value)
+
+    def test_branch_and_bound_beam(self):
+        best = self.knapsack().value
+        narrow = self.knapsack(beam_width=1)
+        self.assertLessEqual(narrow.value, best)
+        self.assertGreater(narrow.pruned_by_beam, 0)
+        self.assertEqual(best, self.knapsack(beam_width=1000).value)
+
+    @staticmethod
+    def open_grid_successors(height, width, walls=()):
+        def successors(loc):
+            r, c = loc
+            return [(r + dr, c + dc) for dr, dc in ((0, 1), (1, 0), (0, -1), (-1, 0))
+                    if 0 <= r + dr < height and 0 <= c + dc < width and (r + dr, c + dc) not in walls]
+
+        return successors
+
+    def test_dijkstra_all_counts_paths(self):
+        paths = dijkstra_all((0, 0), lambda x: x == (2, 2), self.open_grid_successors(3, 3), lambda x: 1)
+        self.assertEqual(4, paths.cost)
+        self.assertEqual(6, count_shortest_paths(paths))
+        self.assertEqual(9, len(states_on_shortest_paths(paths)))
+        all_paths = list(iter_shortest_paths(paths))
+        self.assertEqual(6, len(all_paths))
+        self.assertEqual(6, len({tuple(path) for path in all_paths}))
+        for path in all_paths:
+            self.assertEqual([(0, 0), (2, 2)], [path[0], path[-1]])
+            self.assertEqual(5, len(path))
+
+    def test_dijkstra_all_only_cheapest_tiles(self):
+        # the detour around the wall is longer so its tiles are not on a shortest path
+        paths = dijkstra_all((0, 0), lambda x: x == (0, 2), self.open_grid_successors(2, 3), lambda x: 1)
+        self.assertEqual(1, count_shortest_paths(paths))
+        self.assertEqual([(0, 0), (0, 1), (0, 2)], states_on_shortest_paths(paths))
+
+    def test_dijkstra_all_multiple_goals(self):
+        # goal reached in two states (facing different ways) at the same cost
+        graph = {'S': ['A', 'B'], 'A': ['G1'], 'B': ['G2'], 'G1': [], 'G2': []}
+        paths = dijkstra_all('S', lambda x: x.startswith('G'), lambda x: graph[x], lambda x: 1)
+        self.assertEqual(['G1', 'G2'], sorted(paths.goals))
+        self.assertEqual(2, count_shortest_paths(paths))
+        self.assertIsNone(dijkstra_all('S', lambda x: x == 'X', lambda x: graph[x], lambda x: 1))
+
+    def test_dijkstra_and_astar_with_buckets(self):
+        grid = ["1163751742",
+                "1381373672",
+                "2136511328",
+                "3694931569",
+                "7463417111",
+                "1319128137",
+                "1359912421",
+                "3125421639",
+                "1293138521",
+                "2311944581"]
+        end = (9, 9)
+        successors = self.open_grid_successors(10, 10)
+        risk = lambda x: int(grid[x[0]][x[1]])
+        self.assertEqual(40, dijkstra((0, 0), lambda x: x == end, successors, risk, max_weight=9).cost)
+        manhattan = lambda x: end[0] - x[0] + end[1] - x[1]
+        node = astar_closed((0, 0), lambda x: x == end, successors, manhattan, risk, max_step=10)
+        self.assertEqual(40, node.cost)
+        paths = dijkstra_all((0, 0), lambda x: x == (2, 2), self.open_grid_successors(3, 3), lambda x: 1, max_weight=1)
+        self.assertEqual(6, count_shortest_paths(paths))
+
+    def test_search_stats_bfs(self):
+        stats = SearchStats()
+        node = bfs((0, 0), lambda x: x == (2, 2), self.open_grid_successors(3, 3), stats=stats)
+        self.assertEqual(4, len(node_to_path(node)) - 1)
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreaterEqual(stats.generated, stats.expanded)
+        self.assertGreater(stats.duplicates, 0)  # the grid is full of cycles
+        self.assertGreater(stats.peak_frontier, 0)
+        self.assertGreater(stats.peak_explored, stats.peak_frontier)
+
+    def test_search_stats_times_the_callbacks(self):
+        end = (4, 4)
+        stats = SearchStats()
+        node = astar((0, 0), lambda x: x == end, self.open_grid_successors(5, 5),
+                     lambda x: end[0] - x[0] + end[1] - x[1], lambda x: 1, stats=stats)
+        self.assertEqual(8, node.cost)
+        self.assertGreater(stats.times["heuristic"], 0)
+        self.assertGreater(stats.times["cost"], 0)
+        self.assertGreater(stats.times["successors"], 0)
+        self.assertIn("expanded", str(stats))
+
+    def test_search_stats_same_result_as_without(self):
+        successors = self.open_grid_successors(4, 4, walls={(1, 1), (2, 1)})
+        goal = lambda x: x == (3, 3)
+        plain = ida_star((0, 0), goal, successors, lambda x: 0, lambda x: 1)
+        stats = SearchStats()
+        counted = ida_star((0, 0), goal, successors, lambda x: 0, lambda x: 1, stats=stats)
+        self.assertEqual(node_to_path(plain), node_to_path(counted))
+        self.assertGreater(stats.expanded, 0)
+        stats = SearchStats()
+        self.assertIsNotNone(bidirectional_bfs((0, 0), (3, 3), successors, stats=stats))
+        self.assertGreater(stats.peak_explored, 0)
+
+    def test_search_stats_grid_engines_and_branch_and_bound(self):
+        stats = SearchStats()
+        self.assertEqual((10, bfs_grid((0, 0), (4, 6), self.MAZE)[1]), bfs_grid((0, 0), (4, 6), self.MAZE, stats=stats))
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreater(stats.duplicates, 0)
+        self.assertGreater(stats.peak_explored, 0)
+        stats = SearchStats()
+        self.assertEqual(distance_field([(0, 0)], self.MAZE), distance_field([(0, 0)], self.MAZE, stats=stats))
+        self.assertEqual(sum(1 for row in self.MAZE for cell in row if cell != "#"), stats.peak_explored)
+        self.assertGreater(stats.generated, stats.expanded)
+        stats = SearchStats()
+        distance_field([(0, 0)], self.MAZE, cost=lambda loc: 2, stats=stats)
+        self.assertGreater(stats.times["cost"], 0)
+        stats = SearchStats()
+        self.assertEqual(self.knapsack().value, self.knapsack(key=lambda s: s, stats=stats).value)
+        self.assertGreater(stats.expanded, 0)
+        self.assertGreater(stats.times["heuristic"], 0)
+        self.assertGreater(stats.elapsed, 0)
+
+    def test_search_stats_elapsed_is_the_search_time(self):
+        stats = SearchStats()
+        sleep(0.05)  # idle time before the search does not count
+        self.assertIsNotNone(bfs((0, 0), lambda x: True, self.open_grid_successors(3, 3), stats=stats))
+        first = stats.elapsed
+        self.assertGreater(first, 0)  # the start is the goal, it still took some time
+        self.assertLess(first, 0.05)
+        sleep(0.05)
+        self.assertEqual(first, stats.elapsed)  # stopped when the search returned
+        dijkstra((0, 0), lambda x: x == (2, 2), self.open_grid_successors(3, 3), lambda x: 1, stats=stats)
+        self.assertGreater(stats.elapsed, first)
+        self.assertLess(stats.elapsed, 0.05)  # both searches, none of the sleeps
+
 
 if __name__ == "__main__":
     main()
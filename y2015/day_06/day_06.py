@@ -8,9 +8,9 @@ __license__ = "Apache 2.0"
 
 import sys
 import unittest
-from collections import defaultdict
 from pathlib import Path
-from typing import NamedTuple
+
+import numpy as np
 
 from ivonet.files import read_rows
 from ivonet.iter import ints
@@ -26,74 +26,36 @@ def _(*args, end="\n"):
         print(" ".join(str(x) for x in args), end=end)
 
 
-class Coord(NamedTuple):
-    x: int
-    y: int
-
-
-def turn_1(grid: dict, start: Coord, stop: Coord, state=True):
-    for x in range(start.x, stop.x + 1):
-        for y in range(start.y, stop.y + 1):
-            grid[Coord(x, y)] = state
-
-
-def toggle_1(grid: dict, start: Coord, stop: Coord):
-    for x in range(start.x, stop.x + 1):
-        for y in range(start.y, stop.y + 1):
-            grid[Coord(x, y)] = not grid[Coord(x, y)]
-
-
-def process_1(source):
-    grid = defaultdict(bool)
+def instructions(source):
     for line in source:
         x1, y1, x2, y2 = ints(line)
-        _(x1, y1, x2, y2)
-        start = Coord(x1, y1)
-        stop = Coord(x2, y2)
-        if "turn on" in line:
-            turn_1(grid, start, stop, state=True)
-            continue
-        if "turn off" in line:
-            turn_1(grid, start, stop, state=False)
-            continue
-        if "toggle" in line:
-            toggle_1(grid, start, stop)
-    return grid
-
-
-def turn_2(grid: dict, start: Coord, stop: Coord, state=1):
-    for x in range(start.x, stop.x + 1):
-        for y in range(start.y, stop.y + 1):
-            grid[Coord(x, y)] += state
-            if grid[Coord(x, y)] < 0:
-                grid[Coord(x, y)] = 0
-
-
-def process_2(source):
-    grid = defaultdict(int)
-    for line in source:
-        x1, y1, x2, y2 = ints(line)
-        start = Coord(x1, y1)
-        stop = Coord(x2, y2)
-        if "turn on" in line:
-            turn_2(grid, start, stop, state=1)
-            continue
-        if "turn off" in line:
-            turn_2(grid, start, stop, state=-1)
-            continue
-        if "toggle" in line:
-            turn_2(grid, start, stop, state=2)
-    return grid
+        # the ranges are inclusive, so as slices the stop is one further
+        yield line, (slice(x1, x2 + 1), slice(y1, y2 + 1))
 
 
 def part_1(source):
-    grid = process_1(source)
-    return sum(1 for v in grid.values() if v is True)
+    grid = np.zeros((1000, 1000), dtype=bool)
+    for line, rectangle in instructions(source):
+        if "turn on" in line:
+            grid[rectangle] = True
+        elif "turn off" in line:
+            grid[rectangle] = False
+        elif "toggle" in line:
+            grid[rectangle] ^= True
+    return int(grid.sum())
 
 
 def part_2(source):
-    grid = process_2(source)
-    return sum(v for v in grid.values())
+    grid = np.zeros((1000, 1000), dtype=np.int64)
+    for line, rectangle in instructions(source):
+        if "turn on" in line:
+            grid[rectangle] += 1
+        elif "turn off" in line:
+            # brightness can not go below 0, so this one can not be collected as a plain increment
+            grid[rectangle] = np.maximum(grid[rectangle] - 1, 0)
+        elif "toggle" in line:
+            grid[rectangle] += 2
+    return int(grid.sum())
 
 
 class UnitTests(unittest.TestCase):
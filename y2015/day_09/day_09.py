@@ -11,7 +11,8 @@ import unittest
 from pathlib import Path
 
 from ivonet.files import read_rows
-from ivonet.iter import ints, permutations
+from ivonet.graph import tsp
+from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
 
@@ -36,22 +37,21 @@ def prepare_graph(source):
     return list(cities), weights
 
 
-def part_1(source):
+def distances(source) -> list[list[float]]:
+    """The distance matrix between the cities for the Held–Karp tsp (no route is infinite)"""
     cities, weights = prepare_graph(source)
-    shortest = float("inf")  # https://stackoverflow.com/questions/13795758/what-is-sys-maxint-in-python-3
-    for places in permutations(cities):
-        length = sum(weights[places[i], places[i + 1]] for i in range(len(places) - 1))
-        shortest = min(shortest, length)
-    return shortest
+    return [[0 if city1 == city2 else weights.get((city1, city2), float("inf")) for city2 in cities]
+            for city1 in cities]
+
+
+def part_1(source):
+    shortest, route = tsp(distances(source))
+    return int(shortest)
 
 
 def part_2(source):
-    cities, weights = prepare_graph(source)
-    longest = float("-inf")  # https://stackoverflow.com/questions/13795758/what-is-sys-maxint-in-python-3
-    for places in permutations(cities):
-        length = sum(weights[places[i], places[i + 1]] for i in range(len(places) - 1))
-        longest = max(longest, length)
-    return longest
+    longest, route = tsp(distances(source), maximize=True)
+    return int(longest)
 
 
 class UnitTests(unittest.TestCase):
@@ -8,10 +8,10 @@ __license__ = "Apache 2.0"
 
 import sys
 import unittest
-from itertools import permutations
 from pathlib import Path
 
 from ivonet.files import read_rows
+from ivonet.graph import tsp
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -42,21 +42,15 @@ def parse(source):
 
 
 def best_seating_arrangement(persons, happiness):
-    """Check for all permutations of the persons the best happiness table seating
-    - check both ways
-    - don't forget to "loop" around and compare the first and the last member
-      (also both ways)
+    """The best happiness table seating
+    - sitting next to each other counts both ways so add them up in one matrix
+    - the table is round so it is a closed tour of the travelling salesman (maximized)
     """
-    happiest = float("-inf")
-    for i, seating in enumerate(permutations(persons)):
-        scale = 0
-        for i in range(len(persons) - 1):
-            scale += happiness[seating[i], seating[i + 1]]
-            scale += happiness[seating[i + 1], seating[i]]
-        scale += happiness[seating[-1], seating[0]]
-        scale += happiness[seating[0], seating[-1]]
-        happiest = max(happiest, scale)
-    return happiest
+    persons = list(persons)
+    scale = [[0 if a == b else happiness[a, b] + happiness[b, a] for b in persons] for a in persons]
+    happiest, seating = tsp(scale, maximize=True, cycle=True)
+    _(" -> ".join(persons[i] for i in seating), happiest)
+    return int(happiest)
 
 
 def part_1(source):
@@ -8,11 +8,10 @@ __license__ = "Apache 2.0"
 
 import sys
 import unittest
-from copy import deepcopy
 from pathlib import Path
 
+from ivonet.automaton import Automaton, life_rule, parse_cells
 from ivonet.files import read_rows
-from ivonet.grid import neighbors, Location
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -26,39 +25,18 @@ def p(*args, end="\n"):
         print(" ".join(str(x) for x in args), end=end)
 
 
-def corners(matrix, corner_stuck):
+def corners(automaton, corner_stuck):
     if corner_stuck:
-        matrix[0][0] = "#"
-        matrix[0][len(matrix[0]) - 1] = "#"
-        matrix[len(matrix) - 1][0] = "#"
-        matrix[len(matrix) - 1][len(matrix[0]) - 1] = "#"
-
-
-def flip_lights(source, corner_stuck=False):
-    matrix = deepcopy(source)
-    for h, row in enumerate(source):
-        for w, col in enumerate(row):
-            nb_on = sum(1 for x, y in neighbors(source, Location(h, w), diagonal=True) if source[x][y] == "#")
-            if source[h][w] == "#":
-                if nb_on not in [2, 3]:
-                    matrix[h][w] = "."
-            else:  # of
-                if nb_on == 3:
-                    matrix[h][w] = "#"
-            corners(matrix, corner_stuck)
-    return matrix
-
-
-def count_lights(matrix):
-    return sum(1 for h, row in enumerate(matrix) for w, col in enumerate(row) if matrix[h][w] == "#")
+        automaton.cells[::automaton.cells.shape[0] - 1, ::automaton.cells.shape[1] - 1] = 1
 
 
 def process(source, steps, corners_on=False):
-    matrix = [list(row) for row in source]
-    corners(matrix, corners_on)
+    lights = Automaton(parse_cells(source), life_rule(birth=[3], survive=[2, 3]))
+    corners(lights, corners_on)
     for _ in range(steps):
-        matrix = flip_lights(matrix, corners_on)
-    return count_lights(matrix)
+        lights.step()
+        corners(lights, corners_on)
+    return lights.population
 
 
 def part_1(source, steps=100):
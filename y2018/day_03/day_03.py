@@ -10,11 +10,11 @@ __doc__ = """"""
 import os
 import sys
 import unittest
-from collections import defaultdict
 from pathlib import Path
 from typing import NamedTuple
 
 from ivonet.files import read_rows
+from ivonet.grid import DifferenceArray, SummedArea
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -40,41 +40,39 @@ def parse(source):
     return [Claim(*ints(line)) for line in source]
 
 
-def visualise(fabric, width=1000, height=1000):
-    for h in range(height):
-        for w in range(width):
-            print("." if not fabric[(h, w)] else len(fabric[(h, w)]), end="")
-        print()
+def visualise(fabric):
+    for row in fabric:
+        print("".join("." if not square else str(square) for square in row))
 
 
-def process(source):
-    claims = parse(source)
-    fabric = defaultdict(list)
+def process(claims, size=1000):
+    """The number of claims on every square inch of the fabric (indexed [top, left])"""
+    fabric = DifferenceArray((size, size))
     for claim in claims:
-        for h in range(claim.top, claim.top + claim.tall):
-            for w in range(claim.left, claim.left + claim.wide):
-                fabric[(h, w)].append(claim.id)
-    return fabric
+        fabric.add(claim.top, claim.left, claim.top + claim.tall, claim.left + claim.wide)
+    return fabric.values()
 
 
 def part_1(source):
-    return sum(1 for k, v in process(source).items() if len(v) > 1)
+    return int((process(parse(source)) > 1).sum())
 
 
 def part_2(source):
-    fabric = process(source)
-    single_squared_ids = set(v[0] for k, v in fabric.items() if len(v) == 1)
-    for i in single_squared_ids:
-        if not any(x for x in fabric.values() if i in x and len(x) > 1):
-            return i
+    claims = parse(source)
+    # a claim without overlap has a total of exactly 1 on all its squares
+    fabric = SummedArea(process(claims))
+    for claim in claims:
+        if fabric.sum(claim.top, claim.left, claim.top + claim.tall, claim.left + claim.wide) == claim.wide * claim.tall:
+            return claim.id
     return None
 
 
 def part_2_for_fun(source):
     """Just playing with list comprehension"""
-    fabric = process(source)
-    return [i for i in set(v[0] for k, v in fabric.items() if len(v) == 1) if
-            not any(x for x in fabric.values() if i in x and len(x) > 1)][0] or None
+    claims = parse(source)
+    fabric = SummedArea(process(claims))
+    return [c.id for c in claims if fabric.sum(c.top, c.left, c.top + c.tall, c.left + c.wide) == c.wide * c.tall][0] \
+        or None
 
 
 class UnitTests(unittest.TestCase):
@@ -14,13 +14,11 @@ import os
 import re
 import sys
 import unittest
-from itertools import count
-from nis import cat
 from pathlib import Path
 
-from ivonet import infinite
 from ivonet.files import read_rows
-from ivonet.iter import ints, multimap, quantify, flatten
+from ivonet.graph import Scheduler
+from ivonet.iter import ints
 from ivonet.str import cat
 
 sys.dont_write_bytecode = True
@@ -40,40 +38,17 @@ def parse_instruction(line):
 
 def order(pairs):
     """Yield steps in order, respecting (before, after) pairs; break ties lexically."""
-    steps = {*flatten(pairs)}
-    constraints = multimap((A, B) for [B, A] in pairs)
-
-    def ready(step):
-        return all(pre not in steps for pre in constraints[step])
-
-    while steps:
-        step = min(filter(ready, steps))
-        steps.remove(step)
-        yield step
+    yield from Scheduler(pairs).order()
 
 
 def schedule(pairs, workers=5, seconds=60):
-    """Create a schedule map with times based on the step_time and number of workers
+    """Create a schedule map with end times based on the step time and number of workers
     Flow:
-
+    - the scheduler keeps the ready steps in a heap, the free workers take the first ones
+    - time jumps to the moment the next worker finishes, that may release new steps
     """
-    steps = {*flatten(pairs)}
-    constraints = multimap((b, a) for a, b in pairs)
-    end_time = {step: infinite for step in steps}
-    for spend in count(1):
-        def ready(step, ts=spend):
-            return all(end_time[p] < ts for p in constraints[step])
-
-        available = list(filter(ready, steps))
-        for step in sorted(available)[:workers]:
-            end_time[step] = spend + seconds + ord(step) - ord('A')
-            steps.remove(step)
-            workers -= 1
-        # Discover if any workers become free this time step
-        workers += quantify(end_time[step] == spend for step in end_time)
-        # Return answer once all steps have been scheduled
-        if not steps:
-            return end_time
+    times = Scheduler(pairs).simulate(workers, lambda step: seconds + ord(step) - ord('A') + 1)
+    return {step: end for step, (start, end) in times.items()}
 
 
 def part_1(source):
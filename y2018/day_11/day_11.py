@@ -10,12 +10,13 @@ __doc__ = """"""
 import os
 import sys
 import unittest
-from collections import defaultdict
-from itertools import product
 from pathlib import Path
 
+import numpy as np
+
 from ivonet.files import read_data
-from ivonet.iter import ints, rangei
+from ivonet.grid import SummedArea
+from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
 
@@ -29,44 +30,35 @@ def _(*args, end="\n"):
 
 
 class PowerGrid:
-    """Implemented in a class as to save state like a cache and the serial number and not having to pass them around
-    ugly like"""
+    """Implemented in a class as to save state like the summed area table and the serial number and not having
+    to pass them around ugly like"""
 
     def __init__(self, serial_number=8868, grid_size=300) -> None:
         self.grid_size = grid_size
         self.serial = int(serial_number)
-        self.cache = defaultdict(int)
-        self.sa = self.cache_area(rangei(1, self.grid_size))
+        # indexed [x - 1, y - 1] so a (row, col) found in the table is (x - 1, y - 1)
+        x, y = np.indices((self.grid_size, self.grid_size)) + 1
+        self.sa = SummedArea(self.power_level((x, y)))
 
-    def power_level(self, loc: tuple[int, int]):
-        """The actual power grid rules"""
+    def power_level(self, loc):
+        """The actual power grid rules (works on numbers and on whole numpy arrays)"""
         x, y = loc
         rack_id = x + 10
         level = (rack_id * y + self.serial) * rack_id
         return (level // 100) % 10 - 5
 
-    def cache_area(self, side):
-        """A table of areas already summed up
-        - build a cached power grid by calculating what is new and adding what was behind
-        """
-        for x, y in list(product(side, side)):
-            self.cache[x, y] = self.power_level((x, y)) + \
-                               self.cache[x, y - 1] + self.cache[x - 1, y] - self.cache[x - 1, y - 1]
-        return self.cache
-
     def total_power(self, top_left, size=3):
         """Total power calculated from the top left corner of a size*size"""
         x, y = top_left
-        x_min, y_min, x_max, y_max = x - 1, y - 1, x + size - 1, y + size - 1
-        return self.sa[x_min, y_min] + self.sa[x_max, y_max] - self.sa[x_max, y_min] - self.sa[x_min, y_max]
+        return self.sa.sum(x - 1, y - 1, x - 1 + size, y - 1 + size)
 
     def max_power(self, size=3):
-        top_lefts = product(rangei(1, self.grid_size - size), repeat=2)
-        return max((self.total_power(top_left, size), top_left, size) for top_left in top_lefts)
+        return self.max_power_any_size(sizes=[size])
 
-    def max_power_any_size(self):
+    def max_power_any_size(self, sizes=None):
         """Get the max power level of any size square within the grid"""
-        return max(self.max_power(size=x) for x in range(300))
+        total, x, y, size = self.sa.max_square(sizes)
+        return total, (x + 1, y + 1), size
 
 
 def part_1(source):
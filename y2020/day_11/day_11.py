@@ -5,11 +5,12 @@ __copyright__ = "Copyright (c) 2021 Ivo Woltring"
 __license__ = "Apache 2.0"
 
 import unittest
-from copy import deepcopy
 from pathlib import Path
 
+import numpy as np
+
 from ivonet.files import read_rows
-from ivonet.grid import neighbors_defined_grid, directions, Location
+from ivonet.grid import Grid, LineOfSight
 from ivonet.iter import ints
 
 OCCUPIED_SEAT = '#'
@@ -25,101 +26,35 @@ def _(*args, end="\n"):
         print(" ".join(str(x) for x in args), end=end)
 
 
-def parse(data):
-    matrix = {}
-    for y, row in enumerate(data):
-        for x, col in enumerate(row):
-            matrix[Location(y, x)] = col
-    return matrix
-
-
-def print_matrix(matrix, grid=(99, 90), end=""):
-    if DEBUG:
-        for y in range(grid[1]):
-            for x in range(grid[0]):
-                try:
-                    print(matrix[(x, y)], end=end)
-                except KeyError:
-                    print(f"key error x={x}, y={y}")
-            print()
-
-
-def dict_compare(d1, d2):
-    d1_keys = set(d1.keys())
-    d2_keys = set(d2.keys())
-    shared_keys = d1_keys.intersection(d2_keys)
-    added = d1_keys - d2_keys
-    removed = d2_keys - d1_keys
-    modified = {o: (d1[o], d2[o]) for o in shared_keys if d1[o] != d2[o]}
-    same = set(o for o in shared_keys if d1[o] == d2[o])
-    return added, removed, modified, same
-
+def seating(data, seen_all_around, tolerance):
+    """Run the seat rules until nothing changes
 
-def part_1(data):
-    height = len(data)
-    width = len(data[0])
-    grid = (height, width)
-    matrix = parse(data)
-    running = True
+    The seats never move, so who sees whom is computed once (LineOfSight) and every
+    round is one lookup of the occupied seats through the seen indices.
+    """
+    grid = Grid.from_rows(data)
+    seats = grid.mask(EMPTY_SEAT, OCCUPIED_SEAT)
+    sight = LineOfSight(grid.cells.shape)
+    seen = sight.first(seats if seen_all_around else np.ones_like(seats))
+    occupied = grid.mask(OCCUPIED_SEAT).ravel()
     idx = 0
-    while running:
-        temp_matrix = deepcopy(matrix)
+    while True:
         idx += 1
-        for coord in matrix:
-            if matrix[coord] == GROUND:
-                continue
-            occupied = 0
-            for nb in neighbors_defined_grid(coord, grid):
-                seat = matrix[nb]
-                if seat == OCCUPIED_SEAT:
-                    occupied += 1
-            if matrix[coord] == EMPTY_SEAT and occupied == 0:
-                temp_matrix[coord] = OCCUPIED_SEAT
-            if matrix[coord] == OCCUPIED_SEAT and occupied >= 4:
-                temp_matrix[coord] = EMPTY_SEAT
-        if temp_matrix == matrix:
-            running = False
+        # the extra False at the end is what -1 (nothing seen) looks up
+        neighbors = np.append(occupied, False)[seen].sum(axis=0).ravel()
+        new = seats.ravel() & np.where(occupied, neighbors < tolerance, neighbors == 0)
+        if np.array_equal(new, occupied):
             _(f"Iteration: {idx}")
-            print_matrix(matrix, grid)
-        matrix = temp_matrix
-    return sum(1 for x in matrix.values() if x == OCCUPIED_SEAT)
+            return int(occupied.sum())
+        occupied = new
+
+
+def part_1(data):
+    return seating(data, seen_all_around=False, tolerance=4)
 
 
 def part_2(data):
-    height = len(data)
-    width = len(data[0])
-    grid = (height, width)
-    matrix = parse(data)
-    running = True
-    idx = 0
-    while running:
-        idx += 1
-        temp_matrix = deepcopy(matrix)
-        for coord in matrix:
-            if matrix[coord] == GROUND:
-                continue
-            occupied = 0
-            dirs = directions(data, coord)
-            for compass in dirs:
-                for crd in dirs[compass]:
-                    place = matrix[crd]
-                    if place == GROUND:
-                        continue
-                    if place == OCCUPIED_SEAT:
-                        occupied += 1
-                        break
-                    if place == EMPTY_SEAT:
-                        break
-            if matrix[coord] == EMPTY_SEAT and occupied == 0:
-                temp_matrix[coord] = OCCUPIED_SEAT
-            if matrix[coord] == OCCUPIED_SEAT and occupied >= 5:
-                temp_matrix[coord] = EMPTY_SEAT
-        if temp_matrix == matrix:
-            running = False
-            _(f"Iteration: {idx}")
-            print_matrix(matrix, grid)
-        matrix = temp_matrix
-    return sum(1 for x in matrix.values() if x == OCCUPIED_SEAT)
+    return seating(data, seen_all_around=True, tolerance=5)
 
 
 class UnitTests(unittest.TestCase):
@@ -10,7 +10,7 @@ from pathlib import Path
 
 from ivonet.calc import prod
 from ivonet.files import read_int_matrix
-from ivonet.grid import neighbors, neighbor_values, Location
+from ivonet.grid import neighbors, Location, Grid
 from ivonet.iter import ints
 
 BOUNDARY = 9
@@ -19,37 +19,17 @@ sys.dont_write_bytecode = True
 
 
 def part_1(matrix):
-    som = 0
-    smallest_points = []
-    for h, row in enumerate(matrix):
-        for w, x in enumerate(row):
-            nb = neighbors(matrix, Location(h, w), diagonal=False)
-            smallest = True
-            for a, b in nb:
-                if matrix[a][b] <= x:
-                    smallest = False
-            if smallest:
-                som += 1 + x
-                smallest_points.append(Location(h, w))
-    return som, smallest_points
-
-
-def part_1a(matrix):
-    points = 0
-    smallest_points = []
-    for h in range(len(matrix)):
-        for w in range(len(matrix[0])):
-            me = matrix[h][w]
-            nb = neighbor_values(matrix, Location(h, w), diagonal=False)
-            if me < min(nb):
-                points += 1 + me
-                smallest_points.append(Location(h, w))
-    return points, smallest_points
+    """A low point is lower than all 4 of its neighbors (outside the grid counts as higher than 9)
+    Compared for the whole grid at once with numpy
+    """
+    grid = Grid(matrix)
+    low = (grid.cells < grid.neighbors(fill=BOUNDARY + 1)).all(axis=0)
+    return int((grid.cells[low] + 1).sum()), [Location(r, c) for r, c in grid.argwhere(low)]
 
 
 def part_2(matrix):
     cache = []
-    smallest_points = part_1a(matrix)[1]
+    smallest_points = part_1(matrix)[1]
     for coord in smallest_points:
         queue = neighbors(matrix, coord, diagonal=False)
         basin = [coord, ]
@@ -89,11 +69,8 @@ class UnitTests(unittest.TestCase):
     def test_part_1(self):
         self.assertEqual(500, part_1(self.source)[0])
 
-    def test_part_1a(self):
-        self.assertEqual(500, part_1a(self.source)[0])
-
-    def test_part_1a2(self):
-        self.assertEqual(part_1(self.source)[1], part_1a(self.source)[1])
+    def test_example_low_points(self):
+        self.assertEqual([Location(0, 1), Location(0, 9), Location(2, 2), Location(4, 6)], part_1(self.test_source)[1])
 
     def test_part_2(self):
         self.assertEqual(970200, part_2(self.source))
@@ -15,7 +15,7 @@ from typing import TypeVar
 from ivonet.files import read_int_matrix
 from ivonet.grid import neighbors_defined_grid, Location
 from ivonet.iter import ints
-from ivonet.search import astar
+from ivonet.search import astar_closed
 
 sys.dont_write_bytecode = True
 
@@ -79,11 +79,11 @@ def part_1(source):
     start = Location(0, 0)
     goal = Location(rows - 1, cols - 1)
     risks = make_risk_map(source)
-    solution = astar(start,  # start at the start
-                     is_goal(goal),  # callback function to see if the end goal has been reached
-                     adjoining(rows, cols),  # callback to get all the relevant neighbors of a Location
-                     manhattan_distance(goal),  # No diagonals allowed so the Manhattan distance calculator callback
-                     cost_calculator(risks))  # the cost of going a direction based on the Chiton risk per Location
+    solution = astar_closed(start,  # start at the start
+                            is_goal(goal),  # callback function to see if the end goal has been reached
+                            adjoining(rows, cols),  # callback to get all the relevant neighbors of a Location
+                            manhattan_distance(goal),  # No diagonals allowed so the Manhattan distance calculator callback
+                            cost_calculator(risks))  # the cost of going a direction based on the Chiton risk per Location
     if solution:
         # print(solution)
         # print(node_to_path(solution))
@@ -99,11 +99,11 @@ def part_2(source):
     new_width = cols * 5
     goal = Location(new_height - 1, new_width - 1)
     risks = make_extended_risk_map(make_risk_map(source), rows, cols)
-    solution = astar(start,
-                     is_goal(goal),
-                     adjoining(new_height, new_width),
-                     manhattan_distance(goal),
-                     cost_calculator(risks))
+    solution = astar_closed(start,
+                            is_goal(goal),
+                            adjoining(new_height, new_width),
+                            manhattan_distance(goal),
+                            cost_calculator(risks))
     if solution:
         # print(solution)
         # print(node_to_path(solution))
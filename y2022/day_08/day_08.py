@@ -16,8 +16,10 @@ import sys
 import unittest
 from pathlib import Path
 
+import numpy as np
+
 from ivonet.files import read_int_matrix
-from ivonet.grid import Location, north, east, south, west
+from ivonet.grid import LineOfSight, ORTHOGONAL
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -31,53 +33,22 @@ def _(*args, end="\n"):
         print(" ".join(str(x) for x in args), end=end)
 
 
-def is_visible(tree_height, direction: iter) -> bool:
-    for i, value in direction:
-        if value >= tree_height:
-            return False
-    return True
-
-
-def scenic_score_direction(tree_height: int, direction: iter) -> int:
-    score = 0
-    for i, value in direction:
-        score += 1
-        if tree_height <= value:
-            break
-    return score
+def sight_lines(source):
+    """Per direction (N, E, S, W) and tree the nearest tree at least as tall (-1 if none)"""
+    heights = np.array(source)
+    sight = LineOfSight(heights.shape, directions=ORTHOGONAL)
+    return sight, sight.blocking(heights)
 
 
 def part_1(source):
-    height: int = len(source)
-    width: int = len(source[0])
-    visible_trees: int = (height + width) * 2 - 4  # borders pre calculated
-    for r in range(1, len(source) - 1):
-        for c in range(1, len(source[r]) - 1):
-            loc: Location = Location(r, c)
-            tree_height: int = source[r][c]
-            if is_visible(tree_height, north(source, loc, value=True)) or \
-                    is_visible(tree_height, east(source, loc, value=True)) or \
-                    is_visible(tree_height, south(source, loc, value=True)) or \
-                    is_visible(tree_height, west(source, loc, value=True)):
-                visible_trees += 1
-    return visible_trees
+    blockers = sight_lines(source)[1]
+    # visible from the outside if nothing blocks the view in at least one direction
+    return int((blockers == -1).any(axis=0).sum())
 
 
 def part_2(source):
-    highest_scenic_score: int = 0
-    for r in range(1, len(source) - 1):
-        for c in range(1, len(source[r]) - 1):
-            loc: Location = Location(r, c)
-            tree_height: int = source[r][c]
-            north_score = scenic_score_direction(tree_height, north(source, loc, value=True))
-            east_score = scenic_score_direction(tree_height, east(source, loc, value=True))
-            south_score = scenic_score_direction(tree_height, south(source, loc, value=True))
-            west_score = scenic_score_direction(tree_height, west(source, loc, value=True))
-            tree_score = north_score * east_score * south_score * west_score
-            if highest_scenic_score < tree_score:
-                highest_scenic_score = tree_score
-
-    return highest_scenic_score
+    sight, blockers = sight_lines(source)
+    return int(sight.distances(blockers).prod(axis=0).max())
 
 
 class UnitTests(unittest.TestCase):
@@ -22,7 +22,7 @@ from ivonet.alphabet import alphabet
 from ivonet.files import read_rows
 from ivonet.grid import Location, neighbors_defined_grid
 from ivonet.iter import ints
-from ivonet.search import bfs, node_to_path
+from ivonet.search import bfs, node_to_path, distance_field
 
 sys.dont_write_bytecode = True
 
@@ -94,16 +94,10 @@ def part_1(source):
 
 def part_2(source):
     _, goal, matrix, possible_starting_points = read_matrix(source)
-    shortest = infinite
-    for start in possible_starting_points:
-        solution = bfs(start,
-                       is_goal(goal),
-                       successors(matrix))
-        if solution:
-            length = len(node_to_path(solution)) - 1
-            if shortest > length:
-                shortest = length
-    return shortest
+    field = distance_field(possible_starting_points, matrix, successors=successors(matrix))
+    if field[goal.row][goal.col] == -1:
+        return infinite
+    return field[goal.row][goal.col]
 
 
 class UnitTests(unittest.TestCase):
@@ -20,6 +20,7 @@ import sys
 
 from ivonet import infinite
 from ivonet.files import read_rows
+from ivonet.graph import Graph, all_pairs_shortest_paths
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -70,31 +71,24 @@ class Tunnelator:
                 hpv[node] = rate
         return hpv
 
-    def __floyd_warhall(self) -> dict[str, dict[str, int]]:
+    def __floyd_warhall(self, start: str = 'AA') -> dict[str, dict[str, int]]:
         """https://en.wikipedia.org/wiki/Floyd%E2%80%93Warshall_algorithm
         https://www.geeksforgeeks.org/floyd-warshall-algorithm-dp-16/
         Found the hint for this algorithm on reddit. Not sure If I had figured it out otherwise.
         Once you know the algorithm, though it is not that hard to implement "ahum" took me ages.
-        to initialize the matrix I need to:
-        - create a matrix initialized with either 1 or infinite
-        - if a node exists in a group (neighbors) then set the distance to 1
-        - else set the distance to infinite
-        - then do the triple loop from the algorithm
-        the result is a matrix with the shortest distances between all nodes.
+        Only the distances between the start and the high pressure valves are ever used, so
+        now it is one bfs per point of interest with the all_pairs_shortest_paths of my library.
+        the result is a matrix with the shortest distances between those valves.
         """
-        floyd_warhall = {}
-        for x in self.groups:
-            floyd_warhall[x] = {}
-            for y in self.groups:
-                if y in self.groups[x]:
-                    floyd_warhall[x][y] = 1
-                else:
-                    floyd_warhall[x][y] = infinite
-        for k in floyd_warhall:
-            for i in floyd_warhall:
-                for j in floyd_warhall:
-                    floyd_warhall[i][j] = min(floyd_warhall[i][j], floyd_warhall[i][k] + floyd_warhall[k][j])
-        return floyd_warhall
+        graph: Graph[str] = Graph(list(self.groups))
+        for x, neighbours in self.groups.items():
+            for y in neighbours:
+                graph.add_edge_by_vertices(x, y)
+        points = [start, *self.high_pressure_valves]
+        matrix = all_pairs_shortest_paths(graph, points=points)
+        return {x: {y: int(matrix[i, j]) if matrix[i, j] < infinite else infinite
+                    for j, y in enumerate(points)}
+                for i, x in enumerate(points)}
 
     def traverse(self, start: str, results: dict, time: int = 30, state: int = 0, pressure_released: int = 0) -> \
             dict[int, int]:
@@ -18,6 +18,7 @@ from pathlib import Path
 
 from ivonet.files import read_rows
 from ivonet.iter import ints
+from ivonet.search import branch_and_bound
 
 sys.dont_write_bytecode = True
 
@@ -31,57 +32,74 @@ def _(*args, end="\n", sep=" "):
 
 
 class Factory:
-    def __init__(self, source):
-        self.source = source
-        self.blueprints: list[list[int]] = [ints(line) for line in source]
-        self.max = 0
-        self.max_ore = 0
-        self.clay_cost = 0
-        self.max_obsidian = 0
-        pass
-
-    def dfs(self, time_left, goal,
-            ore_robot, clay_robot, obsidian_robot, geode_robot,
-            ore_available, clay_available, obsidian_available, geode_available):
-        if (goal == 0 and ore_robot >= mi or
-                goal == 1 and clay_robot >= mj or
-                goal == 2 and (obsidian_robot >= mk or clay_robot == 0) or
-                goal == 3 and obsidian_robot == 0 or
-                geode_available + geode_robot * time_left + o[time_left] <= m):
-            return
-        while time_left:
-            if goal == 0 and ore_available >= a:
-                self.dfs(time_left - 1, goal, ore_robot + 1, clay_robot, obsidian_robot, geode_robot,
-                         ore_available - a + ore_robot, clay_available + clay_robot,
-                         obsidian_available + obsidian_robot, geode_available + geode_robot)
-                return
-            elif goal == 1 and ore_available >= b:
-                self.dfs(time_left - 1, goal, ore_robot, clay_robot + 1, obsidian_robot, geode_robot,
-                         ore_available - b + ore_robot, clay_available + clay_robot,
-                         obsidian_available + obsidian_robot, geode_available + geode_robot)
-                return
-            elif goal == 2 and ore_available >= c and clay_available >= d:
-                self.dfs(time_left - 1, goal, ore_robot, clay_robot, obsidian_robot + 1, geode_robot,
-                         ore_available - c + ore_robot, clay_available - d + clay_robot,
-                         obsidian_available + obsidian_robot, geode_available + geode_robot)
-                return
-            elif goal == 3 and ore_available >= e and obsidian_available >= f:
-                self.dfs(time_left - 1, goal, ore_robot, clay_robot, obsidian_robot, geode_robot + 1,
-                         ore_available - e + ore_robot, clay_available + clay_robot,
-                         obsidian_available - f + obsidian_robot, geode_available + geode_robot)
-                return
-            time_left, ore_available, clay_available, obsidian_available, geode_available = time_left - 1, ore_available + ore_robot, clay_available + clay_robot, obsidian_available + obsidian_robot, geode_available + geode_robot
-        self.max = max(self.max, geode_available)
-
+    """Geode cracking factory for one blueprint.
+
+    A state is (time_left, robots, resources) where robots and resources are
+    (ore, clay, obsidian, geode) tuples. Instead of simulating every minute the
+    successors jump straight to the moment the next chosen robot is built.
+    """
+
+    def __init__(self, blueprint: str):
+        self.id, ore_ore, clay_ore, obsidian_ore, obsidian_clay, geode_ore, geode_obsidian = ints(blueprint)
+        self.costs = (
+            (ore_ore, 0, 0),
+            (clay_ore, 0, 0),
+            (obsidian_ore, obsidian_clay, 0),
+            (geode_ore, 0, geode_obsidian),
+        )
+        # never build more robots of a kind than can be spent in one minute
+        self.max_robots = (max(ore_ore, clay_ore, obsidian_ore, geode_ore), obsidian_clay, geode_obsidian)
+
+    def successors(self, state):
+        time_left, robots, resources = state
+        children = []
+        for kind, cost in enumerate(self.costs):
+            if kind < 3 and robots[kind] >= self.max_robots[kind]:
+                continue
+            wait = 0
+            for needed, available, rate in zip(cost, resources, robots):
+                if needed > available:
+                    if rate == 0:
+                        break
+                    wait = max(wait, -(-(needed - available) // rate))
+            else:
+                minutes = wait + 1  # waiting for the resources plus building the robot
+                if minutes >= time_left:
+                    continue
+                new_resources = tuple(resources[i] + robots[i] * minutes - (cost[i] if i < 3 else 0)
+                                      for i in range(4))
+                new_robots = tuple(n + (i == kind) for i, n in enumerate(robots))
+                children.append((time_left - minutes, new_robots, new_resources))
+        return children
+
+    @staticmethod
+    def geodes(state):
+        """The geodes at the end if nothing more is built"""
+        time_left, robots, resources = state
+        return resources[3] + robots[3] * time_left
+
+    def upper_bound(self, state):
+        """As if a new geode robot could be built every minute"""
+        time_left = state[0]
+        return self.geodes(state) + time_left * (time_left - 1) // 2
+
+    def max_geodes(self, minutes):
+        result = branch_and_bound((minutes, (1, 0, 0, 0), (0, 0, 0, 0)),
+                                  self.successors, self.geodes, self.upper_bound)
+        _(f"Blueprint {self.id}: {result.value} geodes, expanded {result.expanded}, "
+          f"pruned by bound {result.pruned_by_bound}")
+        return result.value
 
 
 def part_1(source):
-    factory = Factory(source)
-    return None
+    return sum(factory.id * factory.max_geodes(24) for factory in map(Factory, source))
 
 
 def part_2(source):
-    return None
+    answer = 1
+    for factory in map(Factory, source[:3]):
+        answer *= factory.max_geodes(32)
+    return answer
 
 
 class UnitTests(unittest.TestCase):
@@ -91,7 +109,8 @@ class UnitTests(unittest.TestCase):
             print()
         day = str(ints(Path(__file__).name)[0])
         self.source = read_rows(f"{os.path.dirname(__file__)}/day_{day.zfill(2)}.input")
-        self.test_source = read_rows("""""")
+        self.test_source = read_rows("""Blueprint 1: Each ore robot costs 4 ore. Each clay robot costs 2 ore. Each obsidian robot costs 3 ore and 14 clay. Each geode robot costs 2 ore and 7 obsidian.
+Blueprint 2: Each ore robot costs 2 ore. Each clay robot costs 3 ore. Each obsidian robot costs 3 ore and 8 clay. Each geode robot costs 3 ore and 12 obsidian.""")
 
     def test_example_data_part_1(self):
         self.assertEqual(33, part_1(self.test_source))
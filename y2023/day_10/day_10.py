@@ -20,6 +20,7 @@ from collections import deque
 from pathlib import Path
 
 from ivonet.files import read_rows
+from ivonet.grid import FlatGrid
 from ivonet.iter import ints
 
 sys.dont_write_bytecode = True
@@ -107,21 +108,27 @@ class PipeMaze:
         return start_neighbors
 
     def __bfs(self):
-        """Breath first search (bfs) to find the furthest point in a loop"""
-        queue = deque([(self.start, 0)])
-        self.visited[self.start] = 0
-        [queue.append(p) for p in self.start_neighbors]
+        """Breath first search (bfs) to find the furthest point in a loop
+        Runs on a flat grid with a border of ground around it, so no checks if a neighbor is on the board
+        """
+        grid = FlatGrid(self.source, border=".")
+        # NEIGHBORS are (col, row) steps
+        steps = [(n, n[1] * grid.stride + n[0]) for n in self.NEIGHBORS]
+        start = grid.index(self.start[1], self.start[0])
+        distances = {start: 0}
+        queue = deque((grid.index(row, col), distance) for (col, row), distance in self.start_neighbors)
         while queue:
             position, distance = queue.popleft()
-            if position in self.visited:
+            if position in distances:
                 continue
-            self.visited[position] = distance
-            for n in self.NEIGHBORS:
-                neighbor_pos = (position[0] + n[0], position[1] + n[1])
-                if neighbor_pos not in self.board:
-                    continue
-                if self.board[position] in self.MAPPING[n] and self.board[neighbor_pos] in self.ALLOWED_NEIGHBORS[n]:
-                    queue.append((neighbor_pos, distance + 1))
+            distances[position] = distance
+            pipe = grid[position]
+            for n, step in steps:
+                if pipe in self.MAPPING[n] and grid[position + step] in self.ALLOWED_NEIGHBORS[n]:
+                    queue.append((position + step, distance + 1))
+        for position, distance in distances.items():
+            row, col = grid.position(position)
+            self.visited[(col, row)] = distance
 
     def furthest(self):
         return max(self.visited.values())
@@ -20,11 +20,12 @@ from pathlib import Path
 
 from ivonet.files import read_rows
 from ivonet.iter import ints
+from ivonet.parallel import parallel_map
 
 collections.Callable = collections.abc.Callable  # type: ignore
 sys.dont_write_bytecode = True
 
-DEBUG = True
+DEBUG = False
 
 DIRECTIONS: dict[str, tuple[int, int]] = {
     "right": (0, 1),  # right
@@ -160,29 +161,16 @@ class FloorWillBeLava(object):
         Returns:
             int: The maximum number of tiles that can be energized from any starting position on the grid's perimeter.
         """
-        max_val = 0
-        self.best_energized = set()
-
-        for c in range(self.width):
-            current = self.bfs((-1, c), self.DOWN)
-            if current > max_val:
-                max_val = current
-                self.best_energized = self.energized
-            current = self.bfs((self.height, c), self.UP)
-            if current > max_val:
-                max_val = current
-                self.best_energized = self.energized
-
-        for r in range(self.height):
-            current = self.bfs((r, -1), self.RIGHT)
-            if current > max_val:
-                max_val = current
-                self.best_energized = self.energized
-            current = self.bfs((r, self.width), self.LEFT)
-            if current > max_val:
-                max_val = current
-                self.best_energized = self.energized
-        return max_val
+        starts = ([((-1, c), self.DOWN) for c in range(self.width)] +
+                  [((self.height, c), self.UP) for c in range(self.width)] +
+                  [((r, -1), self.RIGHT) for r in range(self.height)] +
+                  [((r, self.width), self.LEFT) for r in range(self.height)])
+        # every start is independent, so they are spread over all the cores
+        # only the counts come back from the workers, the best one is walked again here
+        count, best_start = max(parallel_map(energized_from, starts, shared=self))
+        self.bfs(*best_start)
+        self.best_energized = self.energized
+        return count
 
     def __str__(self) -> str:
         if not self.best_energized:
@@ -194,6 +182,17 @@ class FloorWillBeLava(object):
         return "\n".join("".join(row) for row in grid)
 
 
+def energized_from(lava: FloorWillBeLava,
+                   start: tuple[tuple[int, int], str]) -> tuple[int, tuple[tuple[int, int], str]]:
+    """(number of tiles energized, start) for a beam entering at start
+
+    Module level so it can run in a worker process. Only the count is sent back,
+    pickling the whole energized set for every start costs more than the walk.
+    """
+    lava.bfs(*start)
+    return len(lava.energized), start
+
+
 def part_1(grid: list[str]) -> int:
     lava = FloorWillBeLava(grid)
     energize = lava.energize()
@@ -21,7 +21,7 @@ import sys
 
 from ivonet.direction import directions
 from ivonet.files import read_rows
-from ivonet.graph import WeightedGraph
+from ivonet.graph import WeightedGraph, contract_grid, longest_simple_path
 from ivonet.grid import is_within_bounds
 from ivonet.iter import ints
 
@@ -62,99 +62,17 @@ class LongWalk:
 
     def __init__(self, source):
         self.grid, self.start, self.goal = parse(source)
-        self.graph: WeightedGraph = WeightedGraph()
-        self.seen = set()
-        self.crossroads = [self.start, self.goal]
-        self.__find_crossroads()
+        # the crossroads (3 or more directions) plus start and goal linked by the length of the path between them
+        self.graph: WeightedGraph = contract_grid(self.grid, "#", keep=[self.start, self.goal])
+        self.crossroads = self.graph.vertices
         p(f"crossroads: {self.crossroads}")
-        self.__create_graph()
         p(f"graph: {self.graph}")
-        self.path = []
-
-    def __find_crossroads(self):
-        """
-        This method identifies the crossroads in the grid.
-
-        A crossroad is defined as a point in the grid where you can go in 3 or more directions. The method iterates
-        over all the points in the grid, and for each point, it checks the number of possible directions from that
-        point. If the number of possible directions is 3 or more, the point is considered a crossroad and is added
-        to the list of crossroads.
-
-        The method uses the `directions` function to determine the possible directions from a point, and the
-        `is_within_bounds` function to check if moving in a direction results in a valid point within the grid.
-
-        This method does not return anything. It modifies the `crossroads` attribute of the `LongWalk` object, which
-        is a list that stores the coordinates of all the crossroads in the grid.
-        """
-        for r, row in enumerate(self.grid):
-            for c, col in enumerate(row):
-                if col == "#":  # wall
-                    continue
-                neighbor_count = 0
-                for nr, nc in directions(r, c):
-                    if is_within_bounds(self.grid, nr, nc) and self.grid[nr][nc] != '#':
-                        neighbor_count += 1
-                if neighbor_count >= 3:
-                    self.crossroads.append((r, c))
-
-    def __create_graph(self):
-        """
-        This method creates a Graph representation of the grid.
-
-        The method iterates over all the crossroads (points in the grid where you can go in 3 or more directions)
-        and adds them as vertices to the graph. Then, for each crossroad, it performs a depth-first search (DFS)
-        to find all other crossroads that can be reached from the current crossroad. For each reachable crossroad,
-        it adds an edge to the graph between the current crossroad and the reachable crossroad, with the weight of
-        the edge being the distance between the two crossroads.
-
-        The method uses a stack to perform the DFS. It starts by pushing the current crossroad into the stack.
-        Then, it enters a loop that continues until the stack is empty. In each iteration of the loop, it pops a
-        point from the stack, and if this point is a crossroad, it adds an edge to the graph. Otherwise, it pushes
-        all neighboring points that have not been visited yet into the stack.
-
-        The method uses a set to keep track of visited points to avoid visiting the same point more than once.
-
-        This method does not return anything. It modifies the `graph` attribute of the `LongWalk` object.
-        """
-        for sr, sc in self.crossroads:
-            self.graph.add_vertex((sr, sc))
-
-        for sr, sc in self.crossroads:
-            stack = [(0, sr, sc)]
-            seen = {(sr, sc)}
-
-            while stack:
-                n, r, c = stack.pop()
-
-                if n != 0 and (r, c) in self.crossroads:
-                    self.graph.add_edge_by_vertices((sr, sc), (r, c), n)
-                    continue
-
-                for nr, nc in directions(r, c):
-                    if (is_within_bounds(self.grid, nr, nc)
-                            and self.grid[nr][nc] != "#"
-                            and (nr, nc) not in seen):
-                        stack.append((n + 1, nr, nc))
-                        seen.add((nr, nc))
-        p(f"graph: {self.graph}")
-
-    def dfs(self, pt: tuple[int, int] = None):
-        if pt is None:
-            pt = self.start
-        self.path.append(pt)
-        if pt == self.goal:
-            return 0
 
-        m = -float("inf")
-
-        self.seen.add(pt)
-        nx: tuple[int, int]
-        for nx, weight in self.graph.neighbors_for_vertex_with_weights(pt):
-            if nx not in self.seen:
-                m = max(m, self.dfs(nx) + weight)
-        self.seen.remove(pt)
-        self.path.pop()
-        return m
+    def longest(self) -> int:
+        """The longest walk over the crossroads graph (bitmask dfs with pruning from my library)"""
+        length, path = longest_simple_path(self.graph, self.start, self.goal)
+        p(f"path: {path}")
+        return length
 
 
 def get_sloped_neighbors(grid, row, col):
@@ -313,11 +231,11 @@ def part_2(source: str | list[str]) -> int | None:
     - I have a graph implementation in ivonet package so I guess I will use that.
     - yeah! it works just fine but still takes about 60 seconds to complete! which is a major
       improvement over the hours it took the first time :-)
-
-    NOTE: it takes about 60 seconds!
+    - the set of seen crossroads became a bitmask and branches that can not beat the best
+      found are cut off (longest_simple_path in the ivonet graph module)
     """
     long_walk = LongWalk(source)
-    answer = long_walk.dfs()
+    answer = long_walk.longest()
     pyperclip.copy(str(answer))
     return answer
 
@@ -16,14 +16,11 @@ import os
 import unittest
 from pathlib import Path
 
-import networkx as nx
 import pyperclip
 import sys
-from matplotlib import pyplot as plt
-from networkx import Graph, minimum_edge_cut, connected_components
 
-from ivonet.calc import prod
 from ivonet.files import read_rows
+from ivonet.graph import Graph, min_cut
 from ivonet.iter import ints
 
 collections.Callable = collections.abc.Callable  # type: ignore
@@ -40,23 +37,21 @@ def p(*args, end="\n", sep=" "):
 
 def part_1(source) -> int | None:
     """
-    Sry didn't feel like doing this one in pure python.
-    I will though at a later time I think if I have time left.
-    https://networkx.org/documentation/stable/reference/algorithms/generated/networkx.algorithms.flow.minimum_cut.html
+    The 3 wires to cut are the global minimum cut of the graph (Stoer–Wagner),
+    the answer is the product of the sizes of both sides.
     """
-    graph = Graph()
-
+    graph: Graph[str] = Graph()
     for line in source:
         node, connections = line.split(": ")
+        for vertex in [node, *connections.split(" ")]:
+            if vertex not in graph:
+                graph.add_vertex(vertex)
         for connection in connections.split(" "):
-            graph.add_edge(node, connection)
-
-    nx.draw(graph, with_labels=True)
-    plt.show()
-
-    graph.remove_edges_from(minimum_edge_cut(graph))
+            graph.add_edge_by_vertices(node, connection)
 
-    answer = prod(len(c) for c in connected_components(graph))
+    weight, one, other = min_cut(graph)
+    p(f"cutting {weight} wires")
+    answer = len(one) * len(other)
     pyperclip.copy(str(answer))
     return answer
 
@@ -22,6 +22,7 @@ import sys
 from ivonet.decorators import debug
 from ivonet.decorators import timer
 from ivonet.files import read_rows
+from ivonet.graph import Scheduler
 from ivonet.iter import ints
 
 collections.Callable = collections.abc.Callable  # type: ignore
@@ -76,14 +77,12 @@ def part_1(source) -> int | None:
     return answer
 
 
-def fix(rules, update, wrong):
-    """fix the row so that it adheres to the rules"""
-    upd = update.copy()
-    idx, left, right = wrong
-    if [right, left] in rules:
-        upd[idx] = right
-        upd[update.index(right)] = left
-    return upd
+def fix(rules, update):
+    """fix the row so that it adheres to the rules
+    The rules between the pages of the update form a DAG, the fixed row is its topological order.
+    """
+    pages = set(update)
+    return list(Scheduler(((left, right) for left, right in rules if left in pages and right in pages), update).order())
 
 
 @debug
@@ -93,12 +92,9 @@ def part_2(source) -> int | None:
     rules, updates = parse(source)
     for update in updates:
         ok, wrong = valid(rules, update)
-        upd = update.copy()
         if not ok:
-            while not ok:
-                p("invalid {}".format(upd))
-                upd = fix(rules, upd, wrong)
-                ok, wrong = valid(rules, upd)
+            p("invalid {}".format(update))
+            upd = fix(rules, update)
             p("valid {}".format(upd))
             middle = len(upd) // 2
             answer += upd[middle]
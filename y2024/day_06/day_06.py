@@ -14,7 +14,6 @@ you can find that here: https://github.com/IvoNet/advent-of-code/tree/master/ivo
 import collections
 import os
 import unittest
-from copy import deepcopy
 from pathlib import Path
 
 import pyperclip
@@ -23,7 +22,7 @@ import sys
 from ivonet.decorators import debug
 from ivonet.decorators import timer
 from ivonet.files import read_rows
-from ivonet.grid import north, east, south, west, Location
+from ivonet.grid import FlatGrid
 from ivonet.iter import ints
 
 collections.Callable = collections.abc.Callable  # type: ignore
@@ -31,30 +30,9 @@ sys.dont_write_bytecode = True
 
 DEBUG = False
 
-OBSTACLE = ["#", "O"]
-FREE = "B"
-STARTERS = "^>v<"
-WALKED = "X"
-START = {
-    "^": "N",
-    ">": "E",
-    "v": "S",
-    "<": "W",
-}
-
-NEXT_DIRECTION = {
-    "N": "E",
-    "E": "S",
-    "S": "W",
-    "W": "N",
-}
-
-DIRECTION_FUNCTION = {
-    "N": north,
-    "E": east,
-    "S": south,
-    "W": west,
-}
+OBSTACLE = "#"
+OUTSIDE = "~"  # the border around the lab
+STARTERS = "^>v<"  # same order as the N, E, S, W offsets of the FlatGrid
 
 
 # noinspection DuplicatedCode
@@ -63,100 +41,79 @@ def p(*args, end="\n", sep=" "):
         print(sep.join(str(x) for x in args), end=end)
 
 
-def direction(start):
-    while True:
-        yield start
-        start = NEXT_DIRECTION[start]
+def parse_source(source) -> tuple[FlatGrid, int, int]:
+    grid = FlatGrid(source, border=OUTSIDE)
+    for heading, ch in enumerate(STARTERS):
+        start = grid.find(ch)
+        if start != -1:
+            return grid, start, heading
+    raise ValueError("No guard found")
 
 
-def parse_source(source):
-    grid = [list(row.replace(".", "B")) for row in source]
-    for h, row in enumerate(source):
-        for w, col in enumerate(row):
-            if col in STARTERS:
-                start = (h, w)
-                grid[h][w] = WALKED
-                direction_gen = START[col]
-                break
-    return grid, direction_gen, start
+def patrol(grid: FlatGrid, start: int, heading: int) -> set[int]:
+    """All the cells the guard visits before walking out of the lab"""
+    offsets = grid.offsets
+    cells = grid.cells
+    obstacle, outside = ord(OBSTACLE), ord(OUTSIDE)
+    loc = start
+    visited = {loc}
+    while True:
+        ahead = loc + offsets[heading]
+        if cells[ahead] == outside:
+            return visited
+        if cells[ahead] == obstacle:
+            heading = (heading + 1) % 4
+            continue
+        loc = ahead
+        visited.add(loc)
+
+
+def looped(grid: FlatGrid, start: int, heading: int) -> bool:
+    """True if the guard keeps walking in circles.
+    Only the turns need to be remembered, a loop always comes back to a turn it made before
+    """
+    offsets = grid.offsets
+    cells = grid.cells
+    obstacle, outside = ord(OBSTACLE), ord(OUTSIDE)
+    loc = start
+    turns = set()
+    while True:
+        ahead = loc + offsets[heading]
+        if cells[ahead] == outside:
+            return False
+        if cells[ahead] == obstacle:
+            if (loc, heading) in turns:
+                return True
+            turns.add((loc, heading))
+            heading = (heading + 1) % 4
+            continue
+        loc = ahead
 
 
 @debug
 @timer
 def part_1(source) -> int | None:
-    answer = 0
-    grid, direction_gen, start = parse_source(source)
-
-    visited = set()
-    visited.add(start)
-    loc = Location(*start)
-    for d in direction(direction_gen):
-        to = DIRECTION_FUNCTION[d]
-        loc, value = next(to(grid, loc, value=True))
-        while value not in OBSTACLE:
-            visited.add(loc)
-            if value == FREE:
-                answer += 1
-                grid[loc[0]][loc[1]] = WALKED
-            last_loc = loc
-            loc, value = next(to(grid, loc, value=True), (None, None))
-            if value in OBSTACLE:
-                loc = last_loc
-            if not loc and not value:
-                return len(visited)
-
+    grid, start, heading = parse_source(source)
+    answer = len(patrol(grid, start, heading))
+    pyperclip.copy(str(answer))
+    return answer
 
 
 @debug
 @timer
 def part_2(source) -> int | None:
+    """An extra obstacle only makes a difference on the original route of the guard"""
+    grid, start, heading = parse_source(source)
     answer = 0
-    grid, direction_gen, loc = parse_source(source)
-
-    for h, row in enumerate(grid):
-        for w, col in enumerate(row):
-            if col != FREE:
-                continue
-            grid[h][w] = "O"
-            if looped(direction_gen, deepcopy(grid), loc):
-                answer += 1
-            grid[h][w] = "."
-
+    for loc in patrol(grid, start, heading) - {start}:
+        grid[loc] = OBSTACLE
+        if looped(grid, start, heading):
+            answer += 1
+        grid[loc] = "."
     pyperclip.copy(str(answer))
     return answer
 
 
-def looped(direction_gen: str, grid: list[list[str]], start: Location):
-    loc = start
-    visited = set()
-    visited.add((start, direction_gen))
-    for d in direction(direction_gen):
-
-        to = DIRECTION_FUNCTION[d]
-        last_loc = loc
-        loc, value = next(to(grid, loc, value=True))
-        if value in OBSTACLE:
-            loc = last_loc
-        while value not in OBSTACLE:
-            if (loc, d) in visited:
-                p(visited)
-                if DEBUG:
-                    for row in grid:
-                        p("".join(row))
-                return True
-            visited.add((loc, d))
-            grid[loc[0]][loc[1]] = d
-            last_loc = loc
-            loc, value = next(to(grid, loc, value=True), (None, None))
-            if value in OBSTACLE:
-                loc = last_loc
-            if not loc and not value:
-                if DEBUG:
-                    for row in grid:
-                        p("".join(row))
-                return False
-
-
 # noinspection DuplicatedCode
 class UnitTests(unittest.TestCase):
 
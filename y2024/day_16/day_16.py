@@ -12,12 +12,10 @@ you can find that here: https://github.com/IvoNet/advent-of-code/tree/master/ivo
 """
 
 import collections
-import heapq
 import os
 import sys
 import unittest
-from collections import abc, namedtuple
-from collections import defaultdict
+from collections import abc
 from pathlib import Path
 
 import pyperclip
@@ -26,6 +24,7 @@ from ivonet.decorators import timer
 from ivonet.files import read_rows
 from ivonet.grid import Location
 from ivonet.iter import ints
+from ivonet.search import dijkstra_all, states_on_shortest_paths
 
 collections.Callable = abc.Callable  # type: ignore
 sys.dont_write_bytecode = True
@@ -46,8 +45,6 @@ DIRECTIONS = [
     Location(0, -1)  # west
 ]  # north (0), east (1), south (2), west (3)
 
-Node = namedtuple('Node', ['cost', 'location', 'direction', 'path'])
-
 
 def visualize(grid, path):
     if DEBUG:
@@ -70,53 +67,42 @@ def parse(source):
     return grid, start, end
 
 
-def dijkstra_with_bfs(grid, start, goal):
+def best_paths(grid, start, goal):
     """
-    Modified Dijkstra to find all the paths with the lowest cost and not just the first one.
+    Find the lowest score and all the tiles that are part of any path with that score.
 
+    A state is (location, direction, cost of the step that got us here) and the state key
+    leaves the step cost out, so a forward step and a turn into the same (location, direction)
+    are the same state. Dijkstra records all equal cost predecessors, so the tiles on all
+    the best paths come from walking that predecessor DAG back from the goal.
     """
-    queue = []
-    lowest_cost = defaultdict(lambda: float("inf"))
-    best_cost = float("inf")
-    best_paths = []
-    heapq.heappush(queue, Node(0, start, 1, [start]))
-    while queue:
-        cost, loc, direction, path = heapq.heappop(queue)
-        if cost > lowest_cost[(loc, direction)]:  # if we have a better path to this location
-            continue
-        if loc == goal:
-            if cost > best_cost:
-                break
-            best_cost = cost
-            best_paths.append(path)
-        for new_cost, new_loc, new_direction in [(cost + 1, loc + DIRECTIONS[direction], direction),  # forward
-                                                 (cost + 1000, loc, (direction + 1) % 4),  # right
-                                                 (cost + 1000, loc, (direction + 3) % 4)  # left
-                                                 ]:
-            if (0 <= new_loc.row < len(grid)
-                    and 0 <= new_loc.col < len(grid[0])
-                    and grid[new_loc.row][new_loc.col] != '#'):
-                lowest = lowest_cost[(new_loc, new_direction)]
-                if new_cost > lowest:
-                    continue
-                if new_cost < lowest:
-                    lowest_cost[(new_loc, new_direction)] = new_cost
-                heapq.heappush(queue, Node(new_cost, new_loc, new_direction, path + [new_loc]))
-
-    # at this point we should have found all the paths with the lowest cost
-    # now we just have to make all the locations in these paths unique
-    # we could also iterate over all the paths and set an "O" in the grid and then count the "O"s in the grid
-    # Which is what i did at first but that is not necessary
-    all_coords = {loc for path in best_paths for loc in path}
+
+    def successors(state):
+        loc, direction, _ = state
+        children = [(loc, (direction + 1) % 4, 1000),  # right
+                    (loc, (direction + 3) % 4, 1000)]  # left
+        new_loc = loc + DIRECTIONS[direction]
+        if (0 <= new_loc.row < len(grid)
+                and 0 <= new_loc.col < len(grid[0])
+                and grid[new_loc.row][new_loc.col] != '#'):
+            children.append((new_loc, direction, 1))  # forward
+        return children
+
+    paths = dijkstra_all((start, 1, 0),
+                         lambda state: state[0] == goal,
+                         successors,
+                         lambda state: state[2],
+                         encode=lambda state: (state[0], state[1]))
+    all_coords = {loc for loc, _, _ in states_on_shortest_paths(paths)}
     visualize(grid, all_coords)
-    return best_cost, len(all_coords)
+    return int(paths.cost), len(all_coords)
 
 
 @debug
 @timer
 def part_1(source) -> int | None:
     grid, start, end = parse(source)
-    answer, _ = dijkstra_with_bfs(grid, start, end)
+    answer, _ = best_paths(grid, start, end)
     pyperclip.copy(str(answer))
     return answer
 
@@ -125,7 +111,7 @@ def part_1(source) -> int | None:
 @timer
 def part_2(source) -> int | None:
     grid, start, end = parse(source)
-    _, answer = dijkstra_with_bfs(grid, start, end)
+    _, answer = best_paths(grid, start, end)
     pyperclip.copy(str(answer))
     return answer
 
@@ -20,11 +20,11 @@ from pathlib import Path
 
 import pyperclip
 
-from ivonet.collection import Queue
 from ivonet.decorators import debug
 from ivonet.decorators import timer
 from ivonet.files import read_rows
 from ivonet.iter import ints
+from ivonet.search import bfs_grid
 
 collections.Callable = abc.Callable  # type: ignore
 sys.dont_write_bytecode = True
@@ -64,36 +64,6 @@ class MemorySpace:
         self.start: tuple[int, int] = (0, 0)
         self.end: tuple[int, int] = (side, side)
 
-    def successors(self, loc: tuple[int, int]) -> list[tuple[int, int]]:
-        """
-        Generates the successor coordinates for a given location.
-
-        Args:
-            loc (tuple[int, int]): The current location.
-
-        Returns:
-            list[tuple[int, int]]: List of valid successor coordinates.
-        """
-        ret = []
-        r, c = loc
-        for dr, dc in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            rr, cc = r + dr, c + dc
-            if 0 <= rr < self.side and 0 <= cc < self.side and self.memory[rr][cc] != "#":
-                ret.append((rr, cc))
-        return ret
-
-    def goal_test(self, loc) -> bool:
-        """
-        Checks if the given location is the goal.
-
-        Args:
-            loc (tuple[int, int]): The location to check.
-
-        Returns:
-            bool: True if the location is the goal, False otherwise.
-        """
-        return loc == self.end
-
     def bfs(self, bytes, part_2=False):
         """
         Performs a breadth-first search to find the shortest path.
@@ -110,32 +80,15 @@ class MemorySpace:
             if 0 <= r < self.side and 0 <= c < self.side:
                 self.memory[r][c] = "#"
 
-            frontier = Queue()
-            frontier.push((self.start, [self.start]))
-            # explored is where we've been
-            explored = set()
-            # keep going while there is more to explore
-            ok = False
-            while not frontier.empty:
-                current_state, path = frontier.pop()
-                # if we found the goal, we're done
-                if self.goal_test(current_state):
-                    if i == togo and not part_2:
-                        self.visualize(path)
-                        return len(path) - 1
-                    ok = True
-                    break
-                # check where we can go next and haven't explored
-                for child in self.successors(current_state):
-                    if child in explored:  # skip children we already explored
-                        continue
-                    explored.add(child)
-                    frontier.push((child, path + [child]))
-            if not ok:
+            distance, path = bfs_grid(self.start, self.end, self.memory)
+            if distance is None:
                 # only if no path is found we return the coordinate
                 # and we should represent it again as x,y -> c,r
                 # Tripped me up a bit
                 return f'{c},{r}'
+            if i == togo and not part_2:
+                self.visualize(path)
+                return distance
 
     def visualize(self, path):
         for r, c in path:
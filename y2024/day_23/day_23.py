@@ -42,8 +42,6 @@ class LanParty:
     def __init__(self, source):
         self.source = source
         self.graph = Graph()
-        self.search_results = set()
-        self.longest_set = set()
         self.parse(self.source)
 
     def parse(self, source):
@@ -74,7 +72,7 @@ class LanParty:
         return len([s for s in self.sets_of_three if any(connection.startswith("t") for connection in s)])
 
     def part_2(self):
-        return ",".join(self.graph.longest_connected_component())
+        return ",".join(sorted(self.graph.maximum_clique()))
 
 
 @debug
@@ -20,7 +20,7 @@ import sys
 from ivonet.decorators import debug
 from ivonet.decorators import timer
 from ivonet.files import read_rows
-from ivonet.grid import Location, neighbor_values
+from ivonet.grid import Grid
 from ivonet.iter import ints
 
 collections.Callable = collections.abc.Callable  # type: ignore
@@ -35,36 +35,27 @@ def p(*args, end="\n", sep=" "):
         print(sep.join(str(x) for x in args), end=end)
 
 
-def get_removable_rolls(grid) -> list[Location]:
-    ret = []
-    for x, row in enumerate(grid):
-        for y, col in enumerate(row):
-            if col == "@":
-                values = neighbor_values(grid, Location(x, y))
-                count = values.count("@")
-                if count < 4:
-                    ret.append((x, y))
-    return ret
+def get_removable_rolls(grid: Grid):
+    """Mask of the rolls with less than 4 rolls around them (the whole grid at once)"""
+    return grid.mask("@") & (grid.count_neighbors("@") < 4)
 
 
 def process_rolls_of_paper(source):
-    grid = [list(row) for row in source]
+    grid = Grid.from_rows(source)
     count = 0
     while True:
         removable = get_removable_rolls(grid)
-        if not removable:
+        if not removable.any():
             break
-        count += len(removable)
-        for x, y in removable:
-            grid[x][y] = "."
+        count += int(removable.sum())
+        grid[removable] = "."
     return count
 
 
 @debug
 @timer
 def part_1(source) -> int | None:
-    grid = [list(row) for row in source]
-    answer = len(get_removable_rolls( grid))
+    answer = int(get_removable_rolls(Grid.from_rows(source)).sum())
     pyperclip.copy(str(answer))
     return answer
 
@@ -65,10 +65,7 @@ class Machine:
         return f"Machine(indicator_lights: [{''.join([self.ON if x else self.OFF for x in self.indicator_lights])}], buttons: {str(self.buttons):}, joltages: {str(self.joltages)}] )"
 
     def match_state_bfs(self):
-        from ivonet.search import bfs
-
-        def goal_test(state: list[bool]) -> bool:
-            return state == self.indicator_lights
+        from ivonet.search import bidirectional_bfs
 
         def successors(state: list[bool]) -> list[list[bool]]:
             result = []
@@ -80,7 +77,8 @@ class Machine:
             return result
 
         initial_state = [False] * len(self.indicator_lights)
-        result_node = bfs(initial_state, goal_test, successors)
+        # pressing a button twice undoes it, so the successors are also the predecessors
+        result_node = bidirectional_bfs(initial_state, self.indicator_lights, successors)
         if result_node:
             path = []
             node = result_node